@@ -1,7 +1,6 @@
 from fastapi import APIRouter, Depends
 from fastapi.security import OAuth2AuthorizationCodeBearer
 from fief_client import FiefAccessTokenInfo
-from fief_client.client import Fief
 from fief_client.integrations.fastapi import FiefAuth
 
 from handler.auth_handler import domain_address, fief
@@ -14,11 +13,6 @@ scheme = OAuth2AuthorizationCodeBearer(
 )
 
 auth = FiefAuth(fief, scheme)
-base_fief = Fief(
-    domain_address,
-    client_id=fief.client_id,
-    client_secret=fief.client_secret,
-)
 
 router = APIRouter(
     prefix="/auth",
@@ -3,7 +3,7 @@ from io import BytesIO
 from typing import Any
 from uuid import UUID, uuid4
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, Header, HTTPException, Response
 from fastapi.responses import StreamingResponse
 from fief_client import FiefAccessTokenInfo
 from pydantic import BaseModel, Field
@@ -13,6 +13,12 @@ from core.logging_core import setup_logger
 from handler.image_handler import (
     handle_generate_image,
 )
+from handler.job_event_handler import (
+    claim_job_handler,
+    ensure_job_exists_handler,
+    get_job_preview_handler,
+    stream_job_events_handler,
+)
 
 logger = setup_logger(__name__)
 
@@ -42,16 +48,25 @@ class GenerateImageRequest(BaseModel):
         description="Parameters to fill the workflow "
                     "(e.g.: {'positive_prompt': 'astronaut cat', 'seed': 123})",
     )
+    job_id: UUID | None = Field(
+        default=None,
+        description="ID to give the job, so its progress can be followed at "
+                    "/image/jobs/{job_id}/events while it runs. Generated if not provided; "
+                    "an ID already used by one of the user's jobs is rejected with 409.",
+    )
 
 
 @router.post("/generate", description="Generate an image using a workflow. ")
 async def generate(
     request_data: GenerateImageRequest,
+    response: Response,
     retrieve_image: bool = False,
     access_token_info: FiefAccessTokenInfo = Depends(auth.authenticated()),  # noqa: B008
 ):
     user_id = access_token_info["id"]
-    job_id = str(uuid4())
+    job_id = str(request_data.job_id or uuid4())
+    claim_job_handler(user_id, job_id)
+    response.headers["X-Job-ID"] = job_id
     folder_id = request_data.folder_id
 
     try:
@@ -68,7 +83,9 @@ async def generate(
                 image_bytes = images_data[0]["processed_image"]
                 if isinstance(image_bytes, str):
                     image_bytes = base64.b64decode(image_bytes)
-                return StreamingResponse(BytesIO(image_bytes), media_type="image/png")
+                return StreamingResponse(
+                    BytesIO(image_bytes), media_type="image/png", headers={"X-Job-ID": job_id}
+                )
             return images_data
         else:
             raise HTTPException(
@@ -100,4 +117,31 @@ async def generate(
             f"Unexpected error while generating image for user {user_id} "
             f"with workflow {request_data.workflow_id}: {err}"
         )
-        raise HTTPException(status_code=500, detail=str(err)) from err
\ No newline at end of file
+        raise HTTPException(status_code=500, detail=str(err)) from err
+
+
+@router.get("/jobs/{job_id}/events", description="Stream the progress of a generation job "
+            "as Server-Sent Events: queued, position, started, executing, progress, "
+            "preview and finally completed (with the image URLs) or failed.")
+async def job_events(
+    job_id: UUID,
+    last_event_id: str | None = Header(default=None),  # noqa: B008
+    access_token_info: FiefAccessTokenInfo = Depends(auth.authenticated()),  # noqa: B008
+):
+    user_id = access_token_info["id"]
+    await ensure_job_exists_handler(user_id, str(job_id))
+    return StreamingResponse(
+        stream_job_events_handler(user_id, str(job_id), last_event_id),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.get("/jobs/{job_id}/preview", description="Get the latest preview of a running job.")
+async def job_preview(
+    job_id: UUID,
+    access_token_info: FiefAccessTokenInfo = Depends(auth.authenticated()),  # noqa: B008
+):
+    user_id = access_token_info["id"]
+    preview = await get_job_preview_handler(user_id, str(job_id))
+    return Response(preview, media_type="image/jpeg", headers={"Cache-Control": "no-store"})
\ No newline at end of file
@@ -0,0 +1,16 @@
+import asyncio
+
+from fastapi import APIRouter, Response
+
+from core.prometheus_core import CONTENT_TYPE, registry
+
+router = APIRouter(
+    tags=["metrics"],
+)
+
+
+@router.get("/metrics", include_in_schema=False)
+async def metrics():
+    """Prometheus text exposition of the metrics of the API and Celery processes."""
+    body = await asyncio.to_thread(registry.render)
+    return Response(body, media_type=CONTENT_TYPE)
@@ -1,17 +1,18 @@
 import uuid
 
-from fastapi import APIRouter, Depends, Response, status
+from fastapi import APIRouter, Depends, Request, Response, status
 
 from api.auth_api import auth
+from core.catalog_cache_core import catalog_response
 from core.logging_core import setup_logger
 from handler.model_handler import (
     create_model_handler,
     delete_model_handler,
-    get_all_models_handler,
     get_model_by_id_handler,
+    get_models_snapshot_handler,
     update_model_handler,
 )
-from model.model_model import Model, ModelCreate, ModelUpdate
+from model.model_model import Model, ModelCreate, ModelSummary, ModelUpdate
 
 logger = setup_logger(__name__)
 
@@ -27,13 +28,17 @@ router_metadata = {
     "description": "API for managing models.",
 }
 
-@router.get("/", response_model=list[Model])
+@router.get("/", response_model=list[ModelSummary])
 async def get_models(
+    request: Request,
 ):
     """
     Lists all available models.
     """
-    return await get_all_models_handler()
+    snapshot = await get_models_snapshot_handler()
+    return catalog_response(
+        snapshot, request.headers.get("if-none-match"), request.headers.get("accept-encoding")
+    )
 
 @router.get("/{model_id}", response_model=Model)
 async def get_model(
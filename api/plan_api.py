@@ -1,17 +1,18 @@
 import uuid
 
-from fastapi import APIRouter, Depends, Response, status
+from fastapi import APIRouter, Depends, Request, Response, status
 
 from api.auth_api import auth
+from core.catalog_cache_core import catalog_response
 from core.logging_core import setup_logger
 from handler.plan_handler import (
     create_plan_handler,
     delete_plan_handler,
-    get_all_plans_handler,
     get_plan_by_id_handler,
+    get_plans_snapshot_handler,
     update_plan_handler,
 )
-from model.plan_model import Plan, PlanCreate, PlanUpdate
+from model.plan_model import Plan, PlanCreate, PlanSummary, PlanUpdate
 
 logger = setup_logger(__name__)
 
@@ -27,14 +28,15 @@ router_metadata = {
     "description": "Plan management endpoints.",
 }
 
-@router.get("/", response_model=list[Plan])
-async def get_plans():
+@router.get("/", response_model=list[PlanSummary])
+async def get_plans(request: Request):
     """
     Lists all available plans.
     """
-    plans_raw = await get_all_plans_handler()
-    plans = [Plan.model_validate(plan) for plan in plans_raw]
-    return plans
+    snapshot = await get_plans_snapshot_handler()
+    return catalog_response(
+        snapshot, request.headers.get("if-none-match"), request.headers.get("accept-encoding")
+    )
 
 @router.get("/{plan_id}", response_model=Plan)
 async def get_plan(
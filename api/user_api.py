@@ -3,7 +3,11 @@ from fastapi import APIRouter, Depends, UploadFile
 from fief_client import FiefAccessTokenInfo
 
 from api.auth_api import auth
-from handler.user_handler import get_user_by_id_handler, user_update_profile_image_url_handler
+from handler.user_handler import (
+    get_user_by_id_handler,
+    get_user_usage_handler,
+    user_update_profile_image_url_handler,
+)
 
 router = APIRouter(
     prefix="/user",
@@ -24,6 +28,14 @@ async def get_me(
     return user
 
 
+
+@router.get("/me/usage")
+async def get_my_usage(
+    access_token_info: FiefAccessTokenInfo = Depends(auth.authenticated())  # noqa: B008
+):
+    return await get_user_usage_handler(access_token_info["id"])
+
+
 @router.put("/me/profileImage")
 async def update_profile_image(
     data: UploadFile,
@@ -1,7 +1,9 @@
 import uuid
 from typing import Optional
+from urllib.parse import quote
 
 from fastapi import APIRouter, Depends
+from fastapi.responses import ORJSONResponse, StreamingResponse
 from fief_client import FiefAccessTokenInfo
 
 from api.auth_api import auth
@@ -9,10 +11,13 @@ from core.logging_core import setup_logger
 from handler.user_folder_handler import (
     create_user_folder_handler,
     delete_user_folder_handler,
+    export_user_folder_handler,
     get_user_folder_by_name_handler,
     get_user_folder_handler,
     get_user_folders_handler,
+    stream_user_folder_zip,
 )
+from model.user_folder_model import UserFolderSummary
 
 logger = setup_logger(__name__)
 
@@ -27,7 +32,7 @@ router_metadata = {
     "description": "User Folder management endpoints.",
 }
 
-@router.get("/")
+@router.get("/", response_model=list[UserFolderSummary])
 async def get_user_folders(
     user_id: Optional[uuid.UUID] = None,
     access_token_info: FiefAccessTokenInfo = Depends(auth.authenticated())  # noqa: B008
@@ -40,8 +45,7 @@ async def get_user_folders(
     """
     if user_id is None:
         user_id = access_token_info["id"]
-    user_folders = await get_user_folders_handler(user_id)
-    return user_folders
+    return ORJSONResponse(await get_user_folders_handler(user_id))
 
 @router.get("/{folder_id}")
 async def get_user_folder(
@@ -61,6 +65,26 @@ async def get_user_folder(
     user_folder = await get_user_folder_handler(user_id, folder_id)
     return user_folder
 
+@router.get("/{folder_id}/export")
+async def export_user_folder(
+    folder_id: uuid.UUID,
+    access_token_info: FiefAccessTokenInfo = Depends(auth.authenticated())  # noqa: B008
+):
+    """
+    Streams a ZIP archive with every image stored in a user folder.
+    :param folder_id:
+    :param access_token_info:
+    :return:
+    """
+    user_id = access_token_info["id"]
+    user_folder, images = await export_user_folder_handler(user_id, folder_id)
+    filename = quote(f"{user_folder.name}.zip")
+    return StreamingResponse(
+        stream_user_folder_zip(images),
+        media_type="application/zip",
+        headers={"Content-Disposition": f"attachment; filename*=UTF-8''{filename}"},
+    )
+
 @router.get("/name/{folder_name}")
 async def get_user_folder_by_name(
     folder_name: str,
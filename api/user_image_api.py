@@ -1,17 +1,49 @@
+import mimetypes
+from datetime import datetime
+from typing import Optional
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import (
+    APIRouter,
+    BackgroundTasks,
+    Depends,
+    HTTPException,
+    Query,
+    Request,
+    Response,
+    status,
+)
+from fastapi.responses import StreamingResponse
 from fief_client import FiefAccessTokenInfo
+from pydantic import BaseModel, Field
 
 from api.auth_api import auth
+from core.config_core import Config
 from core.logging_core import setup_logger
+from core.minio_core import stream_object_from_bucket
 from handler.image_handler import (
-    delete_image_handler,
+    delete_images_handler,
     get_all_images_by_user_id_and_folder_id_handler,
     get_all_images_by_user_id_handler,
+    get_deletion_job_handler,
+    get_image_content_handler,
+    remove_image_objects_handler,
+    search_images_handler,
+)
+from utils.http_util import (
+    RangeNotSatisfiable,
+    etag_matches,
+    format_http_date,
+    not_modified_since,
+    parse_range_header,
 )
 
 logger = setup_logger(__name__)
+config_instance = Config()
+STREAM_CHUNK_SIZE = config_instance.getint("Minio", "stream_chunk_size", default=64 * 1024)
+CACHE_CONTROL = config_instance.get(
+    "Minio", "cache_control", default="private, max-age=31536000, immutable"
+)
 
 router = APIRouter(
     prefix="/user/image",
@@ -25,14 +57,32 @@ router_metadata = {
 }
 
 
+class BulkDeleteImagesRequest(BaseModel):
+    image_ids: list[UUID] = Field(
+        default_factory=list,
+        description="IDs of the images to delete.",
+    )
+    folder_id: UUID | None = Field(
+        default=None,
+        description="Delete every image in this folder (or only the given IDs inside it).",
+    )
+
+
 @router.get("/")
 async def get_user_images(
+    limit: Optional[int] = Query(default=None, ge=1),  # noqa: B008
+    cursor: Optional[str] = None,
     access_token_info: FiefAccessTokenInfo = Depends(auth.authenticated()),  # noqa: B008
 ):
+    """
+    Returns a page of the user's images, newest first. Pass ``next_cursor`` back as
+    ``cursor`` to get the following page.
+    """
     user_id = access_token_info["id"]
     try:
-        images = await get_all_images_by_user_id_handler(user_id)
-        return images
+        return await get_all_images_by_user_id_handler(user_id, limit, cursor)
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error retrieving images for user {user_id}: {e}")
         raise HTTPException(
@@ -40,15 +90,79 @@ async def get_user_images(
             detail="Internal Server Error",
         ) from e
 
+@router.post("/bulk-delete", status_code=status.HTTP_202_ACCEPTED)
+async def delete_user_images(
+    request_data: BulkDeleteImagesRequest,
+    background_tasks: BackgroundTasks,
+    access_token_info: FiefAccessTokenInfo = Depends(auth.authenticated()),  # noqa: B008
+):
+    """
+    Deletes many images at once and removes their stored objects in the background.
+    """
+    user_id = access_token_info["id"]
+    job, urls = await delete_images_handler(
+        user_id, request_data.image_ids, request_data.folder_id
+    )
+    if urls:
+        background_tasks.add_task(remove_image_objects_handler, job, urls)
+    return job
+
+@router.get("/bulk-delete/{job_id}")
+async def get_user_images_deletion(
+    job_id: str,
+    access_token_info: FiefAccessTokenInfo = Depends(auth.authenticated()),  # noqa: B008
+):
+    """
+    Returns the progress report of a bulk deletion job.
+    """
+    return await get_deletion_job_handler(access_token_info["id"], job_id)
+
+@router.get("/search")
+async def search_user_images(
+    q: Optional[str] = Query(default=None, description="Text to search in the prompts."),  # noqa: B008
+    folder_id: Optional[UUID] = None,
+    workflow_id: Optional[UUID] = None,
+    model_id: Optional[UUID] = None,
+    seed: Optional[int] = None,
+    created_from: Optional[datetime] = None,
+    created_to: Optional[datetime] = None,
+    limit: Optional[int] = Query(default=None, ge=1),  # noqa: B008
+    cursor: Optional[str] = None,
+    access_token_info: FiefAccessTokenInfo = Depends(auth.authenticated()),  # noqa: B008
+):
+    """
+    Searches the user's images by prompt text (web search syntax) and by workflow,
+    model, seed, folder and creation date. Results are paginated like the listings.
+    """
+    user_id = access_token_info["id"]
+    filters = {
+        "text_query": q,
+        "folder_id": folder_id,
+        "workflow_id": workflow_id,
+        "model_id": model_id,
+        "seed": seed,
+        "created_from": created_from,
+        "created_to": created_to,
+    }
+    return await search_images_handler(user_id, filters, limit, cursor)
+
 @router.get("/{folder_id}")
 async def get_user_images_by_folder(
     folder_id: UUID,
+    limit: Optional[int] = Query(default=None, ge=1),  # noqa: B008
+    cursor: Optional[str] = None,
     access_token_info: FiefAccessTokenInfo = Depends(auth.authenticated()),  # noqa: B008
 ):
+    """
+    Returns a page of the images in one of the user's folders, newest first.
+    """
     user_id = access_token_info["id"]
     try:
-        images = await get_all_images_by_user_id_and_folder_id_handler(user_id, folder_id)
-        return images
+        return await get_all_images_by_user_id_and_folder_id_handler(
+            user_id, folder_id, limit, cursor
+        )
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error retrieving images for user {user_id} in folder {folder_id}: {e}")
         raise HTTPException(
@@ -56,18 +170,87 @@ async def get_user_images_by_folder(
             detail="Internal Server Error",
         ) from e
 
+@router.get("/{image_id}/content")
+async def get_user_image_content(
+    image_id: UUID,
+    request: Request,
+    access_token_info: FiefAccessTokenInfo = Depends(auth.authenticated()),  # noqa: B008
+):
+    """
+    Streams the stored image from MinIO, honouring Range and conditional request headers.
+    """
+    user_id = access_token_info["id"]
+    bucket_name, object_name, object_stat = await get_image_content_handler(user_id, image_id)
+
+    size = object_stat.size
+    etag = f'"{object_stat.etag or object_stat.size}"'
+    media_type = object_stat.content_type
+    if not media_type or media_type == "application/octet-stream":
+        media_type = mimetypes.guess_type(object_name)[0] or "application/octet-stream"
+    headers = {
+        "ETag": etag,
+        "Cache-Control": CACHE_CONTROL,
+        "Accept-Ranges": "bytes",
+    }
+    if object_stat.last_modified:
+        headers["Last-Modified"] = format_http_date(object_stat.last_modified)
+
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        if etag_matches(if_none_match, etag):
+            return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    elif object_stat.last_modified and not_modified_since(
+        request.headers.get("if-modified-since"), object_stat.last_modified
+    ):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    byte_range = None
+    if_range = request.headers.get("if-range")
+    if if_range is None or etag_matches(if_range, etag):
+        try:
+            byte_range = parse_range_header(request.headers.get("range"), size)
+        except RangeNotSatisfiable:
+            headers["Content-Range"] = f"bytes */{size}"
+            return Response(
+                status_code=status.HTTP_416_REQUESTED_RANGE_NOT_SATISFIABLE, headers=headers
+            )
+
+    if byte_range is None:
+        headers["Content-Length"] = str(size)
+        return StreamingResponse(
+            stream_object_from_bucket(bucket_name, object_name, chunk_size=STREAM_CHUNK_SIZE),
+            media_type=media_type,
+            headers=headers,
+        )
+
+    start, end = byte_range
+    length = end - start + 1
+    headers["Content-Range"] = f"bytes {start}-{end}/{size}"
+    headers["Content-Length"] = str(length)
+    return StreamingResponse(
+        stream_object_from_bucket(
+            bucket_name, object_name, offset=start, length=length, chunk_size=STREAM_CHUNK_SIZE
+        ),
+        status_code=status.HTTP_206_PARTIAL_CONTENT,
+        media_type=media_type,
+        headers=headers,
+    )
+
 @router.delete("/{image_id}")
 async def delete_user_image(
     image_id: UUID,
+    background_tasks: BackgroundTasks,
     access_token_info: FiefAccessTokenInfo = Depends(auth.authenticated()),  # noqa: B008
 ):
+    """
+    Deletes an image of the user and removes its stored object in the background.
+    """
     user_id = access_token_info["id"]
-    try:
-        await delete_image_handler(image_id)
-        return {"message": "Image deleted successfully"}
-    except Exception as e:
-        logger.error(f"Error deleting image {image_id} for user {user_id}: {e}")
+    job, urls = await delete_images_handler(user_id, [image_id])
+    if not urls:
         raise HTTPException(
-            status_code=500,
-            detail="Internal Server Error",
-        ) from e
\ No newline at end of file
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Image with ID {image_id} not found",
+        )
+    background_tasks.add_task(remove_image_objects_handler, job, urls)
+    return {"message": "Image deleted successfully", "job_id": job["job_id"]}
\ No newline at end of file
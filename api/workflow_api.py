@@ -1,18 +1,25 @@
 import uuid
 
-from fastapi import APIRouter, Depends, Response, status
+from fastapi import APIRouter, Depends, Request, Response, status
 
 from api.auth_api import auth
+from core.catalog_cache_core import catalog_response
 from core.logging_core import setup_logger
 from handler.workflow_handler import (
     create_workflow_handler,
     delete_workflow_handler,
-    get_all_workflows_handler,
-    get_all_workflows_simplified_handler,
     get_workflow_by_id_handler,
+    get_workflows_simplified_snapshot_handler,
+    get_workflows_snapshot_handler,
     update_workflow_handler,
 )
-from model.workflow_model import Workflow, WorkflowCreate, WorkflowUpdate
+from model.workflow_model import (
+    Workflow,
+    WorkflowCreate,
+    WorkflowSimplified,
+    WorkflowSummary,
+    WorkflowUpdate,
+)
 
 logger = setup_logger(__name__)
 
@@ -29,21 +36,29 @@ router_metadata = {
 }
 
 
-@router.get("/", response_model=list[Workflow])
+@router.get("/", response_model=list[WorkflowSummary])
 async def get_workflows(
+    request: Request,
 ):
     """
-    Lists all available workflows.
+    Lists all available workflows, without their ComfyUI graphs.
     """
-    return await get_all_workflows_handler()
+    snapshot = await get_workflows_snapshot_handler()
+    return catalog_response(
+        snapshot, request.headers.get("if-none-match"), request.headers.get("accept-encoding")
+    )
 
-@router.get("/simplified", response_model=list[Workflow])
+@router.get("/simplified", response_model=list[WorkflowSimplified])
 async def get_workflows_simplified(
+    request: Request,
 ):
     """
-    Lists all available workflows.
+    Lists all available workflows with only their identifying fields.
     """
-    return await get_all_workflows_simplified_handler()
+    snapshot = await get_workflows_simplified_snapshot_handler()
+    return catalog_response(
+        snapshot, request.headers.get("if-none-match"), request.headers.get("accept-encoding")
+    )
 
 @router.get("/{workflow_id}", response_model=Workflow)
 async def get_workflow(
@@ -0,0 +1,120 @@
+import asyncio
+import gzip
+import hashlib
+import time
+from collections.abc import Awaitable
+from dataclasses import dataclass
+from typing import Any, Callable, Optional
+
+import orjson
+from fastapi import Response, status
+
+from core.config_core import Config
+from core.logging_core import setup_logger
+from utils.http_util import accepts_encoding, etag_matches
+
+logger = setup_logger(__name__)
+config_instance = Config()
+
+CATALOG_CACHE_ENABLED = config_instance.getboolean("CatalogCache", "enabled", default=True)
+CATALOG_CACHE_TTL_SECONDS = config_instance.getint("CatalogCache", "ttl_seconds", default=60)
+CATALOG_CACHE_CONTROL = config_instance.get(
+    "CatalogCache", "cache_control", default="private, no-cache"
+)
+GZIP_LEVEL = 6
+
+
+@dataclass(frozen=True)
+class CatalogSnapshot:
+    """A serialized catalog listing, kept both plain and gzip-compressed."""
+    body: bytes
+    gzip_body: bytes
+    etag: str
+    built_at: float
+
+
+def build_snapshot(rows: list[dict[str, Any]]) -> CatalogSnapshot:
+    """
+    Serialize a listing once. The ETag is a digest of the body, so every process
+    building the same catalog hands out the same validator.
+    """
+    body = orjson.dumps(rows)
+    return CatalogSnapshot(
+        body=body,
+        gzip_body=gzip.compress(body, compresslevel=GZIP_LEVEL, mtime=0),
+        etag=f'"{hashlib.sha256(body).hexdigest()[:32]}"',
+        built_at=time.monotonic(),
+    )
+
+
+class CatalogCache:
+    """
+    Per-process cache of catalog snapshots (workflows, models, plans).
+
+    Writes made through this process invalidate the snapshot immediately; the TTL
+    bounds how long other processes keep serving a listing changed elsewhere.
+    """
+
+    def __init__(self, ttl_seconds: float):
+        self.ttl_seconds = ttl_seconds
+        self._snapshots: dict[str, CatalogSnapshot] = {}
+        self._generations: dict[str, int] = {}
+        self._locks: dict[str, asyncio.Lock] = {}
+
+    def _fresh(self, name: str) -> Optional[CatalogSnapshot]:
+        snapshot = self._snapshots.get(name)
+        if snapshot is None or time.monotonic() - snapshot.built_at >= self.ttl_seconds:
+            return None
+        return snapshot
+
+    async def get(
+        self, name: str, loader: Callable[[], Awaitable[list[dict[str, Any]]]]
+    ) -> CatalogSnapshot:
+        """
+        Return the snapshot of a catalog, rebuilding it with ``loader`` when missing or
+        expired. Concurrent misses share a single rebuild.
+        """
+        snapshot = self._fresh(name)
+        if snapshot is not None:
+            return snapshot
+        lock = self._locks.setdefault(name, asyncio.Lock())
+        async with lock:
+            snapshot = self._fresh(name)
+            if snapshot is not None:
+                return snapshot
+            generation = self._generations.get(name, 0)
+            snapshot = build_snapshot(await loader())
+            # A write that landed while the listing was loading makes it stale already.
+            if self._generations.get(name, 0) == generation:
+                self._snapshots[name] = snapshot
+            logger.debug("Catalog snapshot %s rebuilt (%d bytes).", name, len(snapshot.body))
+            return snapshot
+
+    def invalidate(self, name: str) -> None:
+        self._generations[name] = self._generations.get(name, 0) + 1
+        self._snapshots.pop(name, None)
+
+
+catalog_cache = CatalogCache(CATALOG_CACHE_TTL_SECONDS if CATALOG_CACHE_ENABLED else 0)
+
+
+def catalog_response(
+    snapshot: CatalogSnapshot,
+    if_none_match: Optional[str],
+    accept_encoding: Optional[str],
+) -> Response:
+    """
+    Build the response for a catalog snapshot: ``304`` when the client already has it,
+    otherwise the pre-compressed body if the client accepts gzip.
+    """
+    headers = {
+        "ETag": snapshot.etag,
+        "Cache-Control": CATALOG_CACHE_CONTROL,
+        "Vary": "Accept-Encoding",
+    }
+    if etag_matches(if_none_match, snapshot.etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    if accepts_encoding(accept_encoding, "gzip"):
+        headers["Content-Encoding"] = "gzip"
+        return Response(snapshot.gzip_body, media_type="application/json", headers=headers)
+    return Response(snapshot.body, media_type="application/json", headers=headers)
@@ -3,12 +3,23 @@ import asyncio
 from celery import Celery
 
 from core.comfy.comfy_core import check_queue_task, preview_queue_cleanup
+from core.comfy.queue_monitor import QUEUE_MONITOR_ENABLED
 from core.config_core import Config
+from handler.image_partition_handler import maintain_image_partitions_job
+from handler.storage_handler import reconcile_storage_job
 
 config_instance = Config()
 redis_host = config_instance.get("Redis", "host", default="localhost")
 redis_port = config_instance.getint("Redis", "port", default=6379)
 task_expiration = config_instance.getint("Celery", "task_expiration", default=600)
+storage_reconciliation_enabled = config_instance.getboolean(
+    "StorageReconciliation", "enabled", default=False
+)
+storage_reconciliation_interval = config_instance.getint(
+    "StorageReconciliation", "interval_hours", default=24
+)
+image_partitions_enabled = config_instance.getboolean("ImagePartitions", "enabled", default=False)
+image_partitions_interval = config_instance.getint("ImagePartitions", "interval_hours", default=24)
 
 
 
@@ -21,16 +32,31 @@ celery_app.conf.result_backend = f"redis://{redis_host}:{redis_port}/0"
 celery_app.conf.result_expires = task_expiration
 
 celery_app.conf.beat_schedule = {
-    "check-queue-every-1-second": {
-        "task": "core.celery_core.check_queue_task_celery",
-        "schedule": 1.0,
-    },
     "expire-old-previews-every-60-seconds": {
         "task": "core.celery_core.preview_queue_cleanup_celery",
         "schedule": 60.0,
     },
 }
 
+if not QUEUE_MONITOR_ENABLED:
+    # The API's queue monitor reports the queue depth from ComfyUI's status messages.
+    celery_app.conf.beat_schedule["check-queue-every-1-second"] = {
+        "task": "core.celery_core.check_queue_task_celery",
+        "schedule": 1.0,
+    }
+
+if storage_reconciliation_enabled:
+    celery_app.conf.beat_schedule["reconcile-storage"] = {
+        "task": "core.celery_core.reconcile_storage_celery",
+        "schedule": storage_reconciliation_interval * 3600.0,
+    }
+
+if image_partitions_enabled:
+    celery_app.conf.beat_schedule["maintain-image-partitions"] = {
+        "task": "core.celery_core.maintain_image_partitions_celery",
+        "schedule": image_partitions_interval * 3600.0,
+    }
+
 
 @celery_app.task
 def check_queue_task_celery():
@@ -39,3 +65,11 @@ def check_queue_task_celery():
 @celery_app.task
 def preview_queue_cleanup_celery():
     asyncio.run(preview_queue_cleanup())
+
+@celery_app.task
+def reconcile_storage_celery():
+    return asyncio.run(reconcile_storage_job())
+
+@celery_app.task
+def maintain_image_partitions_celery():
+    return asyncio.run(maintain_image_partitions_job())
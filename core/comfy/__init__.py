@@ -11,6 +11,7 @@ from core.comfy.preview import (
     get_preview_queue,
     preview_queue_cleanup,
 )
+from core.comfy.queue_monitor import QueueMonitor, monitor_queue
 from core.comfy.workflow import check_queue_task, execute_workflow
 
 __all__ = [
@@ -42,4 +43,8 @@ __all__ = [
     # Workflow
     'execute_workflow',
     'check_queue_task',
+    
+    # Queue monitor
+    'QueueMonitor',
+    'monitor_queue',
 ]
\ No newline at end of file
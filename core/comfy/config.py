@@ -9,6 +9,9 @@ from core.metric_core import InfluxDBWriter
 logger = setup_logger(__name__)
 config_instance = Config()
 server_address = config_instance.get("ComfyUI", "server", default="127.0.0.1:8188")
+queue_snapshot_seconds = float(
+    config_instance.get("ComfyUI", "queue_snapshot_seconds", default="1")
+)
 metric = InfluxDBWriter()
 
 # SSL and queue configuration
@@ -1,5 +1,6 @@
 import asyncio
 import json
+import time
 import urllib.error
 import urllib.parse
 import urllib.request
@@ -14,6 +15,9 @@ from utils.security_util import safe_urlopen
 
 logger = setup_logger(__name__)
 
+# The last /queue payload, shared by the callers that accept a recent snapshot.
+_queue_snapshot: dict[str, Any] = {"data": None, "fetched_at": 0.0, "task": None}
+
 async def ws_connect(user_id: str) -> websockets.WebSocketClientProtocol:
     """Connect to ComfyUI WebSocket server"""
     uri = f"ws://{server_address}/ws?clientId={urllib.parse.quote(user_id)}"
@@ -110,12 +114,39 @@ async def get_history(prompt_id: str) -> dict[str, Any]:
         raise ComfyUIError(f"Unexpected error getting history for {prompt_id}: {e}") from e
 
 
-async def get_queue(user_id: Optional[str] = None) -> dict[str, int]:
+def _fetch_queue_data() -> dict[str, Any]:
+    url = f"http://{server_address}/queue"
+    logger.debug("Fetching queue information from %s", url)
+    with safe_urlopen(url, timeout=30.0) as response:
+        return json.loads(response.read())
+
+
+async def _get_queue_data(max_age: float) -> dict[str, Any]:
+    """
+    Fetch the /queue payload in a worker thread. Callers within ``max_age`` seconds of
+    the last fetch reuse it, and concurrent callers share the request in flight.
+    """
+    data = _queue_snapshot["data"]
+    if data is not None and time.monotonic() - _queue_snapshot["fetched_at"] < max_age:
+        return data
+    loop = asyncio.get_running_loop()
+    task = _queue_snapshot["task"]
+    if task is None or task.done() or task.get_loop() is not loop:
+        task = loop.create_task(asyncio.to_thread(_fetch_queue_data))
+        _queue_snapshot["task"] = task
+    data = await asyncio.shield(task)
+    _queue_snapshot["data"] = data
+    _queue_snapshot["fetched_at"] = time.monotonic()
+    return data
+
+
+async def get_queue(user_id: Optional[str] = None, max_age: float = 0.0) -> dict[str, int]:
     """
     Get information about the current queue status from the ComfyUI server.
 
     Args:
         user_id (Optional[str]): If provided, filter queue information for this specific user
+        max_age (float): Accept a snapshot of the queue fetched up to this many seconds ago
 
     Returns:
         dict[str, int]: Dictionary containing queue information:
@@ -128,11 +159,7 @@ async def get_queue(user_id: Optional[str] = None) -> dict[str, int]:
         json.JSONDecodeError: If the response is not valid JSON
     """
     try:
-        url = f"http://{server_address}/queue"
-        logger.debug("Fetching queue information from %s", url)
-
-        with safe_urlopen(url) as response:
-            queue_data = json.loads(response.read())
+        queue_data = await _get_queue_data(max_age)
 
         # Extract queue data with defaults
         queue_running = queue_data.get("queue_running", [])
@@ -1,18 +1,21 @@
 import asyncio
+import time
 import urllib.error
 import urllib.parse
 from io import BytesIO
-from typing import Any
+from typing import Any, Optional
 
 import websockets
 from PIL import Image
 from pydantic.v1 import UUID4
 
-from core.comfy.config import server_address
-from core.comfy.connection import get_history, queue_prompt
+from core.comfy.config import queue_snapshot_seconds, server_address
+from core.comfy.connection import get_history, get_queue, queue_prompt
 from core.comfy.exceptions import ComfyUIError
 from core.comfy.preview import export_preview_queue
+from core.job_events_core import publish_job_event
 from core.logging_core import setup_logger
+from core.tracing_core import current_span, record_span, start_span, traced
 from utils.security_util import safe_urlopen
 
 logger = setup_logger(__name__)
@@ -43,14 +46,23 @@ async def get_image(filename: str, subfolder: str, folder_type: str) -> bytes:
         raise ComfyUIError(f"Unexpected error getting image {filename}: {e}") from e
 
 async def get_images(
-    ws: websockets.WebSocketClientProtocol, client_id: str, prompt: dict[str, Any]
-) -> dict[str, list[bytes]]:
-    """Get generated images from ComfyUI after executing a prompt."""
+    ws: websockets.WebSocketClientProtocol,
+    client_id: str,
+    prompt: dict[str, Any],
+    job_id: Optional[str] = None,
+) -> tuple[dict[str, list[bytes]], float]:
+    """
+    Get generated images from ComfyUI after executing a prompt. With a ``job_id``, the
+    ComfyUI messages of the prompt are published as job events while it runs.
+
+    Returns the images by output node and the seconds the prompt spent executing.
+    """
     if not ws or not client_id or not prompt:
         raise ValueError("WebSocket, client_id, and prompt cannot be empty")
     prompt_id = None
     try:
-        prompt_response = await queue_prompt(prompt, client_id)
+        with start_span("comfyui.queue_prompt"):
+            prompt_response = await queue_prompt(prompt, client_id)
         prompt_id = prompt_response.get("prompt_id")
         if not prompt_id:
             logger.error(
@@ -61,25 +73,74 @@ async def get_images(
                 "Invalid response from ComfyUI when queuing prompt (missing prompt_id)"
             )
         output_images = {}
+        publish_job_event(client_id, job_id, "queued", {
+            "prompt_id": prompt_id, "number": prompt_response.get("number"),
+        })
+        await _publish_queue_position(client_id, job_id)
 
         logger.info("Waiting for prompt %s execution (client: %s)", prompt_id, client_id)
-        await _wait_for_prompt_execution(ws, client_id, prompt_id)
+        with start_span("comfyui.wait", **{"comfyui.prompt_id": prompt_id}):
+            execution_seconds = await _wait_for_prompt_execution(
+                ws, client_id, prompt_id, job_id
+            )
 
-        history_data = await get_history(prompt_id)
+        with start_span("comfyui.history"):
+            history_data = await get_history(prompt_id)
         if prompt_id not in history_data:
             logger.warning("Prompt ID %s not found in history data.", prompt_id)
-            return {}
+            return {}, execution_seconds
         output_images = await _collect_output_images(history_data[prompt_id], prompt_id)
         if not output_images:
             logger.warning("No images found or retrieved in outputs for prompt %s", prompt_id)
-        return output_images
+        return output_images, execution_seconds
     except ComfyUIError as e:
         logger.error("ComfyUI error for prompt %s: %s", prompt_id, e)
         raise e
 
-async def _wait_for_prompt_execution(
-    ws: websockets.WebSocketClientProtocol, client_id: str, prompt_id: str,
+async def _publish_queue_position(client_id: str, job_id: Optional[str]) -> None:
+    if job_id is None:
+        return
+    try:
+        # Every waiting job asks on each status broadcast, so they share one snapshot.
+        queue = await get_queue(client_id, max_age=queue_snapshot_seconds)
+    except Exception as e:
+        logger.debug("Could not read the queue position of job %s: %s", job_id, e)
+        return
+    publish_job_event(client_id, job_id, "position", queue)
+
+
+def _publish_prompt_message(
+    message: dict[str, Any], client_id: str, prompt_id: str, job_id: Optional[str]
 ) -> None:
+    """Translate a ComfyUI message of the prompt into a job event."""
+    message_type = message.get("type")
+    data = message.get("data", {})
+    if data.get("prompt_id") != prompt_id:
+        return
+    if message_type == "execution_start":
+        publish_job_event(client_id, job_id, "started", {"prompt_id": prompt_id})
+    elif message_type == "executing" and data.get("node") is not None:
+        publish_job_event(client_id, job_id, "executing", {"node": data.get("node")})
+    elif message_type == "progress":
+        publish_job_event(client_id, job_id, "progress", {
+            "node": data.get("node"), "value": data.get("value"), "max": data.get("max"),
+        })
+
+
+async def _wait_for_prompt_execution(
+    ws: websockets.WebSocketClientProtocol,
+    client_id: str,
+    prompt_id: str,
+    job_id: Optional[str] = None,
+) -> float:
+    """
+    Follow the ComfyUI messages of a prompt until it completes, and return the seconds
+    between its ``execution_start`` and its completion (the time it held the GPU).
+    """
+    started = False
+    # Time in the ComfyUI queue and on the GPU, recorded as spans once known.
+    waiting_since = time.time_ns()
+    execution_started_at = None
     while True:
         try:
             ws_message = await asyncio.wait_for(ws.recv(), timeout=WEBSOCKET_RECEIVE_TIMEOUT)
@@ -87,11 +148,26 @@ async def _wait_for_prompt_execution(
                 try:
                     import json
                     message = json.loads(ws_message)
+                    if (
+                        message.get("type") == "execution_start"
+                        and message.get("data", {}).get("prompt_id") == prompt_id
+                    ):
+                        execution_started_at = time.time_ns()
+                        record_span("comfyui.queue_wait", waiting_since, execution_started_at)
+                    if job_id is not None:
+                        if message.get("type") == "status" and not started:
+                            await _publish_queue_position(client_id, job_id)
+                        elif message.get("type") == "execution_start":
+                            started = True
+                        _publish_prompt_message(message, client_id, prompt_id, job_id)
                     if message.get("type") == "executing":
                         data = message.get("data", {})
                         if data.get("node") is None and data.get("prompt_id") == prompt_id:
                             logger.info("Prompt %s execution completed.", prompt_id)
-                            break
+                            completed_at = time.time_ns()
+                            record_span("comfyui.execution", execution_started_at or waiting_since,
+                                        completed_at)
+                            return (completed_at - (execution_started_at or completed_at)) / 1e9
                         elif data.get("prompt_id") == prompt_id:
                             logger.debug("Prompt %s executing node: %s",
                                          prompt_id,
@@ -116,7 +192,10 @@ async def _wait_for_prompt_execution(
                 bytesio = BytesIO(ws_message[8:])
                 preview_image = Image.open(bytesio)
                 user_id = UUID4(client_id)
-                await export_preview_queue(user_id, preview_image)
+                await export_preview_queue(user_id, preview_image, job_id)
+                publish_job_event(client_id, job_id, "preview", {
+                    "url": f"/image/jobs/{job_id}/preview",
+                })
                 continue
         except asyncio.TimeoutError as e:
             logger.error("WebSocket receive timeout while waiting for prompt %s", prompt_id)
@@ -135,6 +214,7 @@ async def _wait_for_prompt_execution(
                 f"WebSocket connection closed unexpectedly for prompt {prompt_id}: {e}"
             ) from e
 
+@traced("comfyui.download_images")
 async def _collect_output_images(history: dict[str, Any], prompt_id: str) -> dict[str, list[bytes]]:
     outputs = history.get("outputs", {})
     logger.debug("Processing outputs for prompt %s: %s", prompt_id, list(outputs.keys()))
@@ -172,5 +252,11 @@ async def _collect_output_images(history: dict[str, Any], prompt_id: str) -> dic
                     )
             if node_images:
                 output_images[node_id] = node_images
+    span = current_span()
+    if span is not None:
+        span.set_attribute("images.count", sum(map(len, output_images.values())))
+        span.set_attribute("images.bytes", sum(
+            len(image) for images in output_images.values() for image in images
+        ))
     return output_images
 
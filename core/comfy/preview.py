@@ -10,18 +10,21 @@ from core.logging_core import setup_logger
 
 logger = setup_logger(__name__)
 
-async def export_preview_queue(user_id: UUID, preview_image: Image.Image):
-    """Add a preview image to the queue for a user"""
+async def export_preview_queue(
+    user_id: UUID, preview_image: Image.Image, job_id: Optional[str] = None
+):
+    """Add a preview image to the queue for a user's job"""
     try:
         metric.write_metric(
             measurement="preview_queue_cleanup",
             tags={},
             fields={"queue_size": preview_queue.qsize()},
         )
-        await clear_user_preview_queue(user_id)
+        await clear_user_preview_queue(user_id, job_id)
         await preview_queue.put(
             {
                 "user_id": user_id,
+                "job_id": job_id,
                 "image": preview_image,
                 "timestamp": datetime.now(timezone.utc)
             }
@@ -31,34 +34,41 @@ async def export_preview_queue(user_id: UUID, preview_image: Image.Image):
         logger.error("Error adding preview image to queue: %s", e)
         raise ComfyUIError(f"Error adding preview image to queue: {e}") from e
 
-async def get_preview_queue(user_id: UUID) -> Optional[Image.Image]:
-    """Get the latest preview image for a user"""
+async def get_preview_queue(
+    user_id: UUID, job_id: Optional[str] = None
+) -> Optional[Image.Image]:
+    """Get the latest preview image for a user, or for one of the user's jobs"""
     try:
-        preview_image = None
+        latest = None
+        threshold = datetime.now(timezone.utc) - expire_old_previews_queue_time
         queue_size = preview_queue.qsize()
         for _ in range(queue_size):
             item = await preview_queue.get()
-            if (item["user_id"] == user_id and item["timestamp"] >
-                    datetime.now(timezone.utc) - expire_old_previews_queue_time):
-                preview_image = item["image"]
-                await preview_queue.put(item)
-                break
-            else:
-                await preview_queue.put(item)
-        if preview_image:
+            await preview_queue.put(item)
+            if (
+                item["user_id"] == user_id
+                and (job_id is None or item.get("job_id") == job_id)
+                and item["timestamp"] > threshold
+                and (latest is None or item["timestamp"] > latest["timestamp"])
+            ):
+                latest = item
+        if latest:
             logger.debug("Latest preview image retrieved from queue for user %s.", user_id)
-        return preview_image
+            return latest["image"]
+        return None
     except Exception as e:
         logger.error("Error retrieving preview image from queue: %s", e)
         raise ComfyUIError(f"Error retrieving preview image from queue: {e}") from e
 
-async def clear_user_preview_queue(user_id: UUID):
-    """Remove all preview images for a user"""
+async def clear_user_preview_queue(user_id: UUID, job_id: Optional[str] = None):
+    """Remove all preview images for a user, or only those of one of the user's jobs"""
     try:
         queue_size = preview_queue.qsize()
         for _ in range(queue_size):
             item = await preview_queue.get()
-            if item["user_id"] != user_id:
+            if item["user_id"] != user_id or (
+                job_id is not None and item.get("job_id") != job_id
+            ):
                 await preview_queue.put(item)
         logger.debug("Cleared preview queue for user %s.", user_id)
     except Exception as e:
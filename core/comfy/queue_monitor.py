@@ -0,0 +1,126 @@
+import asyncio
+import json
+import time
+import uuid
+from typing import Any, Optional
+
+from core.comfy.config import metric
+from core.comfy.connection import ws_connect
+from core.config_core import Config
+from core.logging_core import setup_logger
+
+logger = setup_logger(__name__)
+config_instance = Config()
+
+QUEUE_MONITOR_ENABLED = config_instance.getboolean("QueueMonitor", "enabled", default=True)
+HEARTBEAT_SECONDS = config_instance.getint("QueueMonitor", "heartbeat_seconds", default=30)
+MAX_RECONNECT_SECONDS = config_instance.getint(
+    "QueueMonitor", "max_reconnect_seconds", default=30
+)
+
+
+def queue_fields(status: dict[str, Any]) -> Optional[dict[str, int]]:
+    """
+    Turn the data of a ComfyUI ``status`` message into queue metric fields.
+
+    ComfyUI only reports ``queue_remaining`` (running plus pending prompts) and runs
+    one prompt at a time, so at most one of them is running.
+    """
+    remaining = status.get("status", {}).get("exec_info", {}).get("queue_remaining")
+    if not isinstance(remaining, int):
+        return None
+    return {
+        "queue_remaining": remaining,
+        "queue_running": min(remaining, 1),
+        "queue_pending": max(remaining - 1, 0),
+    }
+
+
+class QueueMonitor:
+    """
+    Long-lived listener of the ComfyUI WebSocket that records the queue depth.
+
+    ComfyUI broadcasts a ``status`` message whenever its queue changes (and one on
+    connect), so the ``queue_status`` metric is written as soon as the depth changes,
+    and again every ``heartbeat_seconds`` while it does not. Lost connections are
+    retried with exponential backoff.
+    """
+
+    def __init__(
+        self,
+        heartbeat_seconds: float = HEARTBEAT_SECONDS,
+        max_reconnect_seconds: float = MAX_RECONNECT_SECONDS,
+        writer=metric,
+    ):
+        self.heartbeat_seconds = heartbeat_seconds
+        self.max_reconnect_seconds = max_reconnect_seconds
+        self.writer = writer
+        self.client_id = f"queue-monitor-{uuid.uuid4().hex}"
+        self.fields: Optional[dict[str, int]] = None
+        self._written_at = 0.0
+
+    def _write(self) -> None:
+        self.writer.write_metric(measurement="queue_status", tags={}, fields=self.fields)
+        self._written_at = time.monotonic()
+
+    def handle_message(self, message: dict[str, Any]) -> None:
+        if message.get("type") != "status":
+            return
+        fields = queue_fields(message.get("data", {}))
+        if fields is None:
+            return
+        changed = fields != self.fields
+        self.fields = fields
+        if changed:
+            logger.debug("ComfyUI queue changed: %s", fields)
+            self._write()
+
+    def heartbeat(self) -> None:
+        if self.fields is not None and (
+            time.monotonic() - self._written_at >= self.heartbeat_seconds
+        ):
+            self._write()
+
+    async def listen(self, ws) -> None:
+        """Handle the messages of one connection until it closes."""
+        while True:
+            timeout = self.heartbeat_seconds
+            if self.fields is not None:
+                timeout = max(timeout - (time.monotonic() - self._written_at), 0.1)
+            try:
+                ws_message = await asyncio.wait_for(ws.recv(), timeout=timeout)
+            except asyncio.TimeoutError:
+                self.heartbeat()
+                continue
+            # Binary messages are previews, sent to the client of the prompt only.
+            if isinstance(ws_message, str):
+                try:
+                    self.handle_message(json.loads(ws_message))
+                except json.JSONDecodeError:
+                    logger.warning("Received non-JSON message from WebSocket: %s...",
+                                   ws_message[:100])
+            self.heartbeat()
+
+    async def run(self) -> None:
+        """Monitor the queue until cancelled, reconnecting whenever the connection drops."""
+        backoff = 1.0
+        while True:
+            ws = None
+            try:
+                ws = await ws_connect(self.client_id)
+                backoff = 1.0
+                await self.listen(ws)
+            except Exception as e:
+                logger.warning("ComfyUI queue monitor disconnected, retrying in %ss: %s",
+                               backoff, e)
+            finally:
+                if ws is not None:
+                    await ws.close()
+            # The depth is unknown until the next connection reports it.
+            self.fields = None
+            await asyncio.sleep(backoff)
+            backoff = min(backoff * 2, self.max_reconnect_seconds)
+
+
+async def monitor_queue() -> None:
+    await QueueMonitor().run()
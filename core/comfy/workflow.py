@@ -5,22 +5,29 @@ from core.comfy.connection import get_queue, ws_connect
 from core.comfy.exceptions import ComfyUIError
 from core.comfy.images import get_images
 from core.logging_core import setup_logger
+from core.tracing_core import traced
 
 logger = setup_logger(__name__)
 
+@traced("comfyui.execute_workflow")
 async def execute_workflow(
     user_id: str, job_id: str, workflow_dict: dict[str, Any]
-) -> Optional[dict[str, list[bytes]]]:
-    """Execute a workflow on the ComfyUI server"""
+) -> tuple[Optional[dict[str, list[bytes]]], float]:
+    """
+    Execute a workflow on the ComfyUI server.
+
+    Returns the images by output node and the GPU seconds of the prompt, measured from
+    its ``execution_start`` to its completion (excluding connection, queue and download).
+    """
     client_id = f"{user_id}"
     logger.info("Executing workflow for user %s (job: %s)", user_id, job_id)
     ws = None
     try:
         ws = await ws_connect(client_id)
-        images_output = await get_images(ws, client_id, workflow_dict)
+        images_output, gpu_seconds = await get_images(ws, client_id, workflow_dict, job_id)
         logger.info("Workflow execution successful for user %s (job: %s)",
                     user_id, job_id)
-        return images_output
+        return images_output, gpu_seconds
     except ComfyUIError as e:
         logger.error("ComfyUI execution failed for user %s (job: %s): %s",
                      user_id, job_id, e)
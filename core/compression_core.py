@@ -0,0 +1,209 @@
+import asyncio
+import zlib
+from typing import Optional
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from core.config_core import Config
+from core.logging_core import setup_logger
+from utils.http_util import accepts_encoding
+
+try:
+    import brotli
+except ImportError:  # optional dependency
+    brotli = None
+try:
+    import zstandard
+except ImportError:  # optional dependency
+    zstandard = None
+
+logger = setup_logger(__name__)
+config_instance = Config()
+
+
+def _parse_list(value: str) -> list[str]:
+    return [item.strip() for item in value.split(",") if item.strip()]
+
+
+def _parse_levels(value: str) -> dict[str, int]:
+    levels = {}
+    for item in _parse_list(value):
+        content_type, _, level = item.rpartition(":")
+        levels[content_type.strip().lower()] = int(level)
+    return levels
+
+
+COMPRESSION_ENABLED = config_instance.getboolean("Compression", "enabled", default=True)
+MINIMUM_SIZE = config_instance.getint("Compression", "minimum_size", default=1024)
+OFFLOAD_SIZE = config_instance.getint("Compression", "offload_size", default=256 * 1024)
+ENCODINGS = _parse_list(config_instance.get("Compression", "encodings", default="zstd, br, gzip"))
+LEVELS = _parse_levels(config_instance.get(
+    "Compression", "levels", default="application/json:6, text/:6, application/javascript:6"
+))
+EXCLUDED_TYPES = ("text/event-stream",)
+
+
+class _BrotliCompressor:
+    def __init__(self, level: int):
+        self._compressor = brotli.Compressor(quality=level)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.process(data)
+
+    def flush(self) -> bytes:
+        return self._compressor.finish()
+
+
+def available_encodings() -> list[str]:
+    """The configured encodings whose codec is installed, in preference order."""
+    installed = {"gzip": True, "br": brotli is not None, "zstd": zstandard is not None}
+    return [encoding for encoding in ENCODINGS if installed.get(encoding)]
+
+
+def create_compressor(encoding: str, level: int):
+    """Return an incremental compressor exposing ``compress`` and ``flush``."""
+    if encoding == "gzip":
+        return zlib.compressobj(min(max(level, 1), 9), zlib.DEFLATED, 31)
+    if encoding == "br":
+        return _BrotliCompressor(min(max(level, 0), 11))
+    if encoding == "zstd":
+        return zstandard.ZstdCompressor(level=min(max(level, 1), 22)).compressobj()
+    raise ValueError(f"Unsupported encoding: {encoding}")
+
+
+def compression_level(content_type: str, levels: dict[str, int]) -> Optional[int]:
+    """
+    Return the level configured for a content type (entries ending in ``/`` match a
+    whole family), or None if responses of that type are not compressed.
+    """
+    media_type = content_type.split(";")[0].strip().lower()
+    if not media_type or media_type in EXCLUDED_TYPES:
+        return None
+    if media_type in levels:
+        return levels[media_type]
+    for prefix, level in levels.items():
+        if prefix.endswith("/") and media_type.startswith(prefix):
+            return level
+    return None
+
+
+class CompressionMiddleware:
+    """
+    Compress responses according to the request's Accept-Encoding.
+
+    Only configured (textual) content types are compressed, so already compressed media
+    such as image streams or ZIP exports pass through untouched, as do responses that
+    carry their own Content-Encoding. Bodies smaller than ``minimum_size`` are sent as
+    they are, and chunks of at least ``offload_size`` bytes are compressed in a worker
+    thread to keep the event loop responsive.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        minimum_size: int = MINIMUM_SIZE,
+        offload_size: int = OFFLOAD_SIZE,
+        encodings: Optional[list[str]] = None,
+        levels: Optional[dict[str, int]] = None,
+    ):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.offload_size = offload_size
+        self.encodings = available_encodings() if encodings is None else encodings
+        self.levels = LEVELS if levels is None else levels
+
+    def _negotiate(self, scope: Scope) -> Optional[str]:
+        accept_encoding = Headers(scope=scope).get("accept-encoding")
+        for encoding in self.encodings:
+            if accepts_encoding(accept_encoding, encoding):
+                return encoding
+        return None
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        encoding = self._negotiate(scope)
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+        responder = _CompressionResponder(self, encoding, send)
+        await self.app(scope, receive, responder.send)
+
+
+class _CompressionResponder:
+    def __init__(self, middleware: CompressionMiddleware, encoding: str, send: Send):
+        self.middleware = middleware
+        self.encoding = encoding
+        self.downstream = send
+        self.start_message: Optional[Message] = None
+        self.level: Optional[int] = None
+        self.compressor = None
+        self.passthrough = False
+
+    async def _compress(self, data: bytes, finish: bool) -> bytes:
+        def run() -> bytes:
+            chunk = self.compressor.compress(data)
+            return chunk + self.compressor.flush() if finish else chunk
+
+        if len(data) >= self.middleware.offload_size:
+            return await asyncio.to_thread(run)
+        return run()
+
+    def _should_compress(self, message: Message) -> bool:
+        headers = Headers(raw=message["headers"])
+        if message["status"] < 200 or message["status"] in (204, 206, 304):
+            return False
+        if "content-encoding" in headers or "content-range" in headers:
+            return False
+        self.level = compression_level(
+            headers.get("content-type", ""), self.middleware.levels
+        )
+        return self.level is not None
+
+    def _compressed_headers(self, content_length: Optional[int]) -> None:
+        headers = MutableHeaders(raw=self.start_message["headers"])
+        headers["Content-Encoding"] = self.encoding
+        headers.add_vary_header("Accept-Encoding")
+        etag = headers.get("etag")
+        if etag and not etag.startswith("W/"):
+            headers["ETag"] = "W/" + etag
+        if content_length is None:
+            del headers["Content-Length"]
+        else:
+            headers["Content-Length"] = str(content_length)
+
+    async def send(self, message: Message) -> None:
+        if message["type"] == "http.response.start":
+            self.start_message = message
+            self.passthrough = not self._should_compress(message)
+            if self.passthrough:
+                await self.downstream(message)
+            return
+        if message["type"] != "http.response.body" or self.passthrough:
+            await self.downstream(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+        if self.compressor is None:
+            if not more_body and len(body) < self.middleware.minimum_size:
+                self.passthrough = True
+                await self.downstream(self.start_message)
+                await self.downstream(message)
+                return
+            self.compressor = create_compressor(self.encoding, self.level)
+            if not more_body:
+                body = await self._compress(body, finish=True)
+                self._compressed_headers(len(body))
+                await self.downstream(self.start_message)
+                await self.downstream({"type": "http.response.body", "body": body})
+                return
+            self._compressed_headers(None)
+            await self.downstream(self.start_message)
+
+        chunk = await self._compress(body, finish=not more_body)
+        await self.downstream(
+            {"type": "http.response.body", "body": chunk, "more_body": more_body}
+        )
@@ -1,15 +1,26 @@
-from contextlib import asynccontextmanager
+import asyncio
+import itertools
+import threading
+import time
+from contextlib import asynccontextmanager, contextmanager
+from contextvars import ContextVar
 
 from dotenv import load_dotenv
+from sqlalchemy import event, exc, inspect, text
 from sqlalchemy.ext.asyncio import create_async_engine
 from sqlalchemy.orm import sessionmaker
-from sqlmodel import SQLModel
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+from sqlmodel import Session, SQLModel
 from sqlmodel.ext.asyncio.session import AsyncSession
 
+from core.config_core import Config
 from core.env_core import Envs, get_env_variable
 from core.logging_core import setup_logger
+from core.metric_core import InfluxDBWriter
+from model.app_state_model import AppState  # noqa
 from model.plan_model_model import PlanModel  # noqa
 from model.plan_workflow_model import PlanWorkflow  # noqa
+from model.user_usage_model import UserUsage  # noqa
 
 load_dotenv()
 
@@ -27,14 +38,164 @@ if not postgres_url:
     )
     raise ValueError("Missing POSTGRES_URL environment variable.")
 
-async_engine = create_async_engine(
-    postgres_url,
-    echo=False,
-    future=True
+config_instance = Config()
+POOL_SIZE = config_instance.getint("Database", "pool_size", default=10)
+MAX_OVERFLOW = config_instance.getint("Database", "max_overflow", default=20)
+POOL_TIMEOUT = config_instance.getint("Database", "pool_timeout", default=30)
+POOL_RECYCLE = config_instance.getint("Database", "pool_recycle", default=1800)
+POOL_PRE_PING = config_instance.getboolean("Database", "pool_pre_ping", default=True)
+STATEMENT_TIMEOUT_MS = config_instance.getint("Database", "statement_timeout_ms", default=30000)
+POOL_METRIC_INTERVAL = config_instance.getint("Database", "pool_metric_interval", default=15)
+
+
+class InstrumentedAsyncPool(AsyncAdaptedQueuePool):
+    """
+    Queue pool that records how long callers wait to check out a connection.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._stats_lock = threading.Lock()
+        self._reset_wait_stats()
+
+    def _reset_wait_stats(self):
+        self._checkouts = 0
+        self._wait_total = 0.0
+        self._wait_max = 0.0
+        self._timeouts = 0
+
+    def _do_get(self):
+        started_at = time.perf_counter()
+        try:
+            return super()._do_get()
+        except exc.TimeoutError:
+            with self._stats_lock:
+                self._timeouts += 1
+            raise
+        finally:
+            waited = time.perf_counter() - started_at
+            with self._stats_lock:
+                self._checkouts += 1
+                self._wait_total += waited
+                self._wait_max = max(self._wait_max, waited)
+
+    def collect_stats(self) -> dict:
+        """
+        Return the current pool usage and the checkout wait times since the last call.
+        """
+        with self._stats_lock:
+            checkouts = self._checkouts
+            stats = {
+                "pool_size": self.size(),
+                "checked_out": self.checkedout(),
+                "checked_in": self.checkedin(),
+                "overflow": max(self.overflow(), 0),
+                "checkouts": checkouts,
+                "checkout_timeouts": self._timeouts,
+                "wait_avg_ms": self._wait_total / checkouts * 1000 if checkouts else 0.0,
+                "wait_max_ms": self._wait_max * 1000,
+            }
+            self._reset_wait_stats()
+        return stats
+
+
+REPLICA_READ_YOUR_WRITES_SECONDS = config_instance.getint(
+    "Database", "replica_read_your_writes_seconds", default=5
 )
+replica_urls = [
+    url.strip()
+    for url in get_env_variable(Envs.POSTGRES_REPLICA_URLS, "").split(",")
+    if url.strip()
+]
+# Until this monotonic deadline, reads of the current context go to the primary.
+_primary_reads_until: ContextVar[float] = ContextVar("primary_reads_until", default=0.0)
+
+
+def _create_engine(url: str, read_only: bool = False):
+    server_settings = {}
+    if STATEMENT_TIMEOUT_MS > 0:
+        server_settings["statement_timeout"] = str(STATEMENT_TIMEOUT_MS)
+    if read_only:
+        server_settings["default_transaction_read_only"] = "on"
+    return create_async_engine(
+        url,
+        echo=False,
+        future=True,
+        poolclass=InstrumentedAsyncPool,
+        pool_size=POOL_SIZE,
+        max_overflow=MAX_OVERFLOW,
+        pool_timeout=POOL_TIMEOUT,
+        pool_recycle=POOL_RECYCLE,
+        pool_pre_ping=POOL_PRE_PING,
+        connect_args={"server_settings": server_settings} if server_settings else {},
+    )
+
+
+class PrimarySession(Session):
+    """Session bound to the primary; records whether it wrote anything."""
+
+
+@event.listens_for(PrimarySession, "after_flush")
+def _mark_flush_write(session, _flush_context):
+    session.info["wrote"] = True
+
+
+@event.listens_for(PrimarySession, "do_orm_execute")
+def _mark_statement_write(orm_execute_state):
+    if not orm_execute_state.is_select:
+        orm_execute_state.session.info["wrote"] = True
+
+
+async_engine = _create_engine(postgres_url)
 AsyncSessionLocal = sessionmaker(
-    bind=async_engine, class_=AsyncSession, expire_on_commit=False
+    bind=async_engine, class_=AsyncSession, expire_on_commit=False,
+    sync_session_class=PrimarySession,
 )
+replica_engines = [_create_engine(url, read_only=True) for url in replica_urls]
+ReplicaSessionLocals = [
+    sessionmaker(bind=engine, class_=AsyncSession, expire_on_commit=False)
+    for engine in replica_engines
+]
+_replica_cycle = itertools.cycle(ReplicaSessionLocals)
+
+def _upgrade_schema(connection):
+    """
+    Create indexes added to models after their table was first created, since
+    ``create_all`` skips existing tables entirely, and turn indexes that became
+    unique into unique indexes. Idempotent DDL listed in ``table.info["upgrade_ddl"]``
+    (such as new columns) runs first.
+    """
+    for table in SQLModel.metadata.sorted_tables:
+        for statement in table.info.get("upgrade_ddl", ()):
+            connection.execute(text(statement))
+    inspector = inspect(connection)
+    for table in SQLModel.metadata.sorted_tables:
+        existing = {index["name"]: index for index in inspector.get_indexes(table.name)}
+        for index in table.indexes:
+            current = existing.get(index.name)
+            if current is None:
+                index.create(connection)
+            elif index.unique and not current["unique"]:
+                try:
+                    with connection.begin_nested():
+                        index.drop(connection)
+                        index.create(connection)
+                    logger.info("Index %s recreated as unique.", index.name)
+                except exc.SQLAlchemyError as e:
+                    logger.error("Could not make index %s unique, check for duplicates: %s",
+                                 index.name, e)
+
+def _populate_new_tables(connection, existing_tables: set[str]):
+    """
+    Run the ``table.info["on_create_sql"]`` statements of the tables created just now,
+    e.g. to backfill aggregates from existing rows.
+    """
+    for table in SQLModel.metadata.sorted_tables:
+        if table.name in existing_tables:
+            continue
+        for statement in table.info.get("on_create_sql", ()):
+            connection.execute(text(statement))
+            logger.info("Populated new table %s.", table.name)
 
 async def create_db():
     """
@@ -42,7 +203,12 @@ async def create_db():
     """
     async def async_create_all():
         async with async_engine.begin() as conn:
+            existing_tables = await conn.run_sync(
+                lambda sync_conn: set(inspect(sync_conn).get_table_names())
+            )
             await conn.run_sync(SQLModel.metadata.create_all)
+            await conn.run_sync(_upgrade_schema)
+            await conn.run_sync(_populate_new_tables, existing_tables)
 
     try:
         await async_create_all()
@@ -50,10 +216,48 @@ async def create_db():
     except Exception as e:
         logger.error(f"Error creating database: {e}")
         raise e
+
+async def report_pool_metrics(interval: float = POOL_METRIC_INTERVAL):
+    """
+    Periodically write the connection pool usage of every engine to InfluxDB until cancelled.
+    """
+    metric = InfluxDBWriter()
+    engines = {"primary": async_engine}
+    engines.update({f"replica_{index}": engine for index, engine in enumerate(replica_engines)})
+    while True:
+        await asyncio.sleep(interval)
+        for name, engine in engines.items():
+            pool = engine.pool
+            if isinstance(pool, InstrumentedAsyncPool):
+                metric.write_metric(
+                    measurement="db_pool", tags={"engine": name}, fields=pool.collect_stats()
+                )
+
+async def dispose_engines():
+    """
+    Close the pooled connections of the primary and replica engines.
+    """
+    for engine in (async_engine, *replica_engines):
+        await engine.dispose()
+
+def pin_reads_to_primary(seconds: float = REPLICA_READ_YOUR_WRITES_SECONDS) -> None:
+    """
+    Route the reads of the current context to the primary for the next ``seconds``.
+    """
+    deadline = time.monotonic() + seconds
+    if deadline > _primary_reads_until.get():
+        _primary_reads_until.set(deadline)
+
+@contextmanager
+def read_from_primary():
+    """
+    Route every read made inside the block (in the current context) to the primary.
+    """
+    token = _primary_reads_until.set(float("inf"))
+    try:
+        yield
     finally:
-        # Dispose of engine properly for async usage
-        await async_engine.dispose()
-        logger.info("Database connection closed.")
+        _primary_reads_until.reset(token)
 
 @asynccontextmanager
 async def get_db_session() -> AsyncSession:
@@ -61,5 +265,22 @@ async def get_db_session() -> AsyncSession:
         try:
             yield session
         finally:
+            if session.sync_session.info.pop("wrote", False):
+                pin_reads_to_primary()
             await session.close()
 
+@asynccontextmanager
+async def get_read_db_session() -> AsyncSession:
+    """
+    Session for read-only work: served by a replica (round-robin) when one is configured,
+    unless the current context wrote recently or is pinned to the primary.
+    """
+    if not ReplicaSessionLocals or _primary_reads_until.get() > time.monotonic():
+        async with get_db_session() as session:
+            yield session
+        return
+    async with next(_replica_cycle)() as session:
+        try:
+            yield session
+        finally:
+            await session.close()
@@ -0,0 +1,289 @@
+import contextlib
+import hashlib
+import json
+import mmap
+import os
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Iterator
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Optional
+
+from core.config_core import Config
+from core.logging_core import setup_logger
+from core.metric_core import InfluxDBWriter
+
+logger = setup_logger(__name__)
+
+DATA_SUFFIX = ".bin"
+META_SUFFIX = ".json"
+EVICTION_WATERMARK = 0.9
+
+
+@dataclass
+class CachedObject:
+    """Metadata of a cached object, mirroring the fields used from a MinIO stat."""
+    path: str
+    size: int
+    etag: Optional[str]
+    last_modified: Optional[datetime]
+    content_type: Optional[str]
+
+
+class DiskCache:
+    """
+    Size-bounded LRU cache of MinIO objects on local disk.
+
+    Recency is tracked through file modification times, so several worker processes
+    can share the same directory: lookups always fall back to the file system and
+    eviction rescans the directory before removing the least recently used entries.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        max_size_bytes: int,
+        max_object_size_bytes: int,
+        metric_interval: float = 60.0,
+        metric: Optional[InfluxDBWriter] = None,
+    ):
+        self.path = path
+        self.max_size_bytes = max_size_bytes
+        self.max_object_size_bytes = max_object_size_bytes
+        self.metric_interval = metric_interval
+        self.metric = metric
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[str, int] = OrderedDict()
+        self._size = 0
+        self._last_metric_at = time.monotonic()
+        os.makedirs(self.path, exist_ok=True)
+        self._rescan()
+
+    @staticmethod
+    def _key(bucket_name: str, object_name: str) -> str:
+        return hashlib.sha256(f"{bucket_name}/{object_name}".encode()).hexdigest()
+
+    def _data_path(self, key: str) -> str:
+        return os.path.join(self.path, key[:2], key + DATA_SUFFIX)
+
+    def _meta_path(self, key: str) -> str:
+        return os.path.join(self.path, key[:2], key + META_SUFFIX)
+
+    def _rescan(self) -> None:
+        """Rebuild the LRU index from the files present on disk."""
+        found = []
+        for root, _, files in os.walk(self.path):
+            for name in files:
+                if not name.endswith(DATA_SUFFIX):
+                    continue
+                try:
+                    stat_result = os.stat(os.path.join(root, name))
+                except FileNotFoundError:
+                    continue
+                found.append((stat_result.st_mtime, name[: -len(DATA_SUFFIX)], stat_result.st_size))
+        found.sort()
+        self._entries = OrderedDict((key, size) for _, key, size in found)
+        self._size = sum(self._entries.values())
+
+    def _remove_files(self, key: str) -> None:
+        for file_path in (self._data_path(key), self._meta_path(key)):
+            with contextlib.suppress(FileNotFoundError):
+                os.remove(file_path)
+
+    def _evict(self) -> None:
+        if self._size <= self.max_size_bytes:
+            return
+        self._rescan()
+        target = self.max_size_bytes * EVICTION_WATERMARK
+        evicted = 0
+        while self._entries and self._size > target:
+            key, size = self._entries.popitem(last=False)
+            self._remove_files(key)
+            self._size -= size
+            evicted += 1
+        logger.debug("Evicted %d object(s) from disk cache.", evicted)
+
+    def _record(self, hit: bool) -> None:
+        if hit:
+            self.hits += 1
+        else:
+            self.misses += 1
+        now = time.monotonic()
+        if self.metric is None or now - self._last_metric_at < self.metric_interval:
+            return
+        self._last_metric_at = now
+        self.metric.write_metric(measurement="disk_cache", tags={}, fields=self.stats())
+
+    def stats(self) -> dict:
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+            "size_bytes": self._size,
+            "entries": len(self._entries),
+        }
+
+    def get(
+        self, bucket_name: str, object_name: str, record: bool = True
+    ) -> Optional[CachedObject]:
+        """
+        Look up an object, marking it as recently used. With ``record`` unset the
+        lookup is not counted as a hit or miss (for a repeated lookup of a request).
+
+        Returns:
+            Optional[CachedObject]: The cached object or None on a miss.
+        """
+        key = self._key(bucket_name, object_name)
+        data_path = self._data_path(key)
+        try:
+            with open(self._meta_path(key), encoding="utf-8") as f:
+                meta = json.load(f)
+            os.utime(data_path)
+        except (FileNotFoundError, ValueError):
+            if record:
+                with self._lock:
+                    self._record(hit=False)
+            return None
+        with self._lock:
+            if key not in self._entries:
+                self._entries[key] = meta["size"]
+                self._size += meta["size"]
+            self._entries.move_to_end(key)
+            if record:
+                self._record(hit=True)
+        last_modified = meta.get("last_modified")
+        return CachedObject(
+            path=data_path,
+            size=meta["size"],
+            etag=meta.get("etag"),
+            last_modified=datetime.fromisoformat(last_modified) if last_modified else None,
+            content_type=meta.get("content_type"),
+        )
+
+    def put_file(
+        self,
+        bucket_name: str,
+        object_name: str,
+        source_path: str,
+        etag: Optional[str] = None,
+        last_modified: Optional[datetime] = None,
+        content_type: Optional[str] = None,
+    ) -> None:
+        """
+        Move a fully written temporary file into the cache.
+        """
+        size = os.path.getsize(source_path)
+        if size > self.max_object_size_bytes:
+            os.remove(source_path)
+            return
+        key = self._key(bucket_name, object_name)
+        data_path = self._data_path(key)
+        os.makedirs(os.path.dirname(data_path), exist_ok=True)
+        meta = {
+            "size": size,
+            "etag": etag,
+            "last_modified": (last_modified or datetime.now(timezone.utc)).isoformat(),
+            "content_type": content_type,
+        }
+        with self._lock:
+            try:
+                os.replace(source_path, data_path)
+                meta_tmp = self._meta_path(key) + ".tmp"
+                with open(meta_tmp, "w", encoding="utf-8") as f:
+                    json.dump(meta, f)
+                os.replace(meta_tmp, self._meta_path(key))
+            except OSError as e:
+                logger.warning("Failed to store object %s in disk cache: %s", object_name, e)
+                self._remove_files(key)
+                return
+            self._size += size - self._entries.pop(key, 0)
+            self._entries[key] = size
+            self._evict()
+
+    def put(
+        self,
+        bucket_name: str,
+        object_name: str,
+        data: bytes,
+        etag: Optional[str] = None,
+        last_modified: Optional[datetime] = None,
+        content_type: Optional[str] = None,
+    ) -> None:
+        """
+        Store an object in the cache (write-through on upload, read-through on miss).
+        """
+        if len(data) > self.max_object_size_bytes:
+            return
+        try:
+            temp_path = self.create_temp_file()
+            with open(temp_path, "wb") as f:
+                f.write(data)
+        except OSError as e:
+            logger.warning("Failed to write object %s to disk cache: %s", object_name, e)
+            return
+        self.put_file(bucket_name, object_name, temp_path, etag, last_modified, content_type)
+
+    def create_temp_file(self) -> str:
+        fd, temp_path = tempfile.mkstemp(dir=self.path, suffix=".tmp")
+        os.close(fd)
+        return temp_path
+
+    def invalidate(self, bucket_name: str, object_name: str) -> None:
+        key = self._key(bucket_name, object_name)
+        with self._lock:
+            self._size -= self._entries.pop(key, 0)
+            self._remove_files(key)
+
+
+def iter_cached_file(
+    path: str, offset: int = 0, length: int = 0, chunk_size: int = 64 * 1024
+) -> Iterator[bytes]:
+    """
+    Serve a cached file (or a byte range of it) through a memory map.
+
+    The pages come straight from the OS page cache, so hot objects are served without
+    any read syscalls per chunk.
+    """
+    with open(path, "rb") as f:
+        size = os.fstat(f.fileno()).st_size
+        if size == 0:
+            return
+        end = size if not length else min(offset + length, size)
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            view = memoryview(mapped)
+            try:
+                for start in range(offset, end, chunk_size):
+                    yield bytes(view[start:min(start + chunk_size, end)])
+            finally:
+                view.release()
+
+
+def create_disk_cache() -> Optional[DiskCache]:
+    """
+    Create the disk cache configured in the [DiskCache] section, if enabled.
+    """
+    config_instance = Config()
+    if not config_instance.getboolean("DiskCache", "enabled", default=False):
+        return None
+    try:
+        cache = DiskCache(
+            path=config_instance.get("DiskCache", "path", default="./cache/objects"),
+            max_size_bytes=config_instance.getint("DiskCache", "max_size_mb", default=1024)
+            * 1024 * 1024,
+            max_object_size_bytes=config_instance.getint(
+                "DiskCache", "max_object_size_mb", default=10
+            ) * 1024 * 1024,
+            metric_interval=config_instance.getint("DiskCache", "metric_interval", default=60),
+            metric=InfluxDBWriter(),
+        )
+        logger.info("Disk cache enabled at %s.", cache.path)
+        return cache
+    except OSError as e:
+        logger.error("Failed to initialize disk cache, continuing without it: %s", e)
+        return None
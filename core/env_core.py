@@ -36,6 +36,7 @@ class Envs:
 
     # Database
     POSTGRES_URL = "POSTGRES_URL" # nosec B105
+    POSTGRES_REPLICA_URLS = "POSTGRES_REPLICA_URLS" # nosec B105
 
     # MinIO
     MINIO_ENDPOINT = "MINIO_ENDPOINT" # nosec B105
@@ -1,6 +1,26 @@
+import asyncio
+import base64
+import contextlib
+import hashlib
+import json
+import time
+from collections import OrderedDict
+from collections.abc import AsyncIterator
+from typing import Any, Optional
+
 import httpx
 from dotenv import load_dotenv
+from fief_client import (
+    FiefAccessTokenACRTooLow,
+    FiefAccessTokenInfo,
+    FiefAccessTokenMissingPermission,
+    FiefAccessTokenMissingScope,
+    FiefACR,
+    FiefAsync,
+)
+from jwcrypto import jwk
 
+from core.config_core import Config
 from core.env_core import Envs, get_env_variable
 from core.logging_core import setup_logger
 
@@ -8,10 +28,14 @@ from core.logging_core import setup_logger
 logger = setup_logger(__name__)
 
 load_dotenv()
+config_instance = Config()
 
 FIEF_API_URL = get_env_variable(Envs.FIEF_API_URL)
 FIEF_USERS_API_URL = f"{FIEF_API_URL}/users/"
 FIEF_API_USER_TOKEN = get_env_variable(Envs.FIEF_API_USER_TOKEN)
+TOKEN_CACHE_SIZE = config_instance.getint("Fief", "token_cache_size", default=10000)
+JWKS_REFRESH_SECONDS = config_instance.getint("Fief", "jwks_refresh_seconds", default=3600)
+JWKS_MIN_REFRESH_SECONDS = config_instance.getint("Fief", "jwks_min_refresh_seconds", default=30)
 
 class FiefHttpClient:
     """
@@ -65,3 +89,193 @@ class FiefHttpClient:
             logger.error(f"An error occurred: {str(e)}")
             raise
 
+
+
+class FiefAsyncHttpClient:
+    """
+    An async client for listing users of the Fief API page by page.
+    """
+
+    def __init__(
+        self,
+        page_size: int = 100,
+        timeout: float = 30.0,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+    ):
+        self.base_url = FIEF_USERS_API_URL
+        self.page_size = page_size
+        self.transport = transport
+        self.headers = {
+            "Authorization": f"Bearer {FIEF_API_USER_TOKEN}",
+            "Content-Type": "application/json",
+        }
+        self.timeout = timeout
+
+    async def _get_page(self, client: httpx.AsyncClient, skip: int, ordering: str) -> dict:
+        try:
+            response = await client.get(
+                self.base_url,
+                params={"limit": self.page_size, "skip": skip, "ordering": ordering},
+            )
+            response.raise_for_status()
+            return response.json()
+        except httpx.HTTPStatusError as e:
+            logger.error(f"HTTP error occurred: {e.response.status_code} - {e.response.text}")
+            raise
+        except Exception as e:
+            logger.error(f"An error occurred: {str(e)}")
+            raise
+
+    async def iter_user_pages(self, ordering: str = "-updated_at") -> AsyncIterator[list[dict]]:
+        """
+        Yield the users of Fief one page at a time.
+
+        The next page is requested while the caller processes the current one, so
+        network latency overlaps with the local work. Stopping the iteration early
+        cancels the pending request.
+
+        Args:
+            ordering (str): Fief ordering expression, newest updates first by default.
+
+        Yields:
+            list[dict]: The users of each page.
+        """
+        async with httpx.AsyncClient(
+            headers=self.headers, timeout=self.timeout, transport=self.transport
+        ) as client:
+            skip = 0
+            next_page = asyncio.create_task(self._get_page(client, skip, ordering))
+            try:
+                while next_page is not None:
+                    page = await next_page
+                    next_page = None
+                    results = page.get("results", [])
+                    skip += len(results)
+                    if results and skip < page.get("count", 0):
+                        next_page = asyncio.create_task(self._get_page(client, skip, ordering))
+                    if results:
+                        yield results
+            finally:
+                if next_page is not None:
+                    next_page.cancel()
+                    with contextlib.suppress(asyncio.CancelledError, httpx.HTTPError):
+                        await next_page
+
+
+def _token_segment(token: str, index: int) -> dict[str, Any]:
+    """Decode a segment of a compact JWT without verifying it (empty if malformed)."""
+    try:
+        segment = token.split(".")[index]
+        decoded = json.loads(base64.urlsafe_b64decode(segment + "=" * (-len(segment) % 4)))
+    except (IndexError, ValueError):
+        return {}
+    return decoded if isinstance(decoded, dict) else {}
+
+
+class CachedFiefAsync(FiefAsync):
+    """
+    FiefAsync client that validates access tokens locally and remembers them.
+
+    Signatures are checked against the tenant's JWKS, fetched once and refreshed in
+    the background every ``jwks_refresh_seconds``, or right away when a token is
+    signed by an unknown key (key rotation), at most once per
+    ``jwks_min_refresh_seconds``. Validated tokens are kept in a bounded LRU keyed
+    by the token's SHA-256 until they expire, so repeated checks of the same token
+    cost a dictionary lookup instead of an RSA verification.
+    """
+
+    def __init__(
+        self,
+        *args,
+        token_cache_size: int = TOKEN_CACHE_SIZE,
+        jwks_refresh_seconds: float = JWKS_REFRESH_SECONDS,
+        jwks_min_refresh_seconds: float = JWKS_MIN_REFRESH_SECONDS,
+        **kwargs,
+    ):
+        super().__init__(*args, **kwargs)
+        self.token_cache_size = token_cache_size
+        self.jwks_refresh_seconds = jwks_refresh_seconds
+        self.jwks_min_refresh_seconds = jwks_min_refresh_seconds
+        self._tokens: OrderedDict[bytes, tuple[FiefAccessTokenInfo, float]] = OrderedDict()
+        self._jwks_fetched_at = 0.0
+        self._jwks_attempted_at: Optional[float] = None
+        self._jwks_lock: Optional[asyncio.Lock] = None
+        self._jwks_refresh: Optional[asyncio.Task] = None
+
+    async def _fetch_jwks(self) -> jwk.JWKSet:
+        jwks_uri = self._get_endpoint_url(await self._get_openid_configuration(), "jwks_uri")
+        async with self._get_httpx_client() as client:
+            response = await client.get(jwks_uri)
+            response.raise_for_status()
+            return jwk.JWKSet.from_json(response.text)
+
+    async def _refresh_jwks(self) -> None:
+        """Fetch the JWKS again, unless it was attempted too recently."""
+        if self._jwks_lock is None:
+            self._jwks_lock = asyncio.Lock()
+        async with self._jwks_lock:
+            now = time.monotonic()
+            if (self._jwks is not None and self._jwks_attempted_at is not None
+                    and now - self._jwks_attempted_at < self.jwks_min_refresh_seconds):
+                return
+            self._jwks_attempted_at = now
+            try:
+                self._jwks = await self._fetch_jwks()
+                self._jwks_fetched_at = time.monotonic()
+                logger.debug("Fief JWKS refreshed.")
+            except Exception as e:
+                if self._jwks is None:
+                    raise
+                logger.warning("Could not refresh the Fief JWKS, keeping the current keys: %s", e)
+
+    async def _get_jwks(self) -> jwk.JWKSet:
+        if self._jwks is None:
+            await self._refresh_jwks()
+        elif (time.monotonic() - self._jwks_fetched_at >= self.jwks_refresh_seconds
+              and (self._jwks_refresh is None or self._jwks_refresh.done())):
+            self._jwks_refresh = asyncio.create_task(self._refresh_jwks())
+        return self._jwks
+
+    async def _decode_access_token(self, access_token: str) -> FiefAccessTokenInfo:
+        jwks = await self._get_jwks()
+        kid = _token_segment(access_token, 0).get("kid")
+        if kid is not None and jwks.get_key(kid) is None:
+            await self._refresh_jwks()
+            jwks = self._jwks
+        return self._validate_access_token(access_token, jwks)
+
+    def _remember(self, key: bytes, info: FiefAccessTokenInfo, access_token: str) -> None:
+        expires_at = _token_segment(access_token, 1).get("exp")
+        if not isinstance(expires_at, (int, float)) or self.token_cache_size <= 0:
+            return
+        self._tokens[key] = (info, float(expires_at))
+        if len(self._tokens) > self.token_cache_size:
+            self._tokens.popitem(last=False)
+
+    async def validate_access_token(
+        self,
+        access_token: str,
+        *,
+        required_scope: Optional[list[str]] = None,
+        required_acr: Optional[FiefACR] = None,
+        required_permissions: Optional[list[str]] = None,
+    ) -> FiefAccessTokenInfo:
+        key = hashlib.sha256(access_token.encode()).digest()
+        cached = self._tokens.get(key)
+        if cached is not None and cached[1] > time.time():
+            self._tokens.move_to_end(key)
+            info = cached[0]
+        else:
+            if cached is not None:
+                del self._tokens[key]
+            info = await self._decode_access_token(access_token)
+            self._remember(key, info, access_token)
+
+        if required_scope is not None and not set(required_scope) <= set(info["scope"]):
+            raise FiefAccessTokenMissingScope()
+        if required_acr is not None and info["acr"] < required_acr:
+            raise FiefAccessTokenACRTooLow()
+        if (required_permissions is not None
+                and not set(required_permissions) <= set(info["permissions"])):
+            raise FiefAccessTokenMissingPermission()
+        return dict(info)
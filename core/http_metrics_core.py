@@ -0,0 +1,210 @@
+import asyncio
+import bisect
+import time
+from dataclasses import dataclass, field
+from typing import Any
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from core.config_core import Config
+from core.logging_core import setup_logger
+from core.metric_core import InfluxDBWriter
+from core.prometheus_core import NAMESPACE, PROMETHEUS_ENABLED, metric_name, registry
+
+logger = setup_logger(__name__)
+config_instance = Config()
+
+HTTP_METRICS_ENABLED = config_instance.getboolean("HttpMetrics", "enabled", default=True)
+HTTP_METRICS_INTERVAL = config_instance.getint("HttpMetrics", "flush_seconds", default=10)
+LATENCY_BUCKETS_MS = tuple(
+    float(bucket)
+    for bucket in config_instance.get(
+        "HttpMetrics", "latency_buckets_ms",
+        default="5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000",
+    ).split(",")
+)
+UNMATCHED_ROUTE = "unmatched"
+
+
+def _content_length(scope: Scope) -> int:
+    for name, value in scope["headers"]:
+        if name == b"content-length":
+            return int(value) if value.isdigit() else 0
+    return 0
+
+
+@dataclass
+class RouteStats:
+    """Counters of the requests of one method, route and status since the last flush."""
+    count: int = 0
+    latency_sum_ms: float = 0.0
+    latency_max_ms: float = 0.0
+    request_bytes: int = 0
+    response_bytes: int = 0
+    buckets: list[int] = field(default_factory=lambda: [0] * (len(LATENCY_BUCKETS_MS) + 1))
+
+    def fields(self) -> dict[str, Any]:
+        """Flatten the stats into metric fields, with cumulative ``le_*`` buckets."""
+        fields: dict[str, Any] = {
+            "count": self.count,
+            "latency_sum_ms": round(self.latency_sum_ms, 3),
+            "latency_max_ms": round(self.latency_max_ms, 3),
+            "request_bytes": self.request_bytes,
+            "response_bytes": self.response_bytes,
+        }
+        cumulative = 0
+        for bound, bucket_count in zip((*LATENCY_BUCKETS_MS, None), self.buckets):
+            cumulative += bucket_count
+            fields["le_inf" if bound is None else f"le_{bound:g}"] = cumulative
+        return fields
+
+
+class HttpMetrics:
+    """
+    In-process aggregation of HTTP request metrics. Recording a request only updates
+    a few counters; the aggregate is swapped out and written on every flush.
+    """
+
+    def __init__(self):
+        self.routes: dict[tuple[str, str, int], RouteStats] = {}
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    def started(self) -> None:
+        self.in_flight += 1
+        if self.in_flight > self.max_in_flight:
+            self.max_in_flight = self.in_flight
+
+    def finished(
+        self,
+        method: str,
+        route: str,
+        status_code: int,
+        latency_ms: float,
+        request_bytes: int,
+        response_bytes: int,
+    ) -> None:
+        self.in_flight -= 1
+        key = (method, route, status_code)
+        stats = self.routes.get(key)
+        if stats is None:
+            stats = self.routes[key] = RouteStats()
+        stats.count += 1
+        stats.latency_sum_ms += latency_ms
+        if latency_ms > stats.latency_max_ms:
+            stats.latency_max_ms = latency_ms
+        stats.request_bytes += request_bytes
+        stats.response_bytes += response_bytes
+        stats.buckets[bisect.bisect_left(LATENCY_BUCKETS_MS, latency_ms)] += 1
+
+    def collect(self) -> tuple[dict[tuple[str, str, int], RouteStats], dict[str, int]]:
+        """Return the aggregate since the last call and start a new one."""
+        routes, self.routes = self.routes, {}
+        in_flight = {"in_flight": self.in_flight, "max_in_flight": self.max_in_flight}
+        self.max_in_flight = self.in_flight
+        return routes, in_flight
+
+
+http_metrics = HttpMetrics()
+
+
+class HttpMetricsMiddleware:
+    """
+    Record the latency, status and request/response sizes of every HTTP request,
+    grouped by route template (not raw path) to keep the number of series bounded.
+    """
+
+    def __init__(self, app: ASGIApp, metrics: HttpMetrics = http_metrics):
+        self.app = app
+        self.metrics = metrics
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        started_at = time.perf_counter()
+        status_code = 500
+        request_bytes = 0
+        response_bytes = 0
+
+        async def receive_counted() -> Message:
+            nonlocal request_bytes
+            message = await receive()
+            request_bytes += len(message.get("body", b""))
+            return message
+
+        async def send_counted(message: Message) -> None:
+            nonlocal status_code, response_bytes
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            elif message["type"] == "http.response.body":
+                response_bytes += len(message.get("body", b""))
+            await send(message)
+
+        self.metrics.started()
+        try:
+            await self.app(scope, receive_counted, send_counted)
+        finally:
+            route = getattr(scope.get("route"), "path", None) or UNMATCHED_ROUTE
+            self.metrics.finished(
+                scope["method"],
+                route,
+                status_code,
+                (time.perf_counter() - started_at) * 1000,
+                # Bodies the endpoint never read still count, by their declared length.
+                max(request_bytes, _content_length(scope)),
+                response_bytes,
+            )
+
+
+def export_http_metrics(
+    routes: dict[tuple[str, str, int], RouteStats], in_flight: dict[str, int]
+) -> None:
+    """Add the aggregate to the Prometheus counters and latency histogram."""
+    buckets = [bound / 1000 for bound in LATENCY_BUCKETS_MS]
+    for (method, route, status_code), stats in routes.items():
+        labels = {"method": method, "route": route, "status": status_code}
+        registry.inc(metric_name(NAMESPACE, "http_requests_total"), stats.count, labels,
+                     help_text="HTTP requests by method, route and status.")
+        registry.observe_many(
+            metric_name(NAMESPACE, "http_request_duration_seconds"), stats.buckets,
+            stats.latency_sum_ms / 1000, stats.count, buckets, labels,
+            help_text="HTTP request latency.",
+        )
+        registry.inc(metric_name(NAMESPACE, "http_request_size_bytes_total"),
+                     stats.request_bytes, labels, help_text="HTTP request body bytes.")
+        registry.inc(metric_name(NAMESPACE, "http_response_size_bytes_total"),
+                     stats.response_bytes, labels, help_text="HTTP response body bytes.")
+    registry.set(metric_name(NAMESPACE, "http_requests_in_flight"), in_flight["in_flight"],
+                 help_text="HTTP requests being served.")
+
+
+def write_http_metrics(
+    metric: InfluxDBWriter,
+    routes: dict[tuple[str, str, int], RouteStats],
+    in_flight: dict[str, int],
+) -> None:
+    for (method, route, status_code), stats in routes.items():
+        metric.write_metric(
+            measurement="http_requests",
+            tags={"method": method, "route": route, "status": status_code},
+            fields=stats.fields(),
+            mirror=False,
+        )
+    metric.write_metric(measurement="http_in_flight", tags={}, fields=in_flight, mirror=False)
+
+
+async def report_http_metrics(interval: float = HTTP_METRICS_INTERVAL):
+    """
+    Periodically write the aggregated HTTP request metrics to InfluxDB until cancelled.
+    """
+    metric = InfluxDBWriter()
+    while True:
+        await asyncio.sleep(interval)
+        routes, in_flight = http_metrics.collect()
+        if PROMETHEUS_ENABLED:
+            export_http_metrics(routes, in_flight)
+        try:
+            await asyncio.to_thread(write_http_metrics, metric, routes, in_flight)
+        except Exception as e:
+            logger.error("Failed to write HTTP metrics: %s", e)
@@ -0,0 +1,158 @@
+import asyncio
+import time
+from collections import deque
+from collections.abc import AsyncIterator
+from dataclasses import dataclass, field
+from typing import Any, Optional
+
+from core.config_core import Config
+from core.logging_core import setup_logger
+
+logger = setup_logger(__name__)
+config_instance = Config()
+
+HISTORY_SIZE = config_instance.getint("JobEvents", "history_size", default=100)
+SUBSCRIBER_QUEUE_SIZE = config_instance.getint("JobEvents", "subscriber_queue_size", default=256)
+RETENTION_SECONDS = config_instance.getint("JobEvents", "retention_seconds", default=300)
+TERMINAL_EVENTS = frozenset({"completed", "failed"})
+
+
+@dataclass(frozen=True)
+class JobEvent:
+    id: int
+    event: str
+    data: dict[str, Any]
+
+
+@dataclass
+class _JobChannel:
+    events: deque = field(default_factory=lambda: deque(maxlen=HISTORY_SIZE))
+    subscribers: set = field(default_factory=set)
+    # Set once the job is claimed by a generation or has published an event.
+    known: asyncio.Event = field(default_factory=asyncio.Event)
+    claimed: bool = False
+    next_id: int = 1
+    updated_at: float = field(default_factory=time.monotonic)
+
+
+class JobEventBus:
+    """
+    In-process publish/subscribe of job progress events.
+
+    Events are pushed by the ComfyUI message loop and the generation handler as they
+    happen and fanned out to the subscribers of the job. Each job keeps a short
+    history, so a client that connects late (or reconnects with ``Last-Event-ID``)
+    replays what it missed. Channels are keyed by user and job, so a user can only
+    observe their own jobs.
+    """
+
+    def __init__(self, retention_seconds: float = RETENTION_SECONDS):
+        self.retention_seconds = retention_seconds
+        self._channels: dict[tuple[str, str], _JobChannel] = {}
+
+    def _prune(self) -> None:
+        cutoff = time.monotonic() - self.retention_seconds
+        expired = [
+            key for key, channel in self._channels.items()
+            if not channel.subscribers and channel.updated_at < cutoff
+        ]
+        for key in expired:
+            del self._channels[key]
+
+    def _channel(self, user_id: Any, job_id: Any) -> _JobChannel:
+        key = (str(user_id), str(job_id))
+        channel = self._channels.get(key)
+        if channel is None:
+            self._prune()
+            channel = self._channels[key] = _JobChannel()
+        return channel
+
+    def claim(self, user_id: Any, job_id: Any) -> bool:
+        """
+        Reserve a job id for a new generation. Returns False if the id was already
+        used by one of the user's jobs, whose events would otherwise be replayed.
+        """
+        channel = self._channel(user_id, job_id)
+        if channel.claimed or channel.events:
+            return False
+        channel.claimed = True
+        channel.updated_at = time.monotonic()
+        channel.known.set()
+        return True
+
+    async def wait_until_known(self, user_id: Any, job_id: Any, timeout: float) -> bool:
+        """Wait up to ``timeout`` seconds for the user's job to be claimed or publish."""
+        known = self._channel(user_id, job_id).known
+        try:
+            await asyncio.wait_for(known.wait(), timeout=timeout)
+        except asyncio.TimeoutError:
+            return False
+        return True
+
+    def is_running(self, user_id: Any, job_id: Any) -> bool:
+        """Whether the user has a job with this id that has not completed or failed yet."""
+        channel = self._channels.get((str(user_id), str(job_id)))
+        return bool(
+            channel and channel.events and channel.events[-1].event not in TERMINAL_EVENTS
+        )
+
+    def publish(self, user_id: Any, job_id: Any, event: str, data: Optional[dict] = None) -> None:
+        """Record an event of a job and hand it to every subscriber without waiting."""
+        if job_id is None:
+            return
+        channel = self._channel(user_id, job_id)
+        job_event = JobEvent(id=channel.next_id, event=event, data=data or {})
+        channel.next_id += 1
+        channel.events.append(job_event)
+        channel.updated_at = time.monotonic()
+        channel.known.set()
+        for queue in channel.subscribers:
+            if queue.full():
+                # A slow consumer loses its oldest progress update, never the latest.
+                queue.get_nowait()
+            queue.put_nowait(job_event)
+
+    async def subscribe(
+        self,
+        user_id: Any,
+        job_id: Any,
+        last_event_id: Optional[int] = None,
+        heartbeat: Optional[float] = None,
+    ) -> AsyncIterator[Optional[JobEvent]]:
+        """
+        Yield the events of a job, starting after ``last_event_id``, until it completes
+        or fails. With ``heartbeat`` set, None is yielded after that many idle seconds.
+        """
+        channel = self._channel(user_id, job_id)
+        queue: asyncio.Queue = asyncio.Queue(maxsize=SUBSCRIBER_QUEUE_SIZE)
+        backlog = [event for event in channel.events
+                   if last_event_id is None or event.id > last_event_id]
+        channel.subscribers.add(queue)
+        try:
+            for job_event in backlog:
+                yield job_event
+                if job_event.event in TERMINAL_EVENTS:
+                    return
+            last_id = backlog[-1].id if backlog else (last_event_id or 0)
+            while True:
+                try:
+                    job_event = await asyncio.wait_for(queue.get(), timeout=heartbeat)
+                except asyncio.TimeoutError:
+                    yield None
+                    continue
+                if job_event.id <= last_id:
+                    continue
+                last_id = job_event.id
+                yield job_event
+                if job_event.event in TERMINAL_EVENTS:
+                    return
+        finally:
+            channel.subscribers.discard(queue)
+            channel.updated_at = time.monotonic()
+
+
+job_event_bus = JobEventBus()
+
+
+def publish_job_event(user_id: Any, job_id: Any, event: str, data: Optional[dict] = None) -> None:
+    job_event_bus.publish(user_id, job_id, event, data)
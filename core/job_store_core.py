@@ -0,0 +1,67 @@
+import json
+from typing import Any, Optional
+
+import redis
+from redis.exceptions import RedisError
+
+from core.config_core import Config
+from core.logging_core import setup_logger
+
+logger = setup_logger(__name__)
+config_instance = Config()
+
+REDIS_HOST = config_instance.get("Redis", "host", default="localhost")
+REDIS_PORT = config_instance.getint("Redis", "port", default=6379)
+REDIS_DB = config_instance.getint("JobStore", "redis_db", default=0)
+REDIS_TIMEOUT_MS = config_instance.getint("JobStore", "redis_timeout_ms", default=1000)
+RETENTION_SECONDS = config_instance.getint("JobStore", "retention_seconds", default=3600)
+KEY_PREFIX = "job"
+
+
+class JobStore:
+    """
+    Progress reports of background jobs, kept in Redis as JSON so every API worker
+    (and the process that runs the job) sees the same state, and so it survives
+    restarts. Reports expire ``retention_seconds`` after their last update.
+
+    The client is synchronous: the jobs update their report from worker threads.
+    """
+
+    def __init__(
+        self,
+        kind: str,
+        retention_seconds: int = RETENTION_SECONDS,
+        client: Optional[redis.Redis] = None,
+    ):
+        self.kind = kind
+        self.retention_seconds = retention_seconds
+        self.client = client or redis.Redis(
+            host=REDIS_HOST,
+            port=REDIS_PORT,
+            db=REDIS_DB,
+            socket_timeout=REDIS_TIMEOUT_MS / 1000,
+            socket_connect_timeout=REDIS_TIMEOUT_MS / 1000,
+        )
+
+    def _key(self, job_id: str) -> str:
+        return f"{KEY_PREFIX}:{self.kind}:{job_id}"
+
+    def save(self, job: dict[str, Any]) -> None:
+        """Store the report of a job, restarting its retention period."""
+        try:
+            self.client.set(
+                self._key(job["job_id"]),
+                json.dumps(job, default=str),
+                ex=self.retention_seconds,
+            )
+        except RedisError as e:
+            logger.warning(f"Could not store {self.kind} job {job['job_id']}: {e}")
+
+    def get(self, job_id: str) -> Optional[dict[str, Any]]:
+        """The report of a job, or None when it is unknown or expired."""
+        try:
+            data = self.client.get(self._key(job_id))
+        except RedisError as e:
+            logger.warning(f"Could not read {self.kind} job {job_id}: {e}")
+            return None
+        return json.loads(data) if data else None
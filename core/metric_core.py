@@ -1,17 +1,256 @@
+import atexit
+import os
 import platform
 import socket
+import tempfile
+import threading
 import time
+from collections import deque
+from typing import Any, Optional
 
 from dotenv import load_dotenv
 from influxdb_client import InfluxDBClient, Point, WritePrecision
 from influxdb_client.client.write_api import SYNCHRONOUS
+from influxdb_client.rest import ApiException
 
+from core.config_core import Config
 from core.env_core import Envs, get_env_variable
 from core.logging_core import setup_logger
+from core.prometheus_core import NAMESPACE, mirror_metric, registry
+from utils.process_util import is_process_alive
 
 load_dotenv()
 
 logger = setup_logger(__name__)
+config_instance = Config()
+
+BUFFER_SIZE = config_instance.getint("InfluxDB", "buffer_size", default=10000)
+BATCH_SIZE = config_instance.getint("InfluxDB", "batch_size", default=500)
+FLUSH_SECONDS = config_instance.getint("InfluxDB", "flush_seconds", default=5)
+TIMEOUT_MS = config_instance.getint("InfluxDB", "timeout_ms", default=5000)
+SPOOL_DIR = (
+    config_instance.get("InfluxDB", "spool_dir", default="")
+    or os.path.join(tempfile.gettempdir(), "o-art-influx-spool")
+)
+SPOOL_MAX_BYTES = config_instance.getint("InfluxDB", "spool_max_mb", default=50) * 1024 * 1024
+DROPPED_METRIC = f"{NAMESPACE}_influxdb_dropped_points_total"
+
+# measurement, tags (host and os included), fields, timestamp in ns
+PointRecord = tuple[str, dict[str, str], dict[str, Any], int]
+
+
+def _line_protocol(record: PointRecord) -> str:
+    measurement, tags, fields, timestamp = record
+    point = Point(measurement)
+    for tag_key, tag_value in tags.items():
+        point = point.tag(tag_key, tag_value)
+    for field_key, field_value in fields.items():
+        point = point.field(field_key, field_value)
+    return point.time(timestamp, WritePrecision.NS).to_line_protocol()
+
+
+def _is_rejected(error: Exception) -> bool:
+    """Whether InfluxDB refused the batch itself (4xx), so retrying it cannot succeed."""
+    return (
+        isinstance(error, ApiException)
+        and error.status is not None
+        and 400 <= error.status < 500
+        and error.status not in (408, 429)
+    )
+
+
+class InfluxDBBuffer:
+    """
+    Bounded ring buffer of points, written in batches by a background thread over
+    one persistent client.
+
+    When the buffer is full the oldest point is dropped. Batches that cannot be
+    written are appended (as line protocol) to a spool file, replayed once InfluxDB
+    accepts writes again; spool files left by processes that exited are replayed
+    too. Points beyond ``spool_max_bytes`` are dropped. Drops are counted on the
+    ``/metrics`` endpoint.
+    """
+
+    def __init__(
+        self,
+        url: str,
+        token: str,
+        org: str,
+        bucket: str,
+        buffer_size: int = BUFFER_SIZE,
+        batch_size: int = BATCH_SIZE,
+        flush_seconds: float = FLUSH_SECONDS,
+        spool_dir: Optional[str] = SPOOL_DIR,
+        spool_max_bytes: int = SPOOL_MAX_BYTES,
+        client: Optional[InfluxDBClient] = None,
+    ):
+        self.url = url
+        self.token = token
+        self.org = org
+        self.bucket = bucket
+        self.batch_size = batch_size
+        self.flush_seconds = flush_seconds
+        self.spool_dir = spool_dir
+        self.spool_max_bytes = spool_max_bytes
+        self.dropped = 0
+        self._records: deque[PointRecord] = deque(maxlen=buffer_size)
+        self._wake = threading.Event()
+        self._write_lock = threading.Lock()
+        self._client = client
+        self._write_api = None
+        self._thread = threading.Thread(target=self._run, name="influxdb-writer", daemon=True)
+        self._thread.start()
+
+    def put(self, record: PointRecord) -> None:
+        if len(self._records) == self._records.maxlen:
+            self._count_dropped(1)
+        self._records.append(record)
+        if len(self._records) >= self.batch_size:
+            self._wake.set()
+
+    def _count_dropped(self, count: int) -> None:
+        self.dropped += count
+        registry.inc(DROPPED_METRIC, count,
+                     help_text="Metric points dropped before reaching InfluxDB.")
+
+    def _run(self) -> None:
+        while True:
+            self._wake.wait(self.flush_seconds)
+            self._wake.clear()
+            try:
+                self.flush()
+            except Exception as e:
+                logger.error("InfluxDB writer failed to flush: %s", e)
+
+    def _write(self, lines: list[str]) -> None:
+        if self._write_api is None:
+            if self._client is None:
+                self._client = InfluxDBClient(
+                    url=self.url, token=self.token, org=self.org, timeout=TIMEOUT_MS
+                )
+            self._write_api = self._client.write_api(write_options=SYNCHRONOUS)
+        self._write_api.write(
+            bucket=self.bucket, record=lines, write_precision=WritePrecision.NS
+        )
+
+    def flush(self) -> None:
+        """Write every queued point, spooling the batches InfluxDB does not accept."""
+        with self._write_lock:
+            written = True
+            while self._records:
+                batch = []
+                while self._records and len(batch) < self.batch_size:
+                    batch.append(self._records.popleft())
+                lines = [_line_protocol(record) for record in batch]
+                if written:
+                    try:
+                        self._write(lines)
+                        continue
+                    except Exception as e:
+                        if _is_rejected(e):
+                            self._reject(lines, e)
+                            continue
+                        logger.warning("InfluxDB write failed, spooling %d points: %s",
+                                       len(lines), e)
+                        written = False
+                self._spool(lines)
+            if written:
+                self._replay_spool()
+
+    def _reject(self, lines: list[str], error: Exception) -> None:
+        logger.error("InfluxDB rejected %d points, dropping them: %s", len(lines), error)
+        self._count_dropped(len(lines))
+
+    def _spool_path(self, pid: int) -> str:
+        return os.path.join(self.spool_dir, f"{pid}.lp")
+
+    def _spool(self, lines: list[str]) -> None:
+        if not self.spool_dir:
+            self._count_dropped(len(lines))
+            return
+        try:
+            os.makedirs(self.spool_dir, exist_ok=True)
+            path = self._spool_path(os.getpid())
+            size = os.path.getsize(path) if os.path.exists(path) else 0
+            data = "".join(f"{line}\n" for line in lines)
+            if size + len(data) > self.spool_max_bytes:
+                self._count_dropped(len(lines))
+                return
+            with open(path, "a", encoding="utf-8") as file:
+                file.write(data)
+        except OSError as e:
+            logger.error("Could not spool %d InfluxDB points: %s", len(lines), e)
+            self._count_dropped(len(lines))
+
+    def _replay_spool(self) -> None:
+        if not self.spool_dir or not os.path.isdir(self.spool_dir):
+            return
+        for entry in os.scandir(self.spool_dir):
+            pid, _, extension = entry.name.partition(".")
+            if extension != "lp" or not pid.isdigit():
+                continue
+            if int(pid) != os.getpid() and is_process_alive(int(pid)):
+                continue
+            if not self._replay_file(entry.path):
+                return
+
+    def _replay_file(self, path: str) -> bool:
+        """Replay a spool file; returns False if InfluxDB is unavailable again."""
+        try:
+            with open(path, encoding="utf-8") as file:
+                lines = [line for line in file.read().splitlines() if line]
+        except OSError as e:
+            logger.error("Could not read the InfluxDB spool %s: %s", path, e)
+            return True
+        for start in range(0, len(lines), self.batch_size):
+            batch = lines[start:start + self.batch_size]
+            try:
+                self._write(batch)
+            except Exception as e:
+                if _is_rejected(e):
+                    self._reject(batch, e)
+                    continue
+                logger.warning("InfluxDB spool replay interrupted: %s", e)
+                with open(path, "w", encoding="utf-8") as file:
+                    file.write("".join(f"{line}\n" for line in lines[start:]))
+                return False
+        os.remove(path)
+        logger.info("Replayed %d spooled InfluxDB points from %s.", len(lines), path)
+        return True
+
+    def close(self) -> None:
+        try:
+            self.flush()
+        finally:
+            if self._client is not None:
+                self._client.close()
+
+
+_buffers: dict[tuple, InfluxDBBuffer] = {}
+_buffers_lock = threading.Lock()
+
+
+def get_buffer(url: str, token: str, org: str, bucket: str) -> InfluxDBBuffer:
+    """The buffer of a destination in this process (a forked child gets its own)."""
+    key = (os.getpid(), url, org, bucket)
+    buffer = _buffers.get(key)
+    if buffer is None:
+        with _buffers_lock:
+            buffer = _buffers.get(key)
+            if buffer is None:
+                buffer = _buffers[key] = InfluxDBBuffer(url, token, org, bucket)
+    return buffer
+
+
+@atexit.register
+def _flush_buffers() -> None:
+    for (pid, *_), buffer in list(_buffers.items()):
+        if pid != os.getpid():
+            continue
+        try:
+            buffer.close()
+        except Exception as e:
+            logger.error("Could not flush InfluxDB points at exit: %s", e)
 
 
 class InfluxDBWriter:
@@ -45,68 +284,40 @@ class InfluxDBWriter:
             self.enabled = False
 
     def write_data(self, measurement: str, tags: dict, fields: dict):
-        if not self.enabled:
-            logger.debug("InfluxDB is disabled, skipping metric writing.")
-            return
         """
-        Write data to InfluxDB.
+        Queue a point for InfluxDB. The point is written by a background thread in
+        the next batch, so this never waits on the network.
         Args:
             measurement (str): The measurement name in InfluxDB.
             tags (dict): A dictionary of tags to add to the point.
             fields (dict): A dictionary of fields to add to the point.
         """
-        try:
-            with InfluxDBClient(url=self.url, token=self.token, org=self.org) as client:
-                # Consider making write options configurable if needed
-                write_api = client.write_api(write_options=SYNCHRONOUS)
-
-                point = Point(measurement).tag("host", self.host_name).tag("os", self.os_name)
-
-                # Add tags dynamically
-                for tag_key, tag_value in tags.items():
-                    point = point.tag(tag_key, str(tag_value))  # Ensure tag value is a string
-
-                # Add fields dynamically and validate types
-                for field_key, field_value in fields.items():
-                    if isinstance(field_value, (str, int, float, bool)):
-                        point = point.field(field_key, field_value)
-                    else:
-                        # Log a warning instead of raising an immediate error,
-                        # allows processing other fields if desired.
-                        # If strict type checking is required, raise ValueError here.
-                        logger.warning(
-                            f"Unsupported field type for key '{field_key}': {type(field_value)}. "
-                            f"Skipping field."
-                        )
-                        # Or raise ValueError:
-                        # raise ValueError(f"Field type for '{field_key}' is not supported:
-                        # {type(field_value)}")
-
-                # Set timestamp with nanosecond precision
-                point = point.time(time.time_ns(), WritePrecision.NS)
-
-                # Write the point to InfluxDB
-                write_api.write(bucket=self.bucket, record=point)
-                logger.debug(
-                    f"Successfully wrote point to measurement '{measurement}' "
-                    f"in bucket '{self.bucket}'."
+        if not self.enabled:
+            logger.debug("InfluxDB is disabled, skipping metric writing.")
+            return
+        valid_fields = {}
+        for field_key, field_value in fields.items():
+            if isinstance(field_value, (str, int, float, bool)):
+                valid_fields[field_key] = field_value
+            else:
+                logger.warning(
+                    f"Unsupported field type for key '{field_key}': {type(field_value)}. "
+                    f"Skipping field."
                 )
-
-        except ValueError as ve:  # Catch specific ValueError from field type check if raised
-            logger.error(f"Data validation error while preparing point for InfluxDB: {ve}")
-            # Decide if you want to re-raise or just log
-            # raise ve
-        except Exception as e:
-            # Log any other exceptions during InfluxDB interaction
-            logger.exception(f"Error writing data to InfluxDB measurement '{measurement}': {e}")
-            # Consider re-raising the exception if the calling code needs to handle it
-            # raise e
+        if not valid_fields:
+            return
+        point_tags = {"host": self.host_name, "os": self.os_name}
+        point_tags.update((key, str(value)) for key, value in tags.items())
+        get_buffer(self.url, self.token, self.org, self.bucket).put(
+            (measurement, point_tags, valid_fields, time.time_ns())
+        )
 
     def write_metric(
         self,
         measurement: str,
         tags: dict,
         fields: dict,
+        mirror: bool = True,
     ):
         """
         Write a metric to InfluxDB.
@@ -114,5 +325,8 @@ class InfluxDBWriter:
             measurement (str): The measurement name in InfluxDB.
             tags (dict): A dictionary of tags to add to the point.
             fields (dict): A dictionary of fields to add to the point.
+            mirror (bool): Also expose the fields as gauges on the Prometheus endpoint.
         """
+        if mirror:
+            mirror_metric(measurement, tags, fields)
         self.write_data(measurement, tags, fields)
\ No newline at end of file
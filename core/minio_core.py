@@ -1,9 +1,15 @@
-from typing import BinaryIO
+import os
+from collections.abc import Iterator
+from datetime import datetime
+from email.utils import parsedate_to_datetime
+from typing import BinaryIO, Optional
 
 from dotenv import load_dotenv
 from minio import Minio
+from minio.deleteobjects import DeleteError, DeleteObject
 from minio.error import S3Error
 
+from core.disk_cache_core import create_disk_cache, iter_cached_file
 from core.env_core import Envs, get_env_variable
 from core.logging_core import setup_logger
 
@@ -24,6 +30,7 @@ def create_minio_client():
 
 minio_client = create_minio_client()
 default_bucket_name = get_env_variable(Envs.MINIO_BUCKET_NAME, "default")
+disk_cache = create_disk_cache()
 
 def create_bucket_if_missing(bucket_name: str):
     """
@@ -101,11 +108,20 @@ def upload_bytes_to_bucket(
         data.seek(0, 2)
         size = data.tell()
         data.seek(pos)
-        minio_client.put_object(bucket_name, object_name, data, size)
+        result = minio_client.put_object(bucket_name, object_name, data, size)
         logger.info(f"Bytes uploaded to bucket {bucket_name} as {object_name}.")
     except S3Error as e:
         logger.error("Error uploading bytes: %", e)
         raise e
+    if disk_cache is not None:
+        data.seek(pos)
+        disk_cache.put(
+            bucket_name,
+            object_name,
+            data.read(size),
+            etag=result.etag,
+            last_modified=result.last_modified,
+        )
 
 
 def download_file_from_bucket(bucket_name: str, object_name: str, file_path: str):
@@ -124,6 +140,191 @@ def download_file_from_bucket(bucket_name: str, object_name: str, file_path: str
         raise e
 
 
+def _response_metadata(response) -> dict:
+    last_modified: Optional[datetime] = None
+    if response.headers.get("last-modified"):
+        try:
+            last_modified = parsedate_to_datetime(response.headers["last-modified"])
+        except (TypeError, ValueError):
+            last_modified = None
+    return {
+        "etag": response.headers.get("etag", "").strip('"') or None,
+        "last_modified": last_modified,
+        "content_type": response.headers.get("content-type"),
+    }
+
+
+def split_object_url(url: str) -> tuple[str, str]:
+    """
+    Split a stored object URL (``bucket/object_name``) into its bucket and object name.
+
+    Args:
+        url (str): URL as persisted on the image records.
+
+    Returns:
+        tuple[str, str]: The bucket name and the object name.
+    """
+    bucket_name, _, object_name = url.partition("/")
+    if not bucket_name or not object_name:
+        raise ValueError(f"Invalid object URL: {url}.")
+    return bucket_name, object_name
+
+
+def stat_object_in_bucket(bucket_name: str, object_name: str):
+    """
+    Retrieve the metadata (size, ETag, last modification) of an object in MinIO.
+
+    Args:
+        bucket_name (str): Name of the bucket.
+        object_name (str): Object name in MinIO.
+
+    Returns:
+        minio.datatypes.Object | CachedObject: The object metadata, from the disk cache
+        when the object is cached locally.
+    """
+    if disk_cache is not None:
+        cached = disk_cache.get(bucket_name, object_name)
+        if cached is not None:
+            return cached
+    try:
+        return minio_client.stat_object(bucket_name, object_name)
+    except S3Error as e:
+        logger.error("Error retrieving object metadata: %s", e)
+        raise e
+
+
+def stream_object_from_bucket(
+        bucket_name: str,
+        object_name: str,
+        offset: int = 0,
+        length: int = 0,
+        chunk_size: int = 64 * 1024,
+) -> Iterator[bytes]:
+    """
+    Stream an object (or a byte range of it) from MinIO in chunks.
+
+    The HTTP connection is released back to the pool once the generator is
+    exhausted or closed, so callers never hold the whole object in memory.
+    Objects present in the disk cache are served from local disk instead, and full
+    reads of uncached objects are written to the cache while streaming. The lookup is
+    not counted in the cache hit rate: callers stat the object first, and that lookup
+    is the one counted.
+
+    Args:
+        bucket_name (str): Name of the bucket.
+        object_name (str): Object name in MinIO.
+        offset (int): Start byte of the range to read.
+        length (int): Number of bytes to read. ``0`` reads until the end of the object.
+        chunk_size (int): Size of each yielded chunk in bytes.
+    """
+    if disk_cache is not None:
+        cached = disk_cache.get(bucket_name, object_name, record=False)
+        if cached is not None:
+            yield from iter_cached_file(cached.path, offset, length, chunk_size)
+            return
+    try:
+        response = minio_client.get_object(bucket_name, object_name, offset=offset, length=length)
+    except S3Error as e:
+        logger.error("Error streaming object: %s", e)
+        raise e
+    cache_path = None
+    if disk_cache is not None and offset == 0 and length == 0:
+        cache_path = disk_cache.create_temp_file()
+    try:
+        if cache_path is None:
+            yield from response.stream(chunk_size)
+        else:
+            with open(cache_path, "wb") as cache_file:
+                for chunk in response.stream(chunk_size):
+                    cache_file.write(chunk)
+                    yield chunk
+            disk_cache.put_file(
+                bucket_name, object_name, cache_path, **_response_metadata(response)
+            )
+            cache_path = None
+    finally:
+        response.close()
+        response.release_conn()
+        if cache_path is not None and os.path.exists(cache_path):
+            os.remove(cache_path)
+
+
+def get_object_bytes_from_bucket(bucket_name: str, object_name: str) -> bytes:
+    """
+    Read a whole object from MinIO into memory.
+
+    Args:
+        bucket_name (str): Name of the bucket.
+        object_name (str): Object name in MinIO.
+
+    Returns:
+        bytes: The object content.
+    """
+    if disk_cache is not None:
+        cached = disk_cache.get(bucket_name, object_name)
+        if cached is not None:
+            with open(cached.path, "rb") as f:
+                return f.read()
+    try:
+        response = minio_client.get_object(bucket_name, object_name)
+    except S3Error as e:
+        logger.error("Error reading object: %s", e)
+        raise e
+    try:
+        data = response.read()
+    finally:
+        response.close()
+        response.release_conn()
+    if disk_cache is not None:
+        disk_cache.put(bucket_name, object_name, data, **_response_metadata(response))
+    return data
+
+
+def remove_objects_from_bucket(bucket_name: str, object_names: list[str]) -> list[DeleteError]:
+    """
+    Remove many objects from a bucket using MinIO's batched multi-object delete.
+
+    Args:
+        bucket_name (str): Name of the bucket.
+        object_names (list[str]): Object names to remove.
+
+    Returns:
+        list[DeleteError]: The objects that could not be removed.
+    """
+    if disk_cache is not None:
+        for object_name in object_names:
+            disk_cache.invalidate(bucket_name, object_name)
+    try:
+        errors = list(
+            minio_client.remove_objects(
+                bucket_name, (DeleteObject(object_name) for object_name in object_names)
+            )
+        )
+    except S3Error as e:
+        logger.error("Error removing objects: %s", e)
+        raise e
+    for error in errors:
+        logger.warning("Failed to remove object %s: %s", error.name, error.message)
+    logger.info(
+        "Removed %d object(s) from bucket %s.", len(object_names) - len(errors), bucket_name
+    )
+    return errors
+
+
+def iter_objects_in_bucket(bucket_name: str, prefix: Optional[str] = None) -> Iterator:
+    """
+    Lazily list every object of a bucket, recursively and in lexicographic key order.
+
+    Args:
+        bucket_name (str): Name of the bucket.
+        prefix (Optional[str]): Only list objects whose name starts with this prefix.
+
+    Returns:
+        Iterator: MinIO ``Object`` entries, fetched page by page.
+    """
+    return minio_client.list_objects(bucket_name, prefix=prefix, recursive=True)
+
+
 def binary_size_check(file: BinaryIO, max_size: int) -> bool:
     """
     Check if the size of a binary file exceeds a specified maximum size.
@@ -0,0 +1,277 @@
+import atexit
+import bisect
+import contextlib
+import json
+import math
+import os
+import re
+import tempfile
+import threading
+import time
+from collections.abc import Iterable, Sequence
+from typing import Any, Optional
+
+from core.config_core import Config
+from core.logging_core import setup_logger
+from utils.process_util import is_process_alive
+
+logger = setup_logger(__name__)
+config_instance = Config()
+
+PROMETHEUS_ENABLED = config_instance.getboolean("Prometheus", "enabled", default=True)
+NAMESPACE = config_instance.get("Prometheus", "namespace", default="oart")
+MULTIPROCESS_DIR = (
+    config_instance.get("Prometheus", "multiprocess_dir", default="")
+    or os.path.join(tempfile.gettempdir(), "o-art-metrics")
+)
+MULTIPROCESS_FLUSH_SECONDS = config_instance.getint("Prometheus", "flush_seconds", default=5)
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+_INVALID_NAME_CHARS = re.compile(r"[^a-zA-Z0-9_:]")
+
+Labels = tuple[tuple[str, str], ...]
+
+
+def metric_name(*parts: str) -> str:
+    """Join and sanitize name parts into a valid Prometheus metric name."""
+    return _INVALID_NAME_CHARS.sub("_", "_".join(part for part in parts if part))
+
+
+def _labels(labels: Optional[dict[str, Any]]) -> Labels:
+    if not labels:
+        return ()
+    return tuple(sorted((metric_name(str(key)), str(value)) for key, value in labels.items()))
+
+
+class MetricFamily:
+    def __init__(self, name: str, kind: str, help_text: str, buckets: Sequence[float] = ()):
+        self.name = name
+        self.kind = kind
+        self.help = help_text
+        self.buckets = tuple(buckets)
+        # counter: value; gauge: [value, updated_at]; histogram: [bucket counts, sum, count]
+        self.samples: dict[Labels, Any] = {}
+
+
+class MetricsRegistry:
+    """
+    Counters, gauges and histograms of this process.
+
+    With a ``multiprocess_dir``, the registry is also written to
+    ``<dir>/<pid>.json`` every few seconds, so the ``/metrics`` endpoint of any
+    process can expose the API workers and Celery processes as one: counters and
+    histograms are summed, and gauges take the most recent value of a live process.
+    """
+
+    def __init__(self, multiprocess_dir: Optional[str] = None,
+                 flush_seconds: float = MULTIPROCESS_FLUSH_SECONDS):
+        self.multiprocess_dir = multiprocess_dir
+        self.flush_seconds = flush_seconds
+        self._families: dict[str, MetricFamily] = {}
+        self._lock = threading.Lock()
+        self._pid = os.getpid()
+        self._flusher: Optional[threading.Thread] = None
+
+    def _family(self, name: str, kind: str, help_text: str, buckets=()) -> MetricFamily:
+        if os.getpid() != self._pid:
+            # A forked child starts empty, or the parent's samples would be counted twice.
+            self._pid = os.getpid()
+            self._families = {}
+            self._flusher = None
+        family = self._families.get(name)
+        if family is None:
+            family = self._families[name] = MetricFamily(name, kind, help_text, buckets)
+        elif family.kind != kind:
+            raise ValueError(f"Metric {name} is already registered as a {family.kind}")
+        if self.multiprocess_dir and self._flusher is None:
+            self._start_flusher()
+        return family
+
+    def inc(self, name: str, amount: float = 1.0, labels: Optional[dict] = None,
+            help_text: str = "") -> None:
+        key = _labels(labels)
+        with self._lock:
+            family = self._family(name, "counter", help_text)
+            family.samples[key] = family.samples.get(key, 0.0) + amount
+
+    def set(self, name: str, value: float, labels: Optional[dict] = None,
+            help_text: str = "") -> None:
+        key = _labels(labels)
+        with self._lock:
+            self._family(name, "gauge", help_text).samples[key] = [value, time.time()]
+
+    def observe(self, name: str, value: float, buckets: Sequence[float],
+                labels: Optional[dict] = None, help_text: str = "") -> None:
+        counts = [0] * (len(buckets) + 1)
+        counts[bisect.bisect_left(buckets, value)] = 1
+        self.observe_many(name, counts, value, 1, buckets, labels, help_text)
+
+    def observe_many(self, name: str, bucket_counts: Sequence[int], total: float, count: int,
+                     buckets: Sequence[float], labels: Optional[dict] = None,
+                     help_text: str = "") -> None:
+        """Add pre-aggregated observations (non-cumulative counts per bucket, +Inf last)."""
+        key = _labels(labels)
+        with self._lock:
+            family = self._family(name, "histogram", help_text, buckets)
+            sample = family.samples.get(key)
+            if sample is None:
+                sample = family.samples[key] = [[0] * (len(family.buckets) + 1), 0.0, 0]
+            for index, bucket_count in enumerate(bucket_counts):
+                sample[0][index] += bucket_count
+            sample[1] += total
+            sample[2] += count
+
+    def snapshot(self) -> dict[str, Any]:
+        with self._lock:
+            return {
+                name: {
+                    "kind": family.kind,
+                    "help": family.help,
+                    "buckets": list(family.buckets),
+                    "samples": [[list(map(list, key)), value]
+                                for key, value in family.samples.items()],
+                }
+                for name, family in self._families.items()
+            }
+
+    def _path(self, pid: int) -> str:
+        return os.path.join(self.multiprocess_dir, f"{pid}.json")
+
+    def flush(self) -> None:
+        """Write the snapshot of this process for the other processes to merge."""
+        if not self.multiprocess_dir:
+            return
+        os.makedirs(self.multiprocess_dir, exist_ok=True)
+        path = self._path(os.getpid())
+        with open(f"{path}.tmp", "w", encoding="utf-8") as file:
+            json.dump(self.snapshot(), file)
+        os.replace(f"{path}.tmp", path)
+
+    def _start_flusher(self) -> None:
+        def run() -> None:
+            while True:
+                time.sleep(self.flush_seconds)
+                try:
+                    self.flush()
+                except OSError as e:
+                    logger.warning("Could not write the metrics of process %s: %s",
+                                   os.getpid(), e)
+
+        self._flusher = threading.Thread(target=run, name="metrics-flusher", daemon=True)
+        self._flusher.start()
+
+    def _other_snapshots(self) -> Iterable[tuple[dict[str, Any], bool]]:
+        if not self.multiprocess_dir or not os.path.isdir(self.multiprocess_dir):
+            return
+        for entry in os.scandir(self.multiprocess_dir):
+            pid, _, extension = entry.name.partition(".")
+            if extension != "json" or not pid.isdigit() or int(pid) == os.getpid():
+                continue
+            try:
+                with open(entry.path, encoding="utf-8") as file:
+                    yield json.load(file), is_process_alive(int(pid))
+            except (OSError, ValueError) as e:
+                logger.debug("Skipping metrics file %s: %s", entry.path, e)
+
+    def render(self) -> str:
+        """Render the metrics of every process in the Prometheus text format."""
+        merged = _merge([(self.snapshot(), True), *self._other_snapshots()])
+        return _render(merged)
+
+    def clear_multiprocess_dir(self) -> None:
+        """Remove the files of previous runs; call once before the processes start."""
+        if not self.multiprocess_dir or not os.path.isdir(self.multiprocess_dir):
+            return
+        for entry in os.scandir(self.multiprocess_dir):
+            with contextlib.suppress(OSError):
+                os.remove(entry.path)
+
+
+def _merge(snapshots: Iterable[tuple[dict[str, Any], bool]]) -> dict[str, dict[str, Any]]:
+    merged: dict[str, dict[str, Any]] = {}
+    for snapshot, alive in snapshots:
+        for name, family in snapshot.items():
+            target = merged.setdefault(name, {**family, "samples": {}})
+            if target["kind"] != family["kind"]:
+                continue
+            for key, value in family["samples"]:
+                labels = tuple(tuple(pair) for pair in key)
+                current = target["samples"].get(labels)
+                if family["kind"] == "counter":
+                    target["samples"][labels] = (current or 0.0) + value
+                elif family["kind"] == "gauge":
+                    # Gauges of exited processes no longer describe anything.
+                    if alive and (current is None or value[1] >= current[1]):
+                        target["samples"][labels] = value
+                elif current is None or len(current[0]) != len(value[0]):
+                    target["samples"][labels] = [list(value[0]), value[1], value[2]]
+                else:
+                    current[0] = [a + b for a, b in zip(current[0], value[0])]
+                    current[1] += value[1]
+                    current[2] += value[2]
+    return merged
+
+
+def _format_labels(labels: Iterable[tuple[str, str]]) -> str:
+    pairs = [
+        '{}="{}"'.format(
+            key, value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+        )
+        for key, value in labels
+    ]
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(float(value))
+
+
+def _render(families: dict[str, dict[str, Any]]) -> str:
+    lines = []
+    for name in sorted(families):
+        family = families[name]
+        if not family["samples"]:
+            continue
+        lines.append(f"# HELP {name} {family['help'] or name}")
+        lines.append(f"# TYPE {name} {family['kind']}")
+        for labels, value in family["samples"].items():
+            if family["kind"] == "counter":
+                lines.append(f"{name}{_format_labels(labels)} {_format_value(value)}")
+            elif family["kind"] == "gauge":
+                lines.append(f"{name}{_format_labels(labels)} {_format_value(value[0])}")
+            else:
+                cumulative = 0
+                bounds = [_format_value(bound) for bound in family["buckets"]] + ["+Inf"]
+                for bound, bucket_count in zip(bounds, value[0]):
+                    cumulative += bucket_count
+                    bucket_labels = _format_labels((*labels, ("le", bound)))
+                    lines.append(f"{name}_bucket{bucket_labels} {cumulative}")
+                lines.append(f"{name}_sum{_format_labels(labels)} {_format_value(value[1])}")
+                lines.append(f"{name}_count{_format_labels(labels)} {value[2]}")
+    return "\n".join(lines) + "\n"
+
+
+registry = MetricsRegistry(MULTIPROCESS_DIR if PROMETHEUS_ENABLED else None)
+
+
+@atexit.register
+def _flush_at_exit() -> None:
+    with contextlib.suppress(OSError):
+        registry.flush()
+
+
+def mirror_metric(measurement: str, tags: dict, fields: dict) -> None:
+    """
+    Mirror a point written to InfluxDB as gauges named
+    ``<namespace>_<measurement>_<field>``, labelled with the point's tags.
+    """
+    if not PROMETHEUS_ENABLED:
+        return
+    for field_key, field_value in fields.items():
+        if isinstance(field_value, bool):
+            field_value = int(field_value)
+        if not isinstance(field_value, (int, float)):
+            continue
+        registry.set(metric_name(NAMESPACE, measurement, field_key), field_value, tags,
+                     help_text=f"Last {field_key} of {measurement}.")
@@ -0,0 +1,294 @@
+import ipaddress
+import json
+import math
+import time
+from collections import OrderedDict
+from collections.abc import Awaitable
+from typing import Callable, NamedTuple, Optional
+
+from redis import asyncio as redis_asyncio
+from redis.exceptions import RedisError
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from core.config_core import Config
+from core.logging_core import setup_logger
+from utils.rate_util import Rate, parse_rate
+
+logger = setup_logger(__name__)
+config_instance = Config()
+
+
+def _parse_pairs(value: str) -> dict[str, str]:
+    pairs = {}
+    for item in value.split(","):
+        name, _, setting = item.strip().partition(":")
+        if name and setting:
+            pairs[name.strip()] = setting.strip()
+    return pairs
+
+
+RATE_LIMIT_ENABLED = config_instance.getboolean("RateLimit", "enabled", default=True)
+REDIS_HOST = config_instance.get("Redis", "host", default="localhost")
+REDIS_PORT = config_instance.getint("Redis", "port", default=6379)
+REDIS_DB = config_instance.getint("RateLimit", "redis_db", default=0)
+REDIS_TIMEOUT_MS = config_instance.getint("RateLimit", "redis_timeout_ms", default=100)
+FALLBACK_SECONDS = config_instance.getint("RateLimit", "fallback_seconds", default=5)
+MEMORY_MAX_KEYS = config_instance.getint("RateLimit", "memory_max_keys", default=100000)
+KEY_PREFIX = "ratelimit"
+TRUSTED_PROXIES = tuple(
+    ipaddress.ip_network(proxy.strip(), strict=False)
+    for proxy in config_instance.get("RateLimit", "trusted_proxies", default="").split(",")
+    if proxy.strip()
+)
+ROUTE_CLASSES = _parse_pairs(config_instance.get(
+    "RateLimit", "routes", default="generate:/image/generate, websocket:/websocket, default:/"
+))
+DEFAULT_RATES = _parse_pairs(config_instance.get(
+    "RateLimit", "rates", default="generate:10/minute, websocket:30/minute, default:600/minute"
+))
+EXEMPT_PATHS = tuple(
+    path.strip()
+    for path in config_instance.get(
+        "RateLimit", "exempt_paths", default="/webhook, /docs, /redoc, /openapi.json, /metrics"
+    ).split(",")
+    if path.strip()
+)
+
+# GCRA: the key holds the theoretical arrival time (TAT) of the next request, in ms.
+# A request is allowed while the TAT stays within one period of now.
+GCRA_SCRIPT = """
+local now = tonumber(ARGV[1])
+local emission = tonumber(ARGV[2])
+local period = tonumber(ARGV[3])
+local tat = tonumber(redis.call('GET', KEYS[1]) or now)
+if tat < now then tat = now end
+local new_tat = tat + emission
+local allow_at = new_tat - period
+if allow_at > now then
+  return {0, 0, math.ceil(tat - now), math.ceil(allow_at - now)}
+end
+redis.call('SET', KEYS[1], string.format('%.3f', new_tat), 'PX', math.ceil(new_tat - now))
+return {1, math.floor((now + period - new_tat) / emission), math.ceil(new_tat - now), 0}
+"""
+
+
+class RateLimitDecision(NamedTuple):
+    allowed: bool
+    remaining: int
+    reset_ms: int
+    retry_after_ms: int
+
+
+class MemoryRateLimiter:
+    """GCRA over a bounded in-process table, used when Redis cannot be reached."""
+
+    def __init__(self, max_keys: int = MEMORY_MAX_KEYS):
+        self.max_keys = max_keys
+        self._tats: OrderedDict[str, float] = OrderedDict()
+
+    async def hit(self, key: str, rate: Rate) -> RateLimitDecision:
+        now = time.time() * 1000
+        period = rate.period * 1000
+        tat = max(self._tats.get(key, now), now)
+        new_tat = tat + rate.emission_ms
+        allow_at = new_tat - period
+        if allow_at > now:
+            return RateLimitDecision(False, 0, math.ceil(tat - now), math.ceil(allow_at - now))
+        self._tats[key] = new_tat
+        self._tats.move_to_end(key)
+        if len(self._tats) > self.max_keys:
+            self._tats.popitem(last=False)
+        remaining = math.floor((now + period - new_tat) / rate.emission_ms)
+        return RateLimitDecision(True, remaining, math.ceil(new_tat - now), 0)
+
+
+class RedisRateLimiter:
+    """
+    GCRA evaluated atomically by a Lua script, so every API process shares the same
+    budget. While Redis is unreachable, decisions fall back to an in-memory limiter
+    and Redis is retried after ``fallback_seconds``.
+    """
+
+    def __init__(
+        self,
+        client=None,
+        fallback: Optional[MemoryRateLimiter] = None,
+        fallback_seconds: float = FALLBACK_SECONDS,
+    ):
+        self.client = client or redis_asyncio.Redis(
+            host=REDIS_HOST,
+            port=REDIS_PORT,
+            db=REDIS_DB,
+            socket_timeout=REDIS_TIMEOUT_MS / 1000,
+            socket_connect_timeout=REDIS_TIMEOUT_MS / 1000,
+        )
+        self.fallback = fallback or MemoryRateLimiter()
+        self.fallback_seconds = fallback_seconds
+        self._script = self.client.register_script(GCRA_SCRIPT)
+        self._retry_at = 0.0
+
+    async def hit(self, key: str, rate: Rate) -> RateLimitDecision:
+        if time.monotonic() < self._retry_at:
+            return await self.fallback.hit(key, rate)
+        try:
+            allowed, remaining, reset_ms, retry_after_ms = await self._script(
+                keys=[f"{KEY_PREFIX}:{key}"],
+                args=[time.time() * 1000, rate.emission_ms, rate.period * 1000],
+            )
+        except (RedisError, OSError) as e:
+            logger.warning("Rate limiting falls back to memory for %ss: %s",
+                           self.fallback_seconds, e)
+            self._retry_at = time.monotonic() + self.fallback_seconds
+            return await self.fallback.hit(key, rate)
+        return RateLimitDecision(bool(allowed), int(remaining), int(reset_ms),
+                                 int(retry_after_ms))
+
+
+# Resolves an access token to the user id and the rate overrides of their plan.
+RateLimitResolver = Callable[[str], Awaitable[Optional[tuple[str, Optional[dict[str, str]]]]]]
+
+
+def route_class(path: str, route_classes: dict[str, str]) -> Optional[str]:
+    """Return the class of the longest configured prefix matching ``path``."""
+    matched, matched_prefix = None, ""
+    for name, prefix in route_classes.items():
+        if path.startswith(prefix) and len(prefix) > len(matched_prefix):
+            matched, matched_prefix = name, prefix
+    return matched
+
+
+def _access_token(scope: Scope) -> Optional[str]:
+    headers = Headers(scope=scope)
+    authorization = headers.get("authorization", "")
+    scheme, _, token = authorization.partition(" ")
+    if scheme.lower() == "bearer" and token:
+        return token.strip()
+    # WebSocket clients send the raw token in this header (see user_access_token).
+    return headers.get("access_token")
+
+
+def _is_trusted(address: str, trusted_proxies: tuple) -> bool:
+    try:
+        ip = ipaddress.ip_address(address)
+    except ValueError:
+        return False
+    return any(ip in network for network in trusted_proxies)
+
+
+def client_address(scope: Scope, trusted_proxies: tuple = TRUSTED_PROXIES) -> str:
+    """
+    The address of the client. When the peer is a trusted proxy, ``X-Forwarded-For``
+    is followed from the right, past trusted proxies, to the first address they did
+    not add themselves; hops written by the client cannot be trusted.
+    """
+    client = scope.get("client")
+    address = client[0] if client else "unknown"
+    if not _is_trusted(address, trusted_proxies):
+        return address
+    forwarded = Headers(scope=scope).get("x-forwarded-for", "")
+    for hop in reversed([hop.strip() for hop in forwarded.split(",") if hop.strip()]):
+        address = hop
+        if not _is_trusted(hop, trusted_proxies):
+            break
+    return address
+
+
+class RateLimitMiddleware:
+    """
+    Limit requests per user (or per client address when unauthenticated, see
+    ``client_address`` for requests relayed by ``trusted_proxies``) and route
+    class. Each class has a default rate that a user's plan can override. Responses
+    carry ``RateLimit-*`` headers; rejected HTTP requests get ``429`` with
+    ``Retry-After`` and rejected WebSocket handshakes are closed.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        resolver: Optional[RateLimitResolver] = None,
+        limiter=None,
+        route_classes: Optional[dict[str, str]] = None,
+        default_rates: Optional[dict[str, str]] = None,
+        exempt_paths: tuple[str, ...] = EXEMPT_PATHS,
+        trusted_proxies: tuple = TRUSTED_PROXIES,
+    ):
+        self.app = app
+        self.resolver = resolver
+        self.limiter = limiter or RedisRateLimiter()
+        self.route_classes = ROUTE_CLASSES if route_classes is None else route_classes
+        self.default_rates = DEFAULT_RATES if default_rates is None else default_rates
+        self.exempt_paths = exempt_paths
+        self.trusted_proxies = trusted_proxies
+
+    async def _subject(self, scope: Scope) -> tuple[str, Optional[dict[str, str]]]:
+        token = _access_token(scope)
+        if token and self.resolver is not None:
+            try:
+                resolved = await self.resolver(token)
+            except Exception as e:
+                logger.warning("Could not resolve the rate limits of a request: %s", e)
+                resolved = None
+            if resolved is not None:
+                user_id, plan_rates = resolved
+                return f"user:{user_id}", plan_rates
+        return f"ip:{client_address(scope, self.trusted_proxies)}", None
+
+    def _rate(self, name: str, plan_rates: Optional[dict[str, str]]) -> Optional[Rate]:
+        value = (plan_rates or {}).get(name) or self.default_rates.get(name)
+        if not value:
+            return None
+        try:
+            return parse_rate(value)
+        except ValueError:
+            logger.error("Ignoring invalid rate %r of route class %s.", value, name)
+            return None
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] not in ("http", "websocket") or scope.get("method") == "OPTIONS":
+            await self.app(scope, receive, send)
+            return
+        path = scope["path"]
+        name = route_class(path, self.route_classes)
+        if name is None or path.startswith(self.exempt_paths):
+            await self.app(scope, receive, send)
+            return
+        subject, plan_rates = await self._subject(scope)
+        rate = self._rate(name, plan_rates)
+        if rate is None:
+            await self.app(scope, receive, send)
+            return
+
+        decision = await self.limiter.hit(f"{name}:{subject}", rate)
+        headers = {
+            "RateLimit-Limit": str(rate.limit),
+            "RateLimit-Remaining": str(decision.remaining),
+            "RateLimit-Reset": str(math.ceil(decision.reset_ms / 1000)),
+            "RateLimit-Policy": rate.policy,
+        }
+        if not decision.allowed:
+            await self._reject(scope, send, headers, decision)
+            return
+
+        async def send_with_headers(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                response_headers = MutableHeaders(scope=message)
+                for header, value in headers.items():
+                    response_headers[header] = value
+            await send(message)
+
+        await self.app(scope, receive, send_with_headers)
+
+    async def _reject(
+        self, scope: Scope, send: Send, headers: dict[str, str], decision: RateLimitDecision
+    ) -> None:
+        if scope["type"] == "websocket":
+            await send({"type": "websocket.close", "code": 1008, "reason": "Rate limit exceeded"})
+            return
+        headers["Retry-After"] = str(max(math.ceil(decision.retry_after_ms / 1000), 1))
+        body = json.dumps({"detail": "Rate limit exceeded."}).encode()
+        raw_headers = [(b"content-type", b"application/json"),
+                       (b"content-length", str(len(body)).encode())]
+        raw_headers += [(key.lower().encode(), value.encode()) for key, value in headers.items()]
+        await send({"type": "http.response.start", "status": 429, "headers": raw_headers})
+        await send({"type": "http.response.body", "body": body})
@@ -0,0 +1,350 @@
+import atexit
+import contextlib
+import functools
+import hashlib
+import inspect
+import json
+import os
+import secrets
+import socket
+import tempfile
+import threading
+import time
+import uuid
+from collections import deque
+from collections.abc import Iterator
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any, Optional
+from urllib.request import Request
+
+from core.config_core import Config
+from core.logging_core import setup_logger
+from core.prometheus_core import NAMESPACE, registry
+from utils.security_util import safe_urlopen
+
+logger = setup_logger(__name__)
+config_instance = Config()
+
+TRACING_ENABLED = config_instance.getboolean("Tracing", "enabled", default=False)
+SAMPLE_RATE = float(config_instance.get("Tracing", "sample_rate", default="0.1"))
+EXPORTER = config_instance.get("Tracing", "exporter", default="file")
+FILE_PATH = (
+    config_instance.get("Tracing", "file_path", default="")
+    or os.path.join(tempfile.gettempdir(), "o-art-traces.jsonl")
+)
+MAX_FILE_BYTES = config_instance.getint(
+    "Tracing", "max_file_bytes", default=50 * 1024 * 1024
+)
+MAX_BACKUPS = config_instance.getint("Tracing", "max_backups", default=3)
+OTLP_ENDPOINT = config_instance.get(
+    "Tracing", "otlp_endpoint", default="http://localhost:4318/v1/traces"
+)
+SERVICE_NAME = config_instance.get("Tracing", "service_name", default="o-art")
+QUEUE_SIZE = config_instance.getint("Tracing", "queue_size", default=2048)
+BATCH_SIZE = config_instance.getint("Tracing", "batch_size", default=256)
+FLUSH_SECONDS = config_instance.getint("Tracing", "flush_seconds", default=5)
+TIMEOUT_MS = config_instance.getint("Tracing", "timeout_ms", default=5000)
+DROPPED_METRIC = f"{NAMESPACE}_tracing_dropped_spans_total"
+
+# OTLP status codes
+STATUS_OK = 1
+STATUS_ERROR = 2
+
+
+def trace_id_for_job(job_id: Any) -> str:
+    """
+    The trace id of a job: the job id itself when it is a UUID, otherwise a hash of
+    it. Every process tracing the same job therefore reports to the same trace.
+    """
+    try:
+        return uuid.UUID(str(job_id)).hex
+    except ValueError:
+        return hashlib.sha256(str(job_id).encode()).hexdigest()[:32]
+
+
+def is_sampled(trace_id: str, rate: float = SAMPLE_RATE) -> bool:
+    """Sample by the low 64 bits of the trace id, so the decision is the same everywhere."""
+    if rate >= 1:
+        return True
+    return int(trace_id[16:], 16) < rate * 2 ** 64
+
+
+@dataclass
+class Span:
+    name: str
+    trace_id: str
+    span_id: str
+    parent_id: Optional[str] = None
+    job_id: Optional[str] = None
+    recording: bool = True
+    start_ns: int = field(default_factory=time.time_ns)
+    end_ns: Optional[int] = None
+    attributes: dict[str, Any] = field(default_factory=dict)
+    events: list[tuple[str, int, dict[str, Any]]] = field(default_factory=list)
+    status: int = STATUS_OK
+    status_message: str = ""
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        if self.recording and value is not None:
+            self.attributes[key] = value
+
+    def add_event(self, name: str, **attributes: Any) -> None:
+        if self.recording:
+            self.events.append((name, time.time_ns(), attributes))
+
+    def record_exception(self, exception: BaseException) -> None:
+        self.status = STATUS_ERROR
+        self.status_message = str(exception)
+        self.add_event("exception", **{
+            "exception.type": type(exception).__name__,
+            "exception.message": str(exception),
+        })
+
+
+_current_span: ContextVar[Optional[Span]] = ContextVar("current_span", default=None)
+
+
+def current_span() -> Optional[Span]:
+    return _current_span.get()
+
+
+def _attribute_value(value: Any) -> dict[str, Any]:
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    return {"stringValue": str(value)}
+
+
+def _attributes(attributes: dict[str, Any]) -> list[dict[str, Any]]:
+    return [{"key": key, "value": _attribute_value(value)} for key, value in attributes.items()]
+
+
+def otlp_span(span: Span) -> dict[str, Any]:
+    """Encode a finished span in the OTLP/JSON format."""
+    encoded = {
+        "traceId": span.trace_id,
+        "spanId": span.span_id,
+        "name": span.name,
+        "kind": 1,
+        "startTimeUnixNano": str(span.start_ns),
+        "endTimeUnixNano": str(span.end_ns),
+        "attributes": _attributes(span.attributes),
+        "events": [
+            {"name": name, "timeUnixNano": str(timestamp), "attributes": _attributes(attributes)}
+            for name, timestamp, attributes in span.events
+        ],
+        "status": {"code": span.status, "message": span.status_message},
+    }
+    if span.parent_id:
+        encoded["parentSpanId"] = span.parent_id
+    return encoded
+
+
+def otlp_request(spans: list[Span]) -> dict[str, Any]:
+    """Wrap spans in an OTLP/JSON ``ExportTraceServiceRequest``."""
+    resource = {
+        "service.name": SERVICE_NAME,
+        "host.name": socket.gethostname(),
+        "process.pid": os.getpid(),
+    }
+    return {"resourceSpans": [{
+        "resource": {"attributes": _attributes(resource)},
+        "scopeSpans": [{
+            "scope": {"name": "o-art"},
+            "spans": [otlp_span(span) for span in spans],
+        }],
+    }]}
+
+
+class SpanExporter:
+    """
+    Bounded queue of finished spans, exported in batches by a background thread.
+
+    With the ``file`` exporter every batch is appended to ``file_path`` as one line
+    of OTLP/JSON (the format of the OpenTelemetry Collector file exporter), rotated to
+    ``file_path.1`` ... ``file_path.<max_backups>`` once it would exceed
+    ``max_file_bytes``; with ``otlp`` it is posted to an OTLP/HTTP endpoint. Spans
+    that cannot be queued or exported are dropped and counted on the ``/metrics``
+    endpoint.
+    """
+
+    def __init__(
+        self,
+        exporter: str = EXPORTER,
+        file_path: str = FILE_PATH,
+        endpoint: str = OTLP_ENDPOINT,
+        queue_size: int = QUEUE_SIZE,
+        batch_size: int = BATCH_SIZE,
+        flush_seconds: float = FLUSH_SECONDS,
+        max_file_bytes: int = MAX_FILE_BYTES,
+        max_backups: int = MAX_BACKUPS,
+    ):
+        self.exporter = exporter
+        self.file_path = file_path
+        self.endpoint = endpoint
+        self.batch_size = batch_size
+        self.flush_seconds = flush_seconds
+        self.max_file_bytes = max_file_bytes
+        self.max_backups = max_backups
+        self.dropped = 0
+        self._spans: deque[Span] = deque(maxlen=queue_size)
+        self._wake = threading.Event()
+        self._export_lock = threading.Lock()
+        self._pid = os.getpid()
+        self._thread: Optional[threading.Thread] = None
+
+    def export(self, span: Span) -> None:
+        if self._thread is None or self._pid != os.getpid():
+            # A forked child needs its own thread (the parent's does not survive the fork).
+            self._pid = os.getpid()
+            self._thread = threading.Thread(target=self._run, name="span-exporter", daemon=True)
+            self._thread.start()
+        if len(self._spans) == self._spans.maxlen:
+            self._count_dropped(1)
+        self._spans.append(span)
+        if len(self._spans) >= self.batch_size:
+            self._wake.set()
+
+    def _count_dropped(self, count: int) -> None:
+        self.dropped += count
+        registry.inc(DROPPED_METRIC, count, help_text="Finished spans dropped before export.")
+
+    def _run(self) -> None:
+        while True:
+            self._wake.wait(self.flush_seconds)
+            self._wake.clear()
+            self.flush()
+
+    def _rotate(self, incoming: int) -> None:
+        """Rotate the trace file if appending ``incoming`` bytes would exceed the limit."""
+        if self.max_file_bytes <= 0:
+            return
+        try:
+            size = os.path.getsize(self.file_path)
+        except OSError:
+            return
+        if size == 0 or size + incoming <= self.max_file_bytes:
+            return
+        if self.max_backups <= 0:
+            os.remove(self.file_path)
+            return
+        for index in range(self.max_backups - 1, 0, -1):
+            backup = f"{self.file_path}.{index}"
+            if os.path.exists(backup):
+                os.replace(backup, f"{self.file_path}.{index + 1}")
+        os.replace(self.file_path, f"{self.file_path}.1")
+
+    def _write(self, batch: list[Span]) -> None:
+        data = json.dumps(otlp_request(batch), separators=(",", ":"))
+        if self.exporter == "file":
+            directory = os.path.dirname(self.file_path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self._rotate(len(data) + 1)
+            with open(self.file_path, "a", encoding="utf-8") as file:
+                file.write(f"{data}\n")
+        elif self.exporter == "otlp":
+            request = Request(
+                self.endpoint,
+                data=data.encode(),
+                headers={"Content-Type": "application/json"},
+                method="POST",
+            )
+            with safe_urlopen(request, timeout=TIMEOUT_MS / 1000) as response:
+                response.read()
+        else:
+            raise ValueError(f"Unsupported span exporter: {self.exporter}")
+
+    def flush(self) -> None:
+        """Export every queued span."""
+        with self._export_lock:
+            while self._spans:
+                batch = []
+                while self._spans and len(batch) < self.batch_size:
+                    batch.append(self._spans.popleft())
+                try:
+                    self._write(batch)
+                except Exception as e:
+                    logger.warning("Could not export %d spans: %s", len(batch), e)
+                    self._count_dropped(len(batch))
+
+
+span_exporter = SpanExporter()
+
+
+@atexit.register
+def _flush_at_exit() -> None:
+    span_exporter.flush()
+
+
+@contextlib.contextmanager
+def start_span(name: str, job_id: Any = None, **attributes: Any) -> Iterator[Span]:
+    """
+    Time a stage as a span, child of the current span. Outside of a trace, a span
+    with a ``job_id`` starts the trace of that job, and one without is not recorded.
+    The sampling decision is taken once per trace, when it starts.
+    """
+    parent = _current_span.get()
+    if parent is not None:
+        trace_id, parent_id, recording = parent.trace_id, parent.span_id, parent.recording
+        job_id = parent.job_id if job_id is None else str(job_id)
+    elif job_id is not None:
+        trace_id, parent_id = trace_id_for_job(job_id), None
+        recording = TRACING_ENABLED and is_sampled(trace_id, SAMPLE_RATE)
+        job_id = str(job_id)
+    else:
+        trace_id, parent_id, recording = "0" * 32, None, False
+    span = Span(name=name, trace_id=trace_id, span_id=secrets.token_hex(8),
+                parent_id=parent_id, job_id=job_id, recording=recording)
+    if recording:
+        span.set_attribute("job.id", job_id)
+        for key, value in attributes.items():
+            span.set_attribute(key, value)
+    token = _current_span.set(span)
+    try:
+        yield span
+    except BaseException as e:
+        span.record_exception(e)
+        raise
+    finally:
+        _current_span.reset(token)
+        span.end_ns = time.time_ns()
+        if recording:
+            span_exporter.export(span)
+
+
+def record_span(name: str, start_ns: int, end_ns: int, **attributes: Any) -> None:
+    """Record an already finished stage, such as one observed through ComfyUI messages."""
+    parent = _current_span.get()
+    if parent is None or not parent.recording:
+        return
+    span = Span(name=name, trace_id=parent.trace_id, span_id=secrets.token_hex(8),
+                parent_id=parent.span_id, job_id=parent.job_id, start_ns=start_ns,
+                end_ns=end_ns, attributes={"job.id": parent.job_id})
+    for key, value in attributes.items():
+        span.set_attribute(key, value)
+    span_exporter.export(span)
+
+
+def traced(name: str):
+    """Run an async function in a span, correlated by its ``job_id`` argument if any."""
+
+    def decorator(func):
+        signature = inspect.signature(func)
+        has_job_id = "job_id" in signature.parameters
+
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            job_id = None
+            if has_job_id:
+                job_id = signature.bind_partial(*args, **kwargs).arguments.get("job_id")
+            with start_span(name, job_id=job_id):
+                return await func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
@@ -1,8 +1,8 @@
 from dotenv import load_dotenv
-from fief_client import FiefAsync
 
 from core.config_core import Config
 from core.env_core import Envs, get_env_variable
+from core.fief_core import CachedFiefAsync
 from core.logging_core import setup_logger
 
 load_dotenv()
@@ -16,7 +16,7 @@ domain_address = config_instance.get("Fief", "domain", default="http://127.0.0.1
 if not domain_address:
     logger.error("Fief domain not found in config.ini ([Fief] domain). Authentication might fail.")
 
-fief = FiefAsync(
+fief = CachedFiefAsync(
     domain_address,
     get_env_variable(Envs.FIEF_CLIENT_ID),
     get_env_variable(Envs.FIEF_CLIENT_SECRET),
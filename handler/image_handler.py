@@ -1,32 +1,59 @@
+import asyncio
 import base64
 import io
 import json
 import os
 import uuid
+from collections import defaultdict
+from datetime import datetime, timezone
 from typing import Any, Optional
 
 from fastapi import HTTPException, status
+from minio.error import S3Error
 from pydantic import ValidationError
 
 from core.comfy.comfy_core import ComfyUIError, execute_workflow
-from core.db_core import get_db_session
+from core.config_core import Config
+from core.db_core import get_db_session, get_read_db_session, read_from_primary
+from core.job_events_core import publish_job_event
+from core.job_store_core import JobStore
 from core.logging_core import setup_logger
-from core.minio_core import default_bucket_name, upload_bytes_to_bucket
+from core.minio_core import (
+    default_bucket_name,
+    remove_objects_from_bucket,
+    split_object_url,
+    stat_object_in_bucket,
+    upload_bytes_to_bucket,
+)
+from core.tracing_core import current_span, start_span, traced
 from handler.user_handler import get_user_by_id_handler
 from handler.workflow_handler import load_and_populate_workflow
 from model.image_model import Image
 from service.image_service import (
     create_image,
-    delete_image,
+    create_images,
+    delete_images,
     get_all_images_by_user_id,
     get_all_images_by_user_id_and_folder_id,
+    get_image_by_id_and_user_id,
+    search_images,
 )
+from utils.pagination_util import clamp_page_size, decode_cursor, encode_cursor
 
 logger = setup_logger(__name__)
+config_instance = Config()
 WORKFLOW_DIR = os.path.join(os.path.dirname(__file__), "..", "comfy", "workflows")
 BUCKET_NAME = default_bucket_name
 FILE_EXTENSION = ".png"
+OBJECT_REMOVAL_BATCH_SIZE = 1000
+deletion_jobs = JobStore("deletion")
+DEFAULT_PAGE_SIZE = config_instance.getint("Pagination", "default_page_size", default=50)
+MAX_PAGE_SIZE = config_instance.getint("Pagination", "max_page_size", default=200)
+GENERATION_READS_FROM_PRIMARY = config_instance.getboolean(
+    "Database", "generation_reads_from_primary", default=True
+)
 
+@traced("db.create_image")
 async def create_image_handler(
         url: Image.url,
         workflow_id: Image.workflow_id,
@@ -56,14 +83,60 @@ async def create_image_handler(
             detail="Internal Server Error") from e
 
 
-async def get_all_images_by_user_id_handler(user_id: uuid.UUID) -> list[Image]:
+def _page_params(limit: Optional[int], cursor: Optional[str]):
+    page_size = clamp_page_size(limit, DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE)
+    if not cursor:
+        return page_size, None
+    try:
+        return page_size, decode_cursor(cursor)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid pagination cursor",
+        ) from e
+
+def _build_page(images: list[Image], page_size: int) -> dict[str, Any]:
+    next_cursor = None
+    if len(images) > page_size:
+        images = images[:page_size]
+        next_cursor = encode_cursor(images[-1].created_at, images[-1].id)
+    return {"items": images, "next_cursor": next_cursor}
+
+@traced("db.create_images")
+async def create_images_handler(
+    images: list[Image], plan_id: Optional[uuid.UUID] = None, gpu_seconds: float = 0.0
+) -> list[Image]:
     """
-    Handler to get all images for a specific user.
+    Handler to persist the images of a job, and charge them to the user's usage
+    counters, in a single transaction.
+
+    If the insert fails, the already uploaded objects are removed on a best-effort basis.
     """
     try:
         async with get_db_session() as session:
-            images = await get_all_images_by_user_id(session, user_id)
-            return images
+            return await create_images(session, images, plan_id, gpu_seconds)
+    except Exception as e:
+        logger.error(f"Error creating images: {e}")
+        object_names = [split_object_url(image.url)[1] for image in images]
+        try:
+            await asyncio.to_thread(remove_objects_from_bucket, BUCKET_NAME, object_names)
+        except S3Error as remove_error:
+            logger.warning(f"Failed to remove objects of unsaved images: {remove_error}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Internal Server Error") from e
+
+async def get_all_images_by_user_id_handler(
+    user_id: uuid.UUID, limit: Optional[int] = None, cursor: Optional[str] = None
+) -> dict[str, Any]:
+    """
+    Handler to get a page of images for a specific user, newest first.
+    """
+    page_size, after = _page_params(limit, cursor)
+    try:
+        async with get_read_db_session() as session:
+            images = await get_all_images_by_user_id(session, user_id, page_size + 1, after)
+            return _build_page(images, page_size)
     except Exception as e:
         logger.error(f"Error retrieving images for user {user_id}: {e}")
         raise HTTPException(
@@ -71,42 +144,194 @@ async def get_all_images_by_user_id_handler(user_id: uuid.UUID) -> list[Image]:
             detail="Internal Server Error") from e
 
 async def get_all_images_by_user_id_and_folder_id_handler(
-    user_id: uuid.UUID, folder_id: uuid.UUID
-) -> list[Image]:
+    user_id: uuid.UUID,
+    folder_id: uuid.UUID,
+    limit: Optional[int] = None,
+    cursor: Optional[str] = None,
+) -> dict[str, Any]:
     """
-    Handler to get all images for a specific user and folder.
+    Handler to get a page of images for a specific user and folder, newest first.
     """
+    page_size, after = _page_params(limit, cursor)
     try:
-        async with get_db_session() as session:
-            images = await get_all_images_by_user_id_and_folder_id(session, user_id, folder_id)
-            return images
+        async with get_read_db_session() as session:
+            images = await get_all_images_by_user_id_and_folder_id(
+                session, user_id, folder_id, page_size + 1, after
+            )
+            return _build_page(images, page_size)
     except Exception as e:
         logger.error(f"Error retrieving images for user {user_id} in folder {folder_id}: {e}")
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Internal Server Error") from e
 
-async def delete_image_handler(image_id: uuid.UUID) -> None:
+async def search_images_handler(
+    user_id: uuid.UUID,
+    filters: dict[str, Any],
+    limit: Optional[int] = None,
+    cursor: Optional[str] = None,
+) -> dict[str, Any]:
+    """
+    Handler to search a user's images by prompt text and parameter filters.
+    """
+    page_size, after = _page_params(limit, cursor)
+    try:
+        async with get_read_db_session() as session:
+            images = await search_images(
+                session, user_id, limit=page_size + 1, after=after, **filters
+            )
+            return _build_page(images, page_size)
+    except Exception as e:
+        logger.error(f"Error searching images for user {user_id}: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Internal Server Error") from e
+
+async def get_image_content_handler(user_id: uuid.UUID, image_id: uuid.UUID):
     """
-    Handler to delete an image by its ID.
+    Handler to resolve the storage location and metadata of a user's image.
+
+    Returns:
+        tuple: The bucket name, the object name and the MinIO object metadata.
     """
+    try:
+        async with get_read_db_session() as session:
+            image = await get_image_by_id_and_user_id(session, image_id, user_id)
+        if image is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Image with ID {image_id} not found",
+            )
+        bucket_name, object_name = split_object_url(image.url)
+        object_stat = await asyncio.to_thread(stat_object_in_bucket, bucket_name, object_name)
+        return bucket_name, object_name, object_stat
+    except HTTPException:
+        raise
+    except S3Error as e:
+        if e.code in ("NoSuchKey", "NoSuchBucket"):
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Content for image with ID {image_id} not found",
+            ) from e
+        logger.error(f"Error retrieving content metadata for image {image_id}: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_502_BAD_GATEWAY,
+            detail="Storage backend error") from e
+    except Exception as e:
+        logger.error(f"Error retrieving content for image {image_id}: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Internal Server Error") from e
+
+async def delete_images_handler(
+    user_id: uuid.UUID,
+    image_ids: Optional[list[uuid.UUID]] = None,
+    folder_id: Optional[uuid.UUID] = None,
+) -> tuple[dict[str, Any], list[str]]:
+    """
+    Handler to delete many images of a user in one statement.
+
+    Returns the deletion job progress report and the storage URLs whose objects
+    must be removed by `remove_image_objects_handler`.
+    """
+    if not image_ids and folder_id is None:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Provide image IDs and/or a folder ID to delete.",
+        )
     try:
         async with get_db_session() as session:
-            await delete_image(session, image_id)
+            urls = await delete_images(session, user_id, image_ids, folder_id)
+    except HTTPException:
+        raise
     except Exception as e:
-        logger.error(f"Error deleting image {image_id}: {e}")
+        logger.error(f"Error deleting images for user {user_id}: {e}")
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Internal Server Error") from e
 
+    now = datetime.now(timezone.utc)
+    job = {
+        "job_id": str(uuid.uuid4()),
+        "user_id": str(user_id),
+        "status": "pending" if urls else "completed",
+        "deleted_images": len(urls),
+        "total_objects": len(urls),
+        "removed_objects": 0,
+        "failed_objects": 0,
+        "created_at": now,
+        "updated_at": now,
+    }
+    await asyncio.to_thread(deletion_jobs.save, job)
+    return job, urls
+
+def remove_image_objects_handler(job: dict[str, Any], urls: list[str]) -> None:
+    """
+    Background handler removing the storage objects of deleted images in batches.
+
+    Runs in a worker thread. The objects are always removed, since their rows are
+    already gone; the progress report of the deletion job is saved after every batch
+    on a best-effort basis.
+    """
+    job = dict(job)
+    job_id = job["job_id"]
+    job["status"] = "running"
+    deletion_jobs.save(job)
+    objects_by_bucket: dict[str, list[str]] = defaultdict(list)
+    for url in urls:
+        try:
+            bucket_name, object_name = split_object_url(url)
+        except ValueError:
+            job["failed_objects"] += 1
+            continue
+        objects_by_bucket[bucket_name].append(object_name)
+
+    try:
+        for bucket_name, object_names in objects_by_bucket.items():
+            for start in range(0, len(object_names), OBJECT_REMOVAL_BATCH_SIZE):
+                batch = object_names[start:start + OBJECT_REMOVAL_BATCH_SIZE]
+                errors = remove_objects_from_bucket(bucket_name, batch)
+                job["removed_objects"] += len(batch) - len(errors)
+                job["failed_objects"] += len(errors)
+                job["updated_at"] = datetime.now(timezone.utc)
+                deletion_jobs.save(job)
+        job["status"] = "completed"
+    except Exception as e:
+        logger.error(f"Error removing objects for deletion job {job_id}: {e}")
+        job["status"] = "failed"
+    job["updated_at"] = datetime.now(timezone.utc)
+    deletion_jobs.save(job)
+    logger.info(
+        f"Deletion job {job_id} finished with status {job['status']}: "
+        f"{job['removed_objects']} removed, {job['failed_objects']} failed."
+    )
+
+async def get_deletion_job_handler(user_id: uuid.UUID, job_id: str) -> dict[str, Any]:
+    """
+    Handler to get the progress report of a deletion job owned by the user.
+    """
+    job = await asyncio.to_thread(deletion_jobs.get, job_id)
+    if job is None or job["user_id"] != str(user_id):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Deletion job {job_id} not found",
+        )
+    return job
+
+@traced("minio.upload")
 async def save_output_image_to_bucket(object_name: str, node_id: str, images: list[bytes]) -> None:
     if isinstance(images, list) and images and isinstance(images[0], bytes):
         logger.info(f"Saving output images to bucket for node {node_id}.")
         byte_stream = io.BytesIO()
         for image in images:
             byte_stream.write(image)
+        span = current_span()
+        if span is not None:
+            span.set_attribute("minio.object", f"{object_name}{FILE_EXTENSION}")
+            span.set_attribute("minio.bytes", byte_stream.tell())
         byte_stream.seek(0)
-        upload_bytes_to_bucket(
+        await asyncio.to_thread(
+            upload_bytes_to_bucket,
             BUCKET_NAME,
             byte_stream,
             f"{object_name}{FILE_EXTENSION}",
@@ -120,11 +345,57 @@ async def handle_generate_image(
         job_id: str,
         workflow_id: uuid.UUID,
         params: dict[str, Any]
+) -> Optional[dict[str, list[bytes]]]:
+    """
+    Generate the images of a job. With read-your-writes enabled, every read of the
+    generation flow is served by the primary instead of a replica. The outcome is
+    published as the job's final event, with the URLs of the stored images. The
+    stages of the generation are traced under the job's id.
+    """
+    stored_images: list[Image] = []
+    try:
+        with start_span(
+            "generate_image", job_id=job_id,
+            **{"user.id": str(user_id), "workflow.id": str(workflow_id)},
+        ) as span:
+            if not GENERATION_READS_FROM_PRIMARY:
+                output = await _generate_image(
+                    user_id, folder_id, job_id, workflow_id, params, stored_images
+                )
+            else:
+                with read_from_primary():
+                    output = await _generate_image(
+                        user_id, folder_id, job_id, workflow_id, params, stored_images
+                    )
+            span.set_attribute("images.count", len(stored_images))
+    except HTTPException as e:
+        publish_job_event(user_id, job_id, "failed", {"detail": e.detail})
+        raise
+    except Exception as e:
+        publish_job_event(user_id, job_id, "failed", {"detail": str(e)})
+        raise
+    publish_job_event(user_id, job_id, "completed", {
+        "images": [
+            {"id": str(image.id), "url": f"/user/image/{image.id}/content"}
+            for image in stored_images
+        ],
+    })
+    return output
+
+async def _generate_image(
+    user_id: uuid.UUID,
+        folder_id: uuid.UUID,
+        job_id: str,
+        workflow_id: uuid.UUID,
+        params: dict[str, Any],
+        stored_images: Optional[list[Image]] = None,
 ) -> Optional[dict[str, list[bytes]]]:
     logger.info(f"Handling image generation for user {user_id}, "
                 f"job {job_id}, workflow {workflow_id}")
     logger.debug(f"Received parameters: {params}")
-    object_name = f"{user_id}/{job_id}"
+    # The job id may be chosen by the client, so it only keys the job events and the
+    # trace; stored objects always get a fresh server-side name.
+    object_name = f"{user_id}/{uuid.uuid4()}"
 
     try:
         user = await get_user_by_id_handler(user_id)
@@ -134,7 +405,9 @@ async def handle_generate_image(
             params,
             plan_id
         )
-        workflow_outputs = await execute_workflow(str(user_id), job_id, populated_workflow)
+        workflow_outputs, gpu_seconds = await execute_workflow(
+            str(user_id), job_id, populated_workflow
+        )
 
         if not workflow_outputs:
             raise HTTPException(
@@ -159,7 +432,11 @@ async def handle_generate_image(
                     folder_id,
                     user_id,
                     params,
+                    plan_id=plan_id,
+                    gpu_seconds=gpu_seconds,
+                    stored_images=stored_images,
                 )
+                gpu_seconds = 0.0
                 for image_bytes in images[output_node_id]:
                     image_base64 = base64.b64encode(image_bytes).decode("utf-8")
                     processed_param = param.copy()
@@ -195,6 +472,9 @@ async def process_output_images(
     folder_id: uuid.UUID,
     user_id: uuid.UUID,
     params: dict[str, Any],
+    plan_id: Optional[uuid.UUID] = None,
+    gpu_seconds: float = 0.0,
+    stored_images: Optional[list[Image]] = None,
 ) -> Optional[dict[str, list[bytes]]]:
     if output_node_id in workflow_outputs:
         return await get_output_images(
@@ -205,7 +485,10 @@ async def process_output_images(
             workflow_id,
             folder_id,
             user_id,
-            params
+            params,
+            plan_id,
+            gpu_seconds,
+            stored_images,
         )
 
     logger.warning(f"Designated output node {output_node_id} not found or had no images for job "
@@ -220,7 +503,10 @@ async def process_output_images(
                 workflow_id,
                 folder_id,
                 user_id,
-                params
+                params,
+                plan_id,
+                gpu_seconds,
+                stored_images,
             )
         except ValueError:
             continue
@@ -241,20 +527,33 @@ async def get_output_images(
     folder_id: uuid.UUID,
     user_id: uuid.UUID,
     params: dict[str, Any],
+    plan_id: Optional[uuid.UUID] = None,
+    gpu_seconds: float = 0.0,
+    stored_images: Optional[list[Image]] = None,
 ) -> dict[str, list[bytes]]:
     output_images = workflow_outputs[node_id]
-    for index, image_bytes in enumerate(output_images):
-        object_name_with_index = f"{object_name}_{index}"
-        await save_output_image_to_bucket(object_name_with_index, node_id, [image_bytes])
-        url = f"{BUCKET_NAME}/{object_name_with_index}{FILE_EXTENSION}"
-        await create_image_handler(
-            url=url,
+    if not output_images or not all(isinstance(image, bytes) for image in output_images):
+        raise ValueError("Output images are not valid bytes list.")
+    object_names = [f"{object_name}_{index}" for index in range(len(output_images))]
+    await asyncio.gather(*(
+        save_output_image_to_bucket(name, node_id, [image_bytes])
+        for name, image_bytes in zip(object_names, output_images)
+    ))
+    images = [
+        Image(
+            url=f"{BUCKET_NAME}/{name}{FILE_EXTENSION}",
             workflow_id=workflow_id,
             user_id=user_id,
             user_folder_id=folder_id,
             parameters=params,
+            size_bytes=len(image_bytes),
         )
-        logger.info(f"Image {index} created successfully for job {job_id} in node {node_id}.")
+        for name, image_bytes in zip(object_names, output_images)
+    ]
+    await create_images_handler(images, plan_id, gpu_seconds)
+    if stored_images is not None:
+        stored_images.extend(images)
+    logger.info(f"{len(images)} image(s) created successfully for job {job_id} in node {node_id}.")
     return {node_id: output_images}
 
 
@@ -0,0 +1,189 @@
+import asyncio
+from collections import defaultdict
+from datetime import datetime, timedelta, timezone
+from typing import Any, Optional
+
+from core.config_core import Config
+from core.db_core import dispose_engines, get_db_session
+from core.logging_core import setup_logger
+from core.metric_core import InfluxDBWriter
+from core.minio_core import remove_objects_from_bucket, split_object_url
+from service.image_partition_service import (
+    add_months,
+    create_image_partition,
+    delete_expired_images_of_plan,
+    detach_image_partition,
+    drop_image_partition,
+    get_longest_retention_days,
+    get_plan_retentions,
+    image_partition_month,
+    image_partition_name,
+    is_images_partitioned,
+    list_image_partitions,
+    month_start,
+    stream_partition_urls,
+)
+
+logger = setup_logger(__name__)
+config_instance = Config()
+metric = InfluxDBWriter()
+
+MONTHS_AHEAD = config_instance.getint("ImagePartitions", "months_ahead", default=3)
+DELETE_BATCH_SIZE = config_instance.getint("ImagePartitions", "delete_batch_size", default=1000)
+
+
+async def _remove_objects(urls: list[str], report: dict) -> None:
+    """Remove the objects of deleted images, batched per bucket."""
+    object_names = defaultdict(list)
+    for url in urls:
+        try:
+            bucket_name, object_name = split_object_url(url)
+        except ValueError:
+            logger.warning("Skipping invalid object URL %s.", url)
+            continue
+        object_names[bucket_name].append(object_name)
+    for bucket_name, names in object_names.items():
+        for start in range(0, len(names), DELETE_BATCH_SIZE):
+            batch = names[start:start + DELETE_BATCH_SIZE]
+            errors = await asyncio.to_thread(remove_objects_from_bucket, bucket_name, batch)
+            report["removed_objects"] += len(batch) - len(errors)
+            report["failed_objects"] += len(errors)
+
+
+async def ensure_image_partitions_handler() -> int:
+    """
+    Create the monthly image partitions from the current month up to the configured
+    number of months ahead.
+
+    Each month is created in its own transaction. A month that cannot be created (for
+    instance because the default partition already holds rows in its range, after an
+    earlier failure) is logged and skipped, so it does not block the other months or
+    the rest of the maintenance; its images keep going to the default partition.
+
+    Returns:
+        int: How many partitions were created.
+    """
+    async with get_db_session() as session:
+        if not await is_images_partitioned(session):
+            logger.warning("The images table is not partitioned (it was created before "
+                           "partitioning was introduced); skipping partition maintenance.")
+            return 0
+        existing = await list_image_partitions(session)
+        current_month = month_start(datetime.now(timezone.utc))
+        created = 0
+        for offset in range(MONTHS_AHEAD + 1):
+            month = add_months(current_month, offset)
+            name = image_partition_name(month)
+            if name in existing:
+                continue
+            try:
+                await create_image_partition(session, month)
+                await session.commit()
+            except Exception as e:
+                await session.rollback()
+                logger.error("Could not create image partition %s, its images stay in the "
+                             "default partition: %s", name, e)
+                continue
+            created += 1
+        return created
+
+
+async def _drop_expired_partitions(
+    longest_retention_days: Optional[int], report: dict
+) -> None:
+    """
+    Detach the partitions whose whole month is past every plan's retention, remove
+    their objects and drop them. A partition whose objects could not all be removed
+    stays detached and is retried on the next run, whatever the retention is by then.
+    """
+    cutoff = None
+    if longest_retention_days is not None:
+        cutoff = datetime.now(timezone.utc) - timedelta(days=longest_retention_days)
+    async with get_db_session() as session:
+        partitions = await list_image_partitions(session)
+        for name, attached in sorted(partitions.items()):
+            month = image_partition_month(name)
+            if attached and (cutoff is None or add_months(month, 1) > cutoff):
+                continue
+            if attached:
+                await detach_image_partition(session, name)
+                await session.commit()
+            urls = [url async for url in stream_partition_urls(session, name)]
+            failed_before = report["failed_objects"]
+            await _remove_objects(urls, report)
+            if report["failed_objects"] > failed_before:
+                logger.warning("Keeping detached partition %s until its objects are removed.",
+                               name)
+                continue
+            await drop_image_partition(session, name)
+            await session.commit()
+            report["dropped_partitions"] += 1
+            report["expired_images"] += len(urls)
+
+
+async def _delete_expired_plan_images(
+    plan_retentions: dict, longest_retention_days: Optional[int], report: dict
+) -> None:
+    """
+    Delete, in batches, the images of plans that keep them for less time than the
+    partitions are kept.
+    """
+    now = datetime.now(timezone.utc)
+    for plan_id, retention_days in plan_retentions.items():
+        if longest_retention_days is not None and retention_days >= longest_retention_days:
+            continue
+        cutoff = now - timedelta(days=retention_days)
+        while True:
+            async with get_db_session() as session:
+                urls = await delete_expired_images_of_plan(
+                    session, plan_id, cutoff, DELETE_BATCH_SIZE
+                )
+            report["expired_images"] += len(urls)
+            await _remove_objects(urls, report)
+            if len(urls) < DELETE_BATCH_SIZE:
+                break
+
+
+async def maintain_image_partitions_handler() -> dict[str, Any]:
+    """
+    Create upcoming image partitions and apply the per-plan retention policies.
+
+    Partitions hold the images of every plan, so a month is dropped as a whole (a
+    metadata operation) once it is older than the longest retention of any user's
+    plan. Plans with a shorter retention have their older images deleted in batches,
+    which only scan the partitions older than their cutoff.
+
+    Returns:
+        dict[str, Any]: A report with the maintenance counters.
+    """
+    report: dict[str, Any] = {
+        "created_partitions": 0,
+        "dropped_partitions": 0,
+        "expired_images": 0,
+        "removed_objects": 0,
+        "failed_objects": 0,
+    }
+    report["created_partitions"] = await ensure_image_partitions_handler()
+    async with get_db_session() as session:
+        partitioned = await is_images_partitioned(session)
+        longest_retention_days = await get_longest_retention_days(session)
+        plan_retentions = await get_plan_retentions(session)
+
+    if partitioned:
+        await _drop_expired_partitions(longest_retention_days, report)
+    await _delete_expired_plan_images(plan_retentions, longest_retention_days, report)
+
+    logger.info("Image partition maintenance finished: %s", report)
+    metric.write_metric(measurement="image_partition_maintenance", tags={}, fields=report)
+    return report
+
+
+async def maintain_image_partitions_job() -> dict[str, Any]:
+    """
+    Entry point for the scheduled job: runs the maintenance in a fresh event loop and
+    releases the pooled connections bound to it afterwards.
+    """
+    try:
+        return await maintain_image_partitions_handler()
+    finally:
+        await dispose_engines()
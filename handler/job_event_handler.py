@@ -0,0 +1,94 @@
+import io
+import uuid
+from collections.abc import AsyncIterator
+from typing import Optional
+
+import orjson
+from fastapi import HTTPException, status
+
+from core.comfy.comfy_core import get_preview_queue
+from core.config_core import Config
+from core.job_events_core import JobEvent, job_event_bus
+from core.logging_core import setup_logger
+
+logger = setup_logger(__name__)
+config_instance = Config()
+
+HEARTBEAT_SECONDS = config_instance.getint("JobEvents", "heartbeat_seconds", default=15)
+RETRY_MILLISECONDS = config_instance.getint("JobEvents", "retry_milliseconds", default=3000)
+UNKNOWN_JOB_SECONDS = config_instance.getint("JobEvents", "unknown_job_seconds", default=10)
+
+
+def format_sse(job_event: JobEvent) -> bytes:
+    """Encode a job event as a Server-Sent Events message."""
+    return (
+        f"id: {job_event.id}\nevent: {job_event.event}\ndata: ".encode()
+        + orjson.dumps(job_event.data)
+        + b"\n\n"
+    )
+
+
+def parse_last_event_id(value: Optional[str]) -> Optional[int]:
+    if not value:
+        return None
+    try:
+        return int(value)
+    except ValueError:
+        return None
+
+
+def claim_job_handler(user_id: uuid.UUID, job_id: str) -> None:
+    """Reserve the id of a new job, rejecting ids already used by the user's jobs."""
+    if not job_event_bus.claim(user_id, job_id):
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=f"Job {job_id} already exists.",
+        )
+
+
+async def ensure_job_exists_handler(user_id: uuid.UUID, job_id: str) -> None:
+    """
+    Wait briefly for the user's job to exist, so a client may subscribe just before
+    starting the generation, then give up with 404.
+    """
+    if not await job_event_bus.wait_until_known(user_id, job_id, UNKNOWN_JOB_SECONDS):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Job {job_id} not found.",
+        )
+
+
+async def stream_job_events_handler(
+    user_id: uuid.UUID, job_id: str, last_event_id: Optional[str] = None
+) -> AsyncIterator[bytes]:
+    """
+    Stream the events of a job as Server-Sent Events until it completes or fails. Idle
+    periods are filled with comments so proxies keep the connection open.
+    """
+    yield f"retry: {RETRY_MILLISECONDS}\n\n".encode()
+    async for job_event in job_event_bus.subscribe(
+        user_id, job_id, parse_last_event_id(last_event_id), heartbeat=HEARTBEAT_SECONDS
+    ):
+        if job_event is None:
+            yield b": keep-alive\n\n"
+            continue
+        yield format_sse(job_event)
+    logger.debug("Event stream of job %s finished.", job_id)
+
+
+async def get_job_preview_handler(user_id: uuid.UUID, job_id: str) -> bytes:
+    """Returns the latest preview of one of the user's running jobs as JPEG bytes."""
+    if not job_event_bus.is_running(user_id, job_id):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Running job {job_id} not found.",
+        )
+    preview = await get_preview_queue(user_id, job_id)
+    if preview is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="No preview available.",
+        )
+    buffer = io.BytesIO()
+    preview.convert("RGB").save(buffer, format="JPEG")
+    return buffer.getvalue()
@@ -1,9 +1,10 @@
-from typing import Optional
+from typing import Any, Optional
 from uuid import UUID
 
 from fastapi import HTTPException, status
 
-from core.db_core import get_db_session
+from core.catalog_cache_core import CatalogSnapshot, catalog_cache
+from core.db_core import get_db_session, get_read_db_session
 from core.logging_core import setup_logger
 from model.model_model import Model, ModelCreate, ModelUpdate
 from service.model_service import (
@@ -17,12 +18,14 @@ from service.model_service import (
 
 logger = setup_logger(__name__)
 
-async def get_all_models_handler() -> list[Model]:
+MODELS_CATALOG = "models"
+
+async def get_all_models_handler() -> list[dict[str, Any]]:
     """
     Handler to retrieve all models.
     """
     try:
-        async with get_db_session() as session:
+        async with get_read_db_session() as session:
             models = await get_all_models(session)
         return models
     except Exception as e:
@@ -31,13 +34,19 @@ async def get_all_models_handler() -> list[Model]:
             detail="Error retrieving models",
         ) from e
 
+async def get_models_snapshot_handler() -> CatalogSnapshot:
+    """
+    Handler to retrieve the serialized model listing, served from the catalog cache.
+    """
+    return await catalog_cache.get(MODELS_CATALOG, get_all_models_handler)
+
 async def get_model_by_id_handler(model_id: UUID) -> Optional[Model]:
     """
     Handler to retrieve a model by its ID.
     Returns the model or raises an HTTP 404 if not found.
     """
     try:
-        async with get_db_session() as session:
+        async with get_read_db_session() as session:
             model = await get_model_by_id(session, model_id)
         return model
     except ModelNotFound as e:
@@ -59,6 +68,7 @@ async def create_model_handler(model_data: ModelCreate) -> Model:
     try:
         async with get_db_session() as session:
             model = await create_model(session, model_data)
+        catalog_cache.invalidate(MODELS_CATALOG)
         return model
     except ValueError as e:
         logger.exception("Validation error creating model %s: %s",
@@ -83,6 +93,7 @@ async def update_model_handler(model_id: UUID, model_update_data: ModelUpdate) -
         model_update_data = model_update_data.model_dump(exclude_unset=True)
         async with get_db_session() as session:
             model = await update_model(session, model_id, model_update_data)
+        catalog_cache.invalidate(MODELS_CATALOG)
         return model
     except ModelNotFound as e:
         raise HTTPException(
@@ -109,6 +120,7 @@ async def delete_model_handler(model_id: UUID) -> None:
     try:
         async with get_db_session() as session:
             await delete_model(session, model_id)
+        catalog_cache.invalidate(MODELS_CATALOG)
     except ModelNotFound as e:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
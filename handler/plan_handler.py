@@ -1,9 +1,10 @@
-from typing import Optional
+from typing import Any, Optional
 from uuid import UUID
 
 from fastapi import HTTPException, status
 
-from core.db_core import get_db_session
+from core.catalog_cache_core import CatalogSnapshot, catalog_cache
+from core.db_core import get_db_session, get_read_db_session
 from core.logging_core import setup_logger
 from model.plan_model import Plan, PlanCreate, PlanUpdate
 from service.plan_service import (
@@ -18,12 +19,14 @@ from service.plan_service import (
 
 logger = setup_logger(__name__)
 
-async def get_all_plans_handler() -> list[Plan]:
+PLANS_CATALOG = "plans"
+
+async def get_all_plans_handler() -> list[dict[str, Any]]:
     """
     Handler to retrieve all plans.
     """
     try:
-        async with get_db_session() as session:
+        async with get_read_db_session() as session:
             plans = await get_all_plans(session)
         return plans
     except Exception as e:
@@ -33,13 +36,19 @@ async def get_all_plans_handler() -> list[Plan]:
             detail="Error retrieving plans",
         ) from e
 
+async def get_plans_snapshot_handler() -> CatalogSnapshot:
+    """
+    Handler to retrieve the serialized plan listing, served from the catalog cache.
+    """
+    return await catalog_cache.get(PLANS_CATALOG, get_all_plans_handler)
+
 async def get_plan_by_id_handler(plan_id: UUID) -> Optional[Plan]:
     """
     Handler to retrieve a plan by its ID.
     Returns the plan or raises an HTTP 404 if not found.
     """
     try:
-        async with get_db_session() as session:
+        async with get_read_db_session() as session:
             plan = await get_plan_by_id(session, plan_id)
         return plan
     except PlanNotFound as e:
@@ -61,6 +70,7 @@ async def create_plan_handler(plan_data: PlanCreate) -> Plan:
     try:
         async with get_db_session() as session:
             plan = await create_plan(session, plan_data)
+        catalog_cache.invalidate(PLANS_CATALOG)
         return plan
     except ValueError as e:
         logger.exception("Validation error creating plan %s: %s", getattr(plan_data, "name", ""), e)
@@ -83,6 +93,7 @@ async def update_plan_handler(plan_id: UUID, plan_update_data: PlanUpdate) -> Op
         plan_update_data = plan_update_data.model_dump(exclude_unset=True)
         async with get_db_session() as session:
             plan = await update_plan(session, plan_id, plan_update_data)
+        catalog_cache.invalidate(PLANS_CATALOG)
         return plan
     except PlanNotFound as e:
         raise HTTPException(
@@ -109,6 +120,7 @@ async def delete_plan_handler(plan_id: UUID) -> None:
     try:
         async with get_db_session() as session:
             await delete_plan(session, plan_id)
+        catalog_cache.invalidate(PLANS_CATALOG)
     except PlanNotFound as e:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -126,7 +138,7 @@ async def get_first_plan_by_price_handler(price: float = 0) -> Optional[Plan]:
     Handler to retrieve the first plan by its price.
     """
     try:
-        async with get_db_session() as session:
+        async with get_read_db_session() as session:
             plan = await get_first_plan_by_price(session, price)
         return plan
     except Exception as e:
@@ -0,0 +1,50 @@
+import time
+from typing import Optional
+from uuid import UUID
+
+from fief_client import FiefAccessTokenExpired, FiefAccessTokenInvalid
+
+from core.config_core import Config
+from core.db_core import get_read_db_session
+from core.logging_core import setup_logger
+from handler.auth_handler import fief
+from service.plan_service import get_rate_limits_by_user_id
+
+logger = setup_logger(__name__)
+config_instance = Config()
+
+PLAN_CACHE_SECONDS = config_instance.getint("RateLimit", "plan_cache_seconds", default=60)
+PLAN_CACHE_SIZE = config_instance.getint("RateLimit", "plan_cache_size", default=10000)
+_plan_rates: dict[UUID, tuple[Optional[dict[str, str]], float]] = {}
+
+
+async def get_user_rate_limits_handler(user_id: UUID) -> Optional[dict[str, str]]:
+    """
+    Returns the rate limit overrides of the user's plan, cached for
+    ``plan_cache_seconds`` so plan changes apply without a lookup per request.
+    """
+    cached = _plan_rates.get(user_id)
+    now = time.monotonic()
+    if cached is not None and cached[1] > now:
+        return cached[0]
+    async with get_read_db_session() as session:
+        rates = await get_rate_limits_by_user_id(session, user_id)
+    if len(_plan_rates) >= PLAN_CACHE_SIZE:
+        _plan_rates.clear()
+    _plan_rates[user_id] = (rates, now + PLAN_CACHE_SECONDS)
+    return rates
+
+
+async def resolve_rate_limit_subject(
+    access_token: str,
+) -> Optional[tuple[str, Optional[dict[str, str]]]]:
+    """
+    Resolves the access token of a request to its user and the rate limits of their
+    plan. Invalid tokens resolve to None, so the request is limited by address.
+    """
+    try:
+        access_token_info = await fief.validate_access_token(access_token)
+    except (FiefAccessTokenInvalid, FiefAccessTokenExpired):
+        return None
+    user_id = access_token_info["id"]
+    return str(user_id), await get_user_rate_limits_handler(user_id)
@@ -1,23 +1,49 @@
+from core.config_core import Config
 from core.db_core import RESOURCE_POSTGRES_PATH, get_db_session
 from core.logging_core import setup_logger
+from handler.image_partition_handler import ensure_image_partitions_handler
 from handler.user_handler import sync_users_handler
+from service.app_state_service import get_app_state, set_app_state
 from service.model_service import MODELS_JSON_PATH, seed_model_from_json
 from service.plan_service import PLANS_JSON_PATH, seed_plan_from_json
+from service.seed_service import resources_checksum
 from service.workflow_service import WORKFLOWS_JSON_PATH, seed_workflow_from_json
 
 logger = setup_logger(__name__)
+config_instance = Config()
+SEED_CHECKSUM_KEY = "seed_resources_checksum"
+SEED_UPDATE_EXISTING = config_instance.getboolean("Seed", "update_existing", default=False)
+SEED_SKIP_UNCHANGED = config_instance.getboolean("Seed", "skip_unchanged", default=True)
+
+async def seed_resources():
+    """
+    Seed models, workflows and plans from the JSON resources, unless their checksum
+    matches the one stored by the previous run.
+    """
+    models_path = RESOURCE_POSTGRES_PATH + MODELS_JSON_PATH
+    workflows_path = RESOURCE_POSTGRES_PATH + WORKFLOWS_JSON_PATH
+    plans_path = RESOURCE_POSTGRES_PATH + PLANS_JSON_PATH
+    checksum = resources_checksum([models_path, workflows_path, plans_path])
+    if SEED_UPDATE_EXISTING:
+        checksum += ":update"
+
+    async with get_db_session() as session:
+        if SEED_SKIP_UNCHANGED and await get_app_state(session, SEED_CHECKSUM_KEY) == checksum:
+            logger.info("Seed resources unchanged, skipping initial data load.")
+            return
+        await seed_model_from_json(session, models_path, SEED_UPDATE_EXISTING)
+        await seed_workflow_from_json(session, workflows_path, SEED_UPDATE_EXISTING)
+        await seed_plan_from_json(session, plans_path, SEED_UPDATE_EXISTING)
+        await set_app_state(session, SEED_CHECKSUM_KEY, checksum)
+        await session.commit()
+        logger.info("Initial data loaded successfully.")
 
 async def initial_data():
     """
     Initialize the database with initial data.
     """
     try:
-        async with get_db_session() as session:
-            await seed_model_from_json(session, RESOURCE_POSTGRES_PATH + MODELS_JSON_PATH)
-            await seed_workflow_from_json(session, RESOURCE_POSTGRES_PATH + WORKFLOWS_JSON_PATH)
-            await seed_plan_from_json(session, RESOURCE_POSTGRES_PATH + PLANS_JSON_PATH)
-            await session.commit()
-            logger.info("Initial data loaded successfully.")
+        await seed_resources()
     except Exception as e:
         logger.error(f"Error loading initial data: {e}")
         raise e
@@ -25,4 +51,9 @@ async def initial_data():
         await sync_users_handler()
     except Exception as e:
         logger.error(f"Error syncing users: {e}")
-        raise e
\ No newline at end of file
+        raise e
+    try:
+        await ensure_image_partitions_handler()
+    except Exception as e:
+        logger.error(f"Error creating image partitions, new images go to the default "
+                     f"partition: {e}")
@@ -0,0 +1,154 @@
+import asyncio
+import itertools
+import time
+from collections.abc import AsyncIterator, Iterator
+from datetime import datetime, timedelta, timezone
+from typing import Any, Optional
+
+from core.config_core import Config
+from core.db_core import dispose_engines, get_db_session
+from core.logging_core import setup_logger
+from core.metric_core import InfluxDBWriter
+from core.minio_core import (
+    default_bucket_name,
+    iter_objects_in_bucket,
+    remove_objects_from_bucket,
+)
+from service.image_service import stream_referenced_object_names
+
+logger = setup_logger(__name__)
+config_instance = Config()
+metric = InfluxDBWriter()
+
+BUCKET_NAME = default_bucket_name
+LIST_BATCH_SIZE = 1000
+GRACE_PERIOD = timedelta(
+    hours=config_instance.getint("StorageReconciliation", "grace_hours", default=24)
+)
+DRY_RUN = config_instance.getboolean("StorageReconciliation", "dry_run", default=True)
+DELETE_BATCH_SIZE = config_instance.getint(
+    "StorageReconciliation", "delete_batch_size", default=100
+)
+MAX_DELETES_PER_SECOND = config_instance.getint(
+    "StorageReconciliation", "max_deletes_per_second", default=50
+)
+
+
+def _next_batch(iterator: Iterator, size: int) -> list:
+    return list(itertools.islice(iterator, size))
+
+
+async def _iter_bucket_objects(bucket_name: str) -> AsyncIterator:
+    """Iterate over the bucket listing, fetching pages in a worker thread."""
+    iterator = iter_objects_in_bucket(bucket_name)
+    while True:
+        batch = await asyncio.to_thread(_next_batch, iterator, LIST_BATCH_SIZE)
+        if not batch:
+            return
+        for bucket_object in batch:
+            yield bucket_object
+
+
+async def _next_or_none(iterator: AsyncIterator[str]) -> Optional[str]:
+    try:
+        return await iterator.__anext__()
+    except StopAsyncIteration:
+        return None
+
+
+async def _remove_orphans(bucket_name: str, object_names: list[str], report: dict) -> None:
+    """Remove a batch of orphans, then sleep long enough to honour the deletion rate."""
+    started_at = time.monotonic()
+    errors = await asyncio.to_thread(remove_objects_from_bucket, bucket_name, object_names)
+    report["removed_objects"] += len(object_names) - len(errors)
+    report["failed_objects"] += len(errors)
+    if MAX_DELETES_PER_SECOND > 0:
+        delay = len(object_names) / MAX_DELETES_PER_SECOND - (time.monotonic() - started_at)
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+
+async def reconcile_storage_handler(
+    bucket_name: str = BUCKET_NAME, dry_run: Optional[bool] = None
+) -> dict[str, Any]:
+    """
+    Find (and optionally remove) bucket objects that no database row references.
+
+    The bucket listing and the referenced object names are both streamed in byte order
+    and merge-joined, so memory use does not grow with the size of the bucket. Objects
+    younger than the grace period are never reported, which protects uploads whose
+    database row has not been committed yet.
+
+    Args:
+        bucket_name (str): Bucket to reconcile.
+        dry_run (Optional[bool]): Only report orphans. Defaults to the configured value.
+
+    Returns:
+        dict[str, Any]: A report with the scan and removal counters.
+    """
+    dry_run = DRY_RUN if dry_run is None else dry_run
+    cutoff = datetime.now(timezone.utc) - GRACE_PERIOD
+    report: dict[str, Any] = {
+        "bucket": bucket_name,
+        "dry_run": dry_run,
+        "scanned_objects": 0,
+        "referenced_objects": 0,
+        "recent_objects": 0,
+        "orphan_objects": 0,
+        "orphan_bytes": 0,
+        "removed_objects": 0,
+        "failed_objects": 0,
+    }
+    logger.info("Starting storage reconciliation for bucket %s (dry run: %s).",
+                bucket_name, dry_run)
+    pending: list[str] = []
+
+    async with get_db_session() as session:
+        referenced = stream_referenced_object_names(session, bucket_name)
+        current = await _next_or_none(referenced)
+        async for bucket_object in _iter_bucket_objects(bucket_name):
+            if bucket_object.is_dir:
+                continue
+            object_name = bucket_object.object_name
+            report["scanned_objects"] += 1
+            while current is not None and current < object_name:
+                current = await _next_or_none(referenced)
+            if current == object_name:
+                report["referenced_objects"] += 1
+                continue
+            if bucket_object.last_modified and bucket_object.last_modified > cutoff:
+                report["recent_objects"] += 1
+                continue
+
+            report["orphan_objects"] += 1
+            report["orphan_bytes"] += bucket_object.size or 0
+            logger.debug("Orphan object found: %s/%s", bucket_name, object_name)
+            if dry_run:
+                continue
+            pending.append(object_name)
+            if len(pending) >= DELETE_BATCH_SIZE:
+                await _remove_orphans(bucket_name, pending, report)
+                pending = []
+
+    if pending:
+        await _remove_orphans(bucket_name, pending, report)
+
+    logger.info("Storage reconciliation finished: %s", report)
+    metric.write_metric(
+        measurement="storage_reconciliation",
+        tags={"bucket": bucket_name, "dry_run": str(dry_run).lower()},
+        fields={key: value for key, value in report.items() if isinstance(value, int)
+                and not isinstance(value, bool)},
+    )
+    return report
+
+
+async def reconcile_storage_job() -> dict[str, Any]:
+    """
+    Entry point for the scheduled job: runs the reconciliation in a fresh event loop and
+    releases the pooled connections bound to it afterwards.
+    """
+    try:
+        return await reconcile_storage_handler()
+    finally:
+        await dispose_engines()
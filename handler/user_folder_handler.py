@@ -1,11 +1,20 @@
+import asyncio
+import os
 import uuid
-from typing import Optional
+from collections import deque
+from collections.abc import AsyncIterator
+from typing import Any, Optional
 
 from fastapi import HTTPException, status
+from minio.error import S3Error
 
-from core.db_core import get_db_session
+from core.config_core import Config
+from core.db_core import get_db_session, get_read_db_session
 from core.logging_core import setup_logger
+from core.minio_core import get_object_bytes_from_bucket, split_object_url
+from model.image_model import Image
 from model.user_folder_model import UserFolder
+from service.image_service import get_all_images_by_user_id_and_folder_id
 from service.user_folder_service import (
     create_user_folder,
     delete_user_folder,
@@ -13,8 +22,13 @@ from service.user_folder_service import (
     get_user_folder_by_name,
     get_user_folders,
 )
+from utils.zip_util import ZipStreamWriter
 
 logger = setup_logger(__name__)
+config_instance = Config()
+EXPORT_PREFETCH_CONCURRENCY = max(
+    config_instance.getint("Minio", "export_prefetch_concurrency", default=4), 1
+)
 
 async def create_user_folder_handler(
     user_id: uuid.UUID,
@@ -56,7 +70,7 @@ async def get_user_folder_handler(
     Handler to get a user folder by its ID.
     """
     try:
-        async with get_db_session() as session:
+        async with get_read_db_session() as session:
             user_folder = await get_user_folder(
                 session=session,
                 user_id=user_id,
@@ -71,12 +85,12 @@ async def get_user_folder_handler(
 
 async def get_user_folders_handler(
     user_id: uuid.UUID
-) -> list[UserFolder]:
+) -> list[dict[str, Any]]:
     """
     Handler to get all user folders.
     """
     try:
-        async with get_db_session() as session:
+        async with get_read_db_session() as session:
             user_folders = await get_user_folders(
                 session=session,
                 user_id=user_id
@@ -96,7 +110,7 @@ async def get_user_folder_by_name_handler(
     Handler to get a user folder by its name.
     """
     try:
-        async with get_db_session() as session:
+        async with get_read_db_session() as session:
             user_folder = await get_user_folder_by_name(
                 session=session,
                 user_id=user_id,
@@ -130,4 +144,72 @@ async def delete_user_folder_handler(
         logger.error(f"Error deleting user folder: {e}")
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="Internal Server Error") from e
\ No newline at end of file
+            detail="Internal Server Error") from e
+
+async def export_user_folder_handler(
+    user_id: uuid.UUID,
+    folder_id: uuid.UUID
+) -> tuple[UserFolder, list[Image]]:
+    """
+    Handler to resolve a user folder and the images to export from it.
+    """
+    try:
+        async with get_read_db_session() as session:
+            user_folder = await get_user_folder(
+                session=session,
+                user_id=user_id,
+                folder_id=folder_id
+            )
+            if user_folder is None:
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND,
+                    detail="Folder not found"
+                )
+            images = await get_all_images_by_user_id_and_folder_id(session, user_id, folder_id)
+            return user_folder, images
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error preparing export for user folder {folder_id}: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Internal Server Error") from e
+
+async def stream_user_folder_zip(images: list[Image]) -> AsyncIterator[bytes]:
+    """
+    Stream a ZIP archive of the given images, fetched from MinIO with bounded prefetching.
+
+    At most ``EXPORT_PREFETCH_CONCURRENCY`` objects are in flight or buffered at any time,
+    so memory usage does not grow with the number of images in the folder.
+    """
+    writer = ZipStreamWriter()
+    pending = deque()
+    remaining = iter(images)
+
+    def schedule_next() -> None:
+        image = next(remaining, None)
+        if image is None:
+            return
+        bucket_name, object_name = split_object_url(image.url)
+        task = asyncio.create_task(
+            asyncio.to_thread(get_object_bytes_from_bucket, bucket_name, object_name)
+        )
+        pending.append((image, object_name, task))
+
+    try:
+        for _ in range(EXPORT_PREFETCH_CONCURRENCY):
+            schedule_next()
+        while pending:
+            image, object_name, task = pending.popleft()
+            try:
+                data = await task
+            except S3Error as e:
+                logger.warning(f"Skipping image {image.id} in folder export: {e}")
+                schedule_next()
+                continue
+            schedule_next()
+            yield writer.add_file(os.path.basename(object_name), data, image.created_at)
+        yield writer.close()
+    finally:
+        for _, _, task in pending:
+            task.cancel()
@@ -1,4 +1,4 @@
-from typing import BinaryIO
+from typing import Any, BinaryIO
 from uuid import UUID
 
 from fastapi import HTTPException, Response, status
@@ -6,30 +6,37 @@ from pydantic import ValidationError
 from pydantic.v1.datetime_parse import parse_datetime
 from sqlmodel.ext.asyncio.session import AsyncSession
 
-from api.plan_api import get_plans
-from core.db_core import get_db_session
-from core.fief_core import FiefHttpClient
+from core.config_core import Config
+from core.db_core import get_db_session, get_read_db_session
+from core.fief_core import FiefAsyncHttpClient
 from core.logging_core import setup_logger
 from core.minio_core import default_bucket_name, upload_bytes_to_bucket
-from handler.plan_handler import get_first_plan_by_price_handler
+from handler.plan_handler import get_all_plans_handler, get_first_plan_by_price_handler
 from handler.user_folder_handler import create_user_folder_handler
 from model.enum.fief_type_webhook import FiefTypeWebhook
 from model.plan_model import Plan
 from model.user_model import User
+from service.app_state_service import get_app_state, set_app_state
 from service.user_service import (
     create_user,
+    create_users_with_folder,
     delete_user,
     get_all_users,
+    get_existing_user_ids,
     get_user_by_id,
     update_user,
     user_update_profile_image_url,
 )
+from service.user_usage_service import get_user_usage
 
 logger = setup_logger(__name__)
 
 MISSING_USER_ID_ERROR = "Webhook payload missing user ID in 'data'."
 BUCKET_NAME = default_bucket_name
 PROFILE_IMAGE_SIZE = 512 * 1024  # 512 KB
+DEFAULT_FOLDER_NAME = "Default"
+USERS_SYNC_WATERMARK_KEY = "fief_users_sync_watermark"
+USERS_SYNC_PAGE_SIZE = Config().getint("Fief", "sync_page_size", default=100)
 
 
 async def get_user_by_id_handler(user_id: UUID) -> User:
@@ -37,7 +44,7 @@ async def get_user_by_id_handler(user_id: UUID) -> User:
     Handler to retrieve a user by their ID.
     """
     try:
-        async with get_db_session() as session:
+        async with get_read_db_session() as session:
             user = await get_user_by_id(session, user_id)
             if not user:
                 raise HTTPException(
@@ -52,6 +59,26 @@ async def get_user_by_id_handler(user_id: UUID) -> User:
             detail="Internal server error retrieving user.",
         ) from e
 
+async def get_user_usage_handler(user_id: UUID) -> dict[str, Any]:
+    """
+    Handler to retrieve the usage counters of a user, per folder and in total.
+    """
+    try:
+        async with get_read_db_session() as session:
+            folders = await get_user_usage(session, user_id)
+    except Exception as e:
+        logger.exception(f"Error retrieving usage for user {user_id}: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Internal server error retrieving user usage.",
+        ) from e
+    return {
+        "image_count": sum(folder.image_count for folder in folders),
+        "total_bytes": sum(folder.total_bytes for folder in folders),
+        "gpu_seconds": sum(folder.gpu_seconds for folder in folders),
+        "folders": folders,
+    }
+
 async def user_update_profile_image_url_handler(
         user_id: UUID,
         data: BinaryIO,
@@ -94,12 +121,14 @@ async def create_user_handler(user_data: User) -> User:
                 if user_data.plan_id is None:
                     plan: Plan = await get_first_plan_by_price_handler()
                     user_data.plan_id = plan.id
-                elif user_data.plan_id not in [plan.id for plan in await get_plans()]:
+                elif user_data.plan_id not in {
+                    plan["id"] for plan in await get_all_plans_handler()
+                }:
                     raise ValueError("Invalid plan ID.")
                 user = await create_user(session, user_data)
                 await create_user_folder_handler(
                     user_id=user.id,
-                    name="Default",
+                    name=DEFAULT_FOLDER_NAME,
                 )
                 return user
             except Exception as e:
@@ -227,22 +256,67 @@ def construct_user_model_data(user: dict) -> User:
     )
 
 
-async def sync_users_handler() -> None:
-    try:
-        fief_client = FiefHttpClient()
-        users = fief_client.get_all_users()
-        all_local_users = await get_all_users_handler()
-        local_user_ids = {str(existing_user.id) for existing_user in all_local_users} \
-            if all_local_users else set()
-
-        for user in users["results"]:
-            user_external_id = user.get("id")
-            if not user_external_id:
-                raise ValueError(MISSING_USER_ID_ERROR)
-            if user_external_id in local_user_ids:
+async def _create_missing_users(users: list[dict], plan_id: UUID) -> int:
+    """Insert the users of a page that do not exist locally yet, with their default folder."""
+    user_ids = []
+    for user in users:
+        if not user.get("id"):
+            raise ValueError(MISSING_USER_ID_ERROR)
+        user_ids.append(UUID(user["id"]))
+    async with get_db_session() as session:
+        existing_ids = await get_existing_user_ids(session, user_ids)
+        new_users = []
+        for user in users:
+            if UUID(user["id"]) in existing_ids:
                 continue
             user_data = construct_user_model_data(user)
-            await create_user_handler(user_data)
+            user_data.plan_id = plan_id
+            new_users.append(user_data)
+        created_ids = await create_users_with_folder(session, new_users, DEFAULT_FOLDER_NAME)
+    return len(created_ids)
+
+
+async def sync_users_handler() -> None:
+    """
+    Create the Fief users missing from the local database.
+
+    Users are listed newest update first, page by page. The most recent ``updated_at``
+    seen is stored as a watermark, and the next sync stops as soon as it reaches users
+    that were not updated since then.
+    """
+    try:
+        async with get_db_session() as session:
+            watermark_value = await get_app_state(session, USERS_SYNC_WATERMARK_KEY)
+        watermark = parse_datetime(watermark_value) if watermark_value else None
+        plan = await get_first_plan_by_price_handler()
+        if plan is None:
+            raise ValueError("No default plan available for new users.")
+
+        fief_client = FiefAsyncHttpClient(page_size=USERS_SYNC_PAGE_SIZE)
+        newest = watermark
+        scanned = created = 0
+        async for page in fief_client.iter_user_pages(ordering="-updated_at"):
+            pending = []
+            reached_watermark = False
+            for user in page:
+                updated_at = parse_datetime(user.get("updated_at") or user.get("created_at"))
+                if watermark is not None and updated_at <= watermark:
+                    reached_watermark = True
+                    break
+                if newest is None or updated_at > newest:
+                    newest = updated_at
+                pending.append(user)
+            scanned += len(pending)
+            if pending:
+                created += await _create_missing_users(pending, plan.id)
+            if reached_watermark:
+                break
+
+        if newest is not None and newest != watermark:
+            async with get_db_session() as session:
+                await set_app_state(session, USERS_SYNC_WATERMARK_KEY, newest.isoformat())
+                await session.commit()
+        logger.info("User sync finished: %d user(s) scanned, %d created.", scanned, created)
     except Exception as e:
         logger.error(f"An error occurred while syncing users: {str(e)}")
         raise
@@ -6,9 +6,10 @@ from uuid import UUID
 from fastapi import WebSocket, WebSocketDisconnect
 from PIL import Image
 
-from api.auth_api import base_fief
 from core.comfy.comfy_core import get_preview_queue, get_queue
+from core.comfy.config import queue_snapshot_seconds
 from core.logging_core import setup_logger
+from handler.auth_handler import fief
 
 logger = setup_logger(__name__)
 
@@ -17,7 +18,7 @@ async def queue_status_updater(websocket: WebSocket, user_id: Optional[UUID] = N
     last_queue = None
     try:
         while True:
-            queue = await get_queue(user_id)
+            queue = await get_queue(user_id, max_age=queue_snapshot_seconds)
             if queue != last_queue:
                 await websocket.send_json({"status": "success", "data": queue})
                 last_queue = queue
@@ -55,7 +56,7 @@ async def user_access_token(websocket: WebSocket):
         await websocket.close(code=4000)
         return None
     try:
-        access_token_info = base_fief.validate_access_token(access_token_info)
+        access_token_info = await fief.validate_access_token(access_token_info)
     except Exception:
         await websocket.close(code=4000)
         return None
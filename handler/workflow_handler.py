@@ -5,8 +5,10 @@ from uuid import UUID
 
 from fastapi import HTTPException, status
 
-from core.db_core import get_db_session
+from core.catalog_cache_core import CatalogSnapshot, catalog_cache
+from core.db_core import get_db_session, get_read_db_session
 from core.logging_core import setup_logger
+from core.tracing_core import start_span, traced
 from handler.model_handler import get_model_by_id_handler
 from model.map.model_parameter_mapping import (
     ParameterDetailEnum,
@@ -25,6 +27,13 @@ from service.workflow_service import (
 
 logger = setup_logger(__name__)
 
+WORKFLOWS_CATALOG = "workflows"
+WORKFLOWS_SIMPLIFIED_CATALOG = "workflows_simplified"
+
+def _invalidate_workflow_catalogs() -> None:
+    catalog_cache.invalidate(WORKFLOWS_CATALOG)
+    catalog_cache.invalidate(WORKFLOWS_SIMPLIFIED_CATALOG)
+
 def preprocess_workflow_params(workflow_params):
     workflow_defaults = {p["name"]: p.get("default") for p in workflow_params}
     allowed_params = set(workflow_defaults.keys())
@@ -119,6 +128,7 @@ async def replace_placeholders(obj, workflow_params, params, plan_id, workflow_m
     replacer = create_placeholder_replacer(params, workflow_defaults)
     return await process_object(obj, replacer)
 
+@traced("workflow.load_and_populate")
 async def load_and_populate_workflow(
     workflow_id: UUID,
     params: dict[str, Any],
@@ -127,21 +137,23 @@ async def load_and_populate_workflow(
     """
     Load a workflow from the database and populate it with parameters.
     """
-    async with get_db_session() as session:
-        workflow = await get_workflow_by_id(session, workflow_id)
+    with start_span("workflow.load", **{"workflow.id": str(workflow_id)}):
+        async with get_read_db_session() as session:
+            workflow = await get_workflow_by_id(session, workflow_id)
     if not workflow:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Workflow with ID {workflow_id} not found.",
         )
 
-    populated_workflow_dict = await replace_placeholders(
-        obj=workflow.workflow_json,
-        workflow_params = workflow.parameters,
-        params=params,
-        plan_id=plan_id,
-        workflow_model_type=workflow.model_type.value
-    )
+    with start_span("workflow.populate"):
+        populated_workflow_dict = await replace_placeholders(
+            obj=workflow.workflow_json,
+            workflow_params = workflow.parameters,
+            params=params,
+            plan_id=plan_id,
+            workflow_model_type=workflow.model_type.value
+        )
 
     output_params = [
         param
@@ -160,6 +172,7 @@ async def create_workflow_handler(
     """
     async with get_db_session() as session:
         workflow = await create_workflow(session, workflow_data)
+    _invalidate_workflow_catalogs()
     return workflow
 
 async def update_workflow_handler(
@@ -171,6 +184,7 @@ async def update_workflow_handler(
     """
     async with get_db_session() as session:
         workflow = await update_workflow(session, workflow_id, workflow_data)
+    _invalidate_workflow_catalogs()
     return workflow
 
 async def delete_workflow_handler(
@@ -181,29 +195,44 @@ async def delete_workflow_handler(
     """
     async with get_db_session() as session:
         await delete_workflow(session, workflow_id)
+    _invalidate_workflow_catalogs()
 
-async def get_all_workflows_handler() -> list[Workflow]:
+async def get_all_workflows_handler() -> list[dict[str, Any]]:
     """
     Get all workflows.
     """
-    async with get_db_session() as session:
+    async with get_read_db_session() as session:
         workflows = await get_all_workflows(session)
     return workflows
 
-async def get_all_workflows_simplified_handler() -> list[Workflow]:
+async def get_all_workflows_simplified_handler() -> list[dict[str, Any]]:
     """
     Get all workflows with simplified details.
     """
-    async with get_db_session() as session:
+    async with get_read_db_session() as session:
         workflows = await get_all_workflows_simplified(session)
     return workflows
 
+async def get_workflows_snapshot_handler() -> CatalogSnapshot:
+    """
+    Get the serialized workflow listing, served from the catalog cache.
+    """
+    return await catalog_cache.get(WORKFLOWS_CATALOG, get_all_workflows_handler)
+
+async def get_workflows_simplified_snapshot_handler() -> CatalogSnapshot:
+    """
+    Get the serialized simplified workflow listing, served from the catalog cache.
+    """
+    return await catalog_cache.get(
+        WORKFLOWS_SIMPLIFIED_CATALOG, get_all_workflows_simplified_handler
+    )
+
 async def get_workflow_by_id_handler(
     workflow_id: UUID,
 ) -> Optional[Workflow]:
     """
     Get a workflow by ID.
     """
-    async with get_db_session() as session:
+    async with get_read_db_session() as session:
         workflow = await get_workflow_by_id(session, workflow_id)
     return workflow
\ No newline at end of file
@@ -1,13 +1,17 @@
+import asyncio
+import contextlib
 import subprocess  # nosec B404
 import sys
 from contextlib import asynccontextmanager
 
 from dotenv import load_dotenv
 from fastapi import FastAPI
+from fastapi.responses import ORJSONResponse
 from starlette.middleware.cors import CORSMiddleware
 
 from api.auth_api import router as auth_router
 from api.image_api import router as image_router
+from api.metrics_api import router as metrics_router
 from api.model_api import router as model_router
 from api.plan_api import router as plan_router
 from api.scalar_docs_api import router as scalar_docs_router
@@ -17,10 +21,21 @@ from api.user_image_api import router as user_image_router
 from api.webhook_api import router as webhook_router
 from api.websocket_api import router as websocket_router
 from api.workflow_api import router as workflow_router
+from core.comfy.queue_monitor import QUEUE_MONITOR_ENABLED, monitor_queue
+from core.compression_core import COMPRESSION_ENABLED, CompressionMiddleware
 from core.config_core import Config
-from core.db_core import create_db
+from core.db_core import create_db, dispose_engines, report_pool_metrics
+from core.http_metrics_core import (
+    HTTP_METRICS_ENABLED,
+    HttpMetricsMiddleware,
+    report_http_metrics,
+)
 from core.logging_core import cleanup_old_logs, setup_logger
 from core.minio_core import create_default_bucket
+from core.prometheus_core import PROMETHEUS_ENABLED
+from core.prometheus_core import registry as metrics_registry
+from core.rate_limit_core import RATE_LIMIT_ENABLED, RateLimitMiddleware
+from handler.rate_limit_handler import resolve_rate_limit_subject
 from handler.start_data_handler import initial_data
 from resources.openapi_tags_metadata import tags_metadata
 
@@ -78,12 +93,17 @@ def _setup_minio_bucket():
 async def lifespan(app: FastAPI):
     await create_db()
     await initial_data()
+    pool_metrics_task = asyncio.create_task(report_pool_metrics())
+    http_metrics_task = asyncio.create_task(report_http_metrics()) if HTTP_METRICS_ENABLED else None
+    queue_monitor_task = asyncio.create_task(monitor_queue()) if QUEUE_MONITOR_ENABLED else None
     global worker_process, beat_process
     logger.info("Starting worker and beat processes...")
     try:
         _cleanup_logs()
     except Exception as e:
         logger.error("Failed to run initial log cleanup: %s", e, exc_info=True)
+    if PROMETHEUS_ENABLED:
+        metrics_registry.clear_multiprocess_dir()
     try:
         worker_process, beat_process = _start_subprocesses()
     except Exception as e:
@@ -92,8 +112,17 @@ async def lifespan(app: FastAPI):
     yield
     _stop_subprocess(worker_process, "worker")
     _stop_subprocess(beat_process, "beat")
+    for task in (pool_metrics_task, http_metrics_task, queue_monitor_task):
+        if task is None:
+            continue
+        task.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await task
+    await dispose_engines()
 
-app = FastAPI(lifespan=lifespan, openapi_tags=tags_metadata)
+app = FastAPI(
+    lifespan=lifespan, openapi_tags=tags_metadata, default_response_class=ORJSONResponse
+)
 app.include_router(auth_router)
 app.include_router(user_router)
 app.include_router(user_folder_router)
@@ -105,6 +134,11 @@ app.include_router(model_router)
 app.include_router(plan_router)
 app.include_router(websocket_router)
 app.include_router(scalar_docs_router)
+if PROMETHEUS_ENABLED:
+    app.include_router(metrics_router)
+
+if RATE_LIMIT_ENABLED:
+    app.add_middleware(RateLimitMiddleware, resolver=resolve_rate_limit_subject)
 
 app.add_middleware(
     CORSMiddleware,
@@ -112,4 +146,10 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],  # Allow all HTTP methods
     allow_headers=["*"],  # Allow all headers
-)
\ No newline at end of file
+)
+
+if COMPRESSION_ENABLED:
+    app.add_middleware(CompressionMiddleware)
+
+if HTTP_METRICS_ENABLED:
+    app.add_middleware(HttpMetricsMiddleware)
\ No newline at end of file
@@ -0,0 +1,17 @@
+from datetime import datetime, timezone
+from typing import Optional
+
+from sqlalchemy import DateTime
+from sqlmodel import Column, Field, SQLModel
+
+
+class AppState(SQLModel, table=True):
+    """Key/value store for small pieces of application state (checksums, watermarks)."""
+    __tablename__: str = "app_state"
+
+    name: str = Field(primary_key=True)
+    value: Optional[str] = Field(default=None)
+    updated_at: datetime = Field(
+        default_factory=lambda: datetime.now(timezone.utc),
+        sa_column=Column(DateTime(timezone=True), nullable=False)
+    )
@@ -2,24 +2,63 @@ from datetime import datetime, timezone
 from typing import Optional
 from uuid import UUID, uuid4
 
-from sqlalchemy import DateTime
-from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy import BigInteger, Computed, DateTime, Index, text
+from sqlalchemy.dialects.postgresql import JSONB, TSVECTOR
 from sqlmodel import Column, Field, SQLModel
 
 
 class Image(SQLModel, table=True):
     __tablename__: str = "images"
+    __table_args__ = (
+        Index(
+            "ix_images_user_id_folder_created_at",
+            "user_id", "user_folder_id", text("created_at DESC"), text("id DESC"),
+        ),
+        Index("ix_images_user_id_created_at", "user_id", text("created_at DESC"), text("id DESC")),
+        {"postgresql_partition_by": "RANGE (created_at)"},
+    )
     id: UUID = Field(default_factory=uuid4, primary_key=True)
     url: str = Field(index=True, nullable=False)
     workflow_id: UUID = Field(foreign_key="workflows.id", nullable=False)
     user_id: UUID = Field(foreign_key="users.id", nullable=False)
     user_folder_id: UUID = Field(foreign_key="users_folders.id", nullable=False)
     parameters: Optional[dict] = Field(default=None, sa_column=Column(JSONB))
+    size_bytes: Optional[int] = Field(default=None, sa_column=Column(BigInteger))
+    # Part of the primary key because the table is range-partitioned by month on it.
     created_at: datetime = Field(
         default_factory=lambda: datetime.now(timezone.utc),
-        sa_column=Column(DateTime(timezone=True))
+        sa_column=Column(DateTime(timezone=True), primary_key=True, nullable=False)
     )
     updated_at: datetime = Field(
         default_factory=lambda: datetime.now(timezone.utc),
         sa_column=Column(DateTime(timezone=True))
-    )
\ No newline at end of file
+    )
+
+# Full-text search over the prompts. The column is generated by PostgreSQL and left
+# unmapped, so inserts never send it; queries reach it through ``Image.__table__.c``.
+SEARCH_TEXT_CONFIG = "simple"
+SEARCH_VECTOR_EXPRESSION = (
+    f"to_tsvector('{SEARCH_TEXT_CONFIG}', "
+    "coalesce(parameters->>'POSITIVE_PROMPT', '') || ' ' || "
+    "coalesce(parameters->>'NEGATIVE_PROMPT', ''))"
+)
+Image.__table__.append_column(
+    Column("search_vector", TSVECTOR, Computed(SEARCH_VECTOR_EXPRESSION, persisted=True))
+)
+Index("ix_images_search_vector", Image.__table__.c.search_vector, postgresql_using="gin")
+Index(
+    "ix_images_parameters",
+    Image.__table__.c.parameters,
+    postgresql_using="gin",
+    postgresql_ops={"parameters": "jsonb_path_ops"},
+)
+Image.__table__.info["upgrade_ddl"] = [
+    "ALTER TABLE images ADD COLUMN IF NOT EXISTS size_bytes BIGINT",
+    "ALTER TABLE images ADD COLUMN IF NOT EXISTS search_vector tsvector "
+    f"GENERATED ALWAYS AS ({SEARCH_VECTOR_EXPRESSION}) STORED",
+]
+# Monthly partitions are created ahead of time by the partition maintenance job; the
+# default partition only catches rows outside of them.
+Image.__table__.info["on_create_sql"] = [
+    "CREATE TABLE IF NOT EXISTS images_default PARTITION OF images DEFAULT",
+]
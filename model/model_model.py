@@ -13,7 +13,7 @@ from model.map.model_parameter_mapping import ParameterDetail
 
 class ModelBase(SQLModel):
     """Base model with common model fields."""
-    name: str = Field(index=True, nullable=False)
+    name: str = Field(index=True, unique=True, nullable=False)
     description: Optional[str] = Field(default=None, nullable=True)
     os_path: str = Field(index=True, nullable=False)
     model: ModelType = Field(sa_column=Column("model", SqlEnum(ModelType)))
@@ -42,6 +42,16 @@ class Model(ModelBase, table=True):
         sa_column=Column(DateTime(timezone=True))
     )
 
+class ModelSummary(SQLModel):
+    """Model list item, without the server-side ``os_path``."""
+    id: UUID
+    name: str
+    description: Optional[str] = None
+    model: ModelType
+    parameters: list[ParameterDetail]
+    created_at: datetime
+    updated_at: datetime
+
 class ModelCreate(ModelBase):
     pass
 
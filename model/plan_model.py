@@ -9,6 +9,7 @@ from sqlmodel import Field, SQLModel
 from model.map.model_parameter_mapping import ParameterDetail
 from model.map.segment_parameter_mapping import WorkflowSegment
 from model.map.type_parameter_mapping import WorkflowType
+from utils.rate_util import parse_rate
 
 
 class PlanBase(SQLModel):
@@ -16,6 +17,18 @@ class PlanBase(SQLModel):
     description: str = Field(default=None)
     price: float = Field(default=0.0)
     is_active: bool = Field(default=True)
+    retention_days: Optional[int] = Field(default=None)
+    rate_limits: Optional[dict[str, str]] = Field(default=None, sa_column=Column(JSON))
+
+    @field_validator("rate_limits")
+    def validate_rate_limits(cls, v):
+        # Invalid rates would otherwise be stored and silently ignored by the limiter
+        for route_class, rate in (v or {}).items():
+            try:
+                parse_rate(rate)
+            except ValueError as e:
+                raise ValueError(f"Invalid rate for route class '{route_class}': {e}") from e
+        return v
 
 class PlanParameters(PlanBase):
     parameters: list[ParameterDetail] = Field(
@@ -66,6 +79,26 @@ class Plan(PlanParameters, table=True):
         default_factory=lambda: datetime.now(timezone.utc),
     )
 
+# Days an image of the plan is kept; NULL keeps images forever. Rate limits map a
+# route class to a rate such as "10/minute"; missing classes use [RateLimit] rates.
+Plan.__table__.info["upgrade_ddl"] = [
+    "ALTER TABLE plans ADD COLUMN IF NOT EXISTS retention_days INTEGER",
+    "ALTER TABLE plans ADD COLUMN IF NOT EXISTS rate_limits JSON",
+]
+
+class PlanSummary(SQLModel):
+    """Plan list item, without timestamps."""
+    id: UUID
+    name: str
+    description: Optional[str] = None
+    price: float
+    is_active: bool
+    retention_days: Optional[int] = None
+    rate_limits: Optional[dict[str, str]] = None
+    parameters: list[ParameterDetail]
+    type_parameters: WorkflowType
+    segment_parameters: WorkflowSegment
+
 class PlanCreate(PlanParameters):
     """
     PlanCreate model for creating a new plan.
@@ -80,6 +113,8 @@ class PlanUpdate(PlanParameters):
     description: Optional[str] = None
     price: Optional[float] = None
     is_active: Optional[bool] = None
+    retention_days: Optional[int] = None
+    rate_limits: Optional[dict[str, str]] = None
     parameters: Optional[ParameterDetail] = None
     type_parameters: Optional[WorkflowType] = None
     segment_parameters: Optional[WorkflowSegment] = None
\ No newline at end of file
@@ -17,4 +17,10 @@ class UserFolder(SQLModel, table=True):
     updated_at: datetime = Field(
         default_factory=lambda: datetime.now(timezone.utc),
         sa_column=Column(DateTime(timezone=True))
-    )
\ No newline at end of file
+    )
+
+class UserFolderSummary(SQLModel):
+    """Folder list item; the owner is implied by the request."""
+    id: UUID
+    name: str
+    created_at: datetime
@@ -0,0 +1,32 @@
+from datetime import datetime, timezone
+from typing import Optional
+from uuid import UUID
+
+from sqlalchemy import BigInteger, DateTime
+from sqlmodel import Column, Field, SQLModel
+
+
+class UserUsage(SQLModel, table=True):
+    """Running totals of a user's stored images and compute time, per folder."""
+    __tablename__: str = "user_usage"
+
+    user_id: UUID = Field(foreign_key="users.id", primary_key=True, ondelete="CASCADE")
+    user_folder_id: UUID = Field(
+        foreign_key="users_folders.id", primary_key=True, ondelete="CASCADE"
+    )
+    plan_id: Optional[UUID] = Field(default=None, foreign_key="plans.id", ondelete="SET NULL")
+    image_count: int = Field(default=0, nullable=False)
+    total_bytes: int = Field(default=0, sa_column=Column(BigInteger, nullable=False))
+    gpu_seconds: float = Field(default=0.0, nullable=False)
+    updated_at: datetime = Field(
+        default_factory=lambda: datetime.now(timezone.utc),
+        sa_column=Column(DateTime(timezone=True), nullable=False)
+    )
+
+
+UserUsage.__table__.info["on_create_sql"] = [
+    "INSERT INTO user_usage (user_id, user_folder_id, image_count, total_bytes, "
+    "gpu_seconds, updated_at) "
+    "SELECT user_id, user_folder_id, count(*), coalesce(sum(size_bytes), 0), 0, now() "
+    "FROM images GROUP BY user_id, user_folder_id",
+]
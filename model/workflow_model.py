@@ -17,7 +17,7 @@ from model.map.model_parameter_mapping import ParameterDetail
 
 class WorkflowBase(SQLModel):
     """Base model with common workflow fields."""
-    name: str = Field(index=True, nullable=False)
+    name: str = Field(index=True, unique=True, nullable=False)
     description: Optional[str] = Field(default=None, nullable=True)
     model_type: Model = Field(sa_column=Column("model", SqlEnum(Model)))
     model_id: Optional[UUID] = Field(default=None, foreign_key="models.id")
@@ -50,6 +50,28 @@ class Workflow(WorkflowBase, table=True):
         sa_column=Column(DateTime(timezone=True))
     )
 
+class WorkflowSummary(SQLModel):
+    """Workflow list item: every field except the ComfyUI ``workflow_json`` graph."""
+    id: UUID
+    name: str
+    description: Optional[str] = None
+    model_type: Model
+    model_id: Optional[UUID] = None
+    workflow_type: WorkflowType
+    workflow_segment: WorkflowSegment
+    parameters: list[ParameterDetail]
+    created_at: datetime
+    updated_at: datetime
+
+class WorkflowSimplified(SQLModel):
+    """Minimal workflow list item, for pickers."""
+    id: UUID
+    name: str
+    description: Optional[str] = None
+    model_type: Model
+    model_id: Optional[UUID] = None
+    created_at: datetime
+
 class WorkflowCreate(WorkflowBase):
     pass
 
@@ -0,0 +1,32 @@
+from datetime import datetime, timezone
+from typing import Optional
+
+from sqlalchemy.dialects.postgresql import insert
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from core.logging_core import setup_logger
+from model.app_state_model import AppState
+
+logger = setup_logger(__name__)
+
+
+async def get_app_state(session: AsyncSession, name: str) -> Optional[str]:
+    """Returns the stored value for a state key, or None if it was never set."""
+    result = await session.exec(select(AppState.value).where(AppState.name == name))
+    return result.first()
+
+
+async def set_app_state(session: AsyncSession, name: str, value: Optional[str]) -> None:
+    """
+    Inserts or replaces the value of a state key. The caller is responsible for committing,
+    so the value can be written in the same transaction as the data it describes.
+    """
+    now = datetime.now(timezone.utc)
+    statement = insert(AppState).values(name=name, value=value, updated_at=now)
+    statement = statement.on_conflict_do_update(
+        index_elements=[AppState.name],
+        set_={"value": statement.excluded.value, "updated_at": statement.excluded.updated_at},
+    )
+    await session.execute(statement)
+    logger.debug("App state '%s' updated.", name)
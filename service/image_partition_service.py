@@ -0,0 +1,172 @@
+import re
+from collections.abc import AsyncIterator
+from datetime import datetime, timezone
+from typing import Optional
+from uuid import UUID
+
+from sqlalchemy import column, func, table, text, tuple_
+from sqlmodel import delete, select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from core.logging_core import setup_logger
+from model.image_model import Image
+from model.plan_model import Plan
+from model.user_model import User
+from service.user_usage_service import decrement_usage, decrement_usage_from
+
+logger = setup_logger(__name__)
+
+PARTITION_NAME_PATTERN = re.compile(r"^images_(\d{4})_(\d{2})$")
+
+
+def month_start(value: datetime) -> datetime:
+    """Returns the first instant (UTC) of the month of ``value``."""
+    value = value.astimezone(timezone.utc)
+    return datetime(value.year, value.month, 1, tzinfo=timezone.utc)
+
+
+def add_months(month: datetime, months: int) -> datetime:
+    """Returns the first instant of the month ``months`` after ``month``."""
+    index = month.year * 12 + month.month - 1 + months
+    return datetime(index // 12, index % 12 + 1, 1, tzinfo=timezone.utc)
+
+
+def image_partition_name(month: datetime) -> str:
+    return f"images_{month.year:04d}_{month.month:02d}"
+
+
+def image_partition_month(name: str) -> Optional[datetime]:
+    """Parses the month covered by a partition name, or None for other tables."""
+    match = PARTITION_NAME_PATTERN.match(name)
+    if not match:
+        return None
+    return datetime(int(match.group(1)), int(match.group(2)), 1, tzinfo=timezone.utc)
+
+
+def _partition_table(name: str):
+    return table(name, column("url"), column("user_id"), column("user_folder_id"),
+                 column("size_bytes"))
+
+
+async def is_images_partitioned(session: AsyncSession) -> bool:
+    """Checks whether the images table was created as a partitioned table."""
+    result = await session.execute(
+        text("SELECT relkind FROM pg_class WHERE oid = to_regclass('images')")
+    )
+    return result.scalar() == "p"
+
+
+async def list_image_partitions(session: AsyncSession) -> dict[str, bool]:
+    """
+    Lists the monthly image tables, mapped to whether they are still attached to
+    ``images``. Detached tables are left over by an interrupted retention run.
+    """
+    result = await session.execute(text(
+        "SELECT c.relname, i.inhrelid IS NOT NULL "
+        "FROM pg_class c "
+        "LEFT JOIN pg_inherits i ON i.inhrelid = c.oid "
+        "WHERE c.relkind = 'r' AND c.relnamespace = current_schema()::regnamespace "
+        "AND c.relname ~ '^images_[0-9]{4}_[0-9]{2}$'"
+    ))
+    return {name: attached for name, attached in result.all()}
+
+
+async def create_image_partition(session: AsyncSession, month: datetime) -> None:
+    """Creates the partition holding the images of ``month``, if it does not exist."""
+    start, end = month_start(month), add_months(month_start(month), 1)
+    await session.execute(text(
+        f"CREATE TABLE IF NOT EXISTS {image_partition_name(start)} PARTITION OF images "
+        f"FOR VALUES FROM ('{start.isoformat()}') TO ('{end.isoformat()}')"
+    ))
+    logger.info("Image partition %s ensured.", image_partition_name(start))
+
+
+async def detach_image_partition(session: AsyncSession, name: str) -> None:
+    """
+    Detaches a partition from ``images`` and subtracts its rows from the usage
+    counters, in the caller's transaction.
+    """
+    if image_partition_month(name) is None:
+        raise ValueError(f"Not an image partition: {name}")
+    await decrement_usage_from(session, _partition_table(name))
+    await session.execute(text(f"ALTER TABLE images DETACH PARTITION {name}"))
+    logger.info("Image partition %s detached.", name)
+
+
+async def stream_partition_urls(
+    session: AsyncSession, name: str, batch_size: int = 1000
+) -> AsyncIterator[str]:
+    """Streams the object URLs stored in a (possibly detached) partition table."""
+    partition = _partition_table(name)
+    statement = select(partition.c.url).execution_options(yield_per=batch_size)
+    result = await session.stream_scalars(statement)
+    async for url in result:
+        yield url
+
+
+async def drop_image_partition(session: AsyncSession, name: str) -> None:
+    if image_partition_month(name) is None:
+        raise ValueError(f"Not an image partition: {name}")
+    await session.execute(text(f"DROP TABLE IF EXISTS {name}"))
+    logger.info("Image partition %s dropped.", name)
+
+
+async def get_longest_retention_days(session: AsyncSession) -> Optional[int]:
+    """
+    Returns the longest retention among the plans of existing users, i.e. the age
+    after which no user keeps an image. None when some user keeps images forever
+    (a plan without retention, or no plan at all).
+    """
+    retention = Plan.retention_days
+    statement = (
+        select(func.max(retention), func.bool_or(retention.is_(None)))
+        .select_from(User)
+        .outerjoin(Plan, Plan.id == User.plan_id)
+    )
+    longest, keeps_forever = (await session.execute(statement)).one()
+    return None if keeps_forever else longest
+
+
+async def get_plan_retentions(session: AsyncSession) -> dict[UUID, int]:
+    """Returns the retention in days of every plan that has one."""
+    result = await session.execute(
+        select(Plan.id, Plan.retention_days).where(Plan.retention_days.is_not(None))
+    )
+    return {plan_id: days for plan_id, days in result.all()}
+
+
+async def delete_expired_images_of_plan(
+    session: AsyncSession, plan_id: UUID, cutoff: datetime, batch_size: int
+) -> list[str]:
+    """
+    Deletes up to ``batch_size`` images older than ``cutoff`` of the users of a plan,
+    updating their usage counters, and commits. Only the partitions older than the
+    cutoff are scanned.
+
+    Returns:
+        list[str]: The URLs of the deleted images.
+    """
+    try:
+        expired = (
+            select(Image.id, Image.created_at)
+            .join(User, User.id == Image.user_id)
+            .where(User.plan_id == plan_id, Image.created_at < cutoff)
+            .limit(batch_size)
+        )
+        result = await session.execute(
+            delete(Image)
+            .where(tuple_(Image.id, Image.created_at).in_(expired))
+            .returning(Image.url, Image.user_id, Image.user_folder_id, Image.size_bytes)
+        )
+        rows = result.all()
+        deleted_by_user: dict[UUID, list[tuple[UUID, Optional[int]]]] = {}
+        for _, user_id, folder_id, size_bytes in rows:
+            deleted_by_user.setdefault(user_id, []).append((folder_id, size_bytes))
+        for user_id, deleted in deleted_by_user.items():
+            await decrement_usage(session, user_id, deleted)
+        await session.commit()
+        return [row[0] for row in rows]
+    except Exception as e:
+        await session.rollback()
+        logger.exception("Error deleting expired images of plan %s: %s", plan_id, e)
+        raise e
@@ -1,13 +1,17 @@
+from collections.abc import AsyncIterator
 from datetime import datetime, timezone
 from typing import Optional
 from uuid import UUID
 
 from fastapi import HTTPException, status
-from sqlmodel import select
+from sqlalchemy import func, insert, literal_column, or_, tuple_, union_all
+from sqlmodel import delete, select
 from sqlmodel.ext.asyncio.session import AsyncSession
 
 from core.logging_core import setup_logger
-from model.image_model import Image
+from model.image_model import SEARCH_TEXT_CONFIG, Image
+from model.user_model import User
+from service.user_usage_service import decrement_usage, increment_usage
 
 logger = setup_logger(__name__)
 
@@ -31,6 +35,50 @@ async def create_image(session: AsyncSession, image_data: Image) -> Image:
             detail="Error creating image",
         ) from e
 
+async def create_images(
+    session: AsyncSession,
+    images: list[Image],
+    plan_id: Optional[UUID] = None,
+    gpu_seconds: float = 0.0,
+) -> list[Image]:
+    """
+    Adds several images with one multi-row INSERT ... RETURNING and a single commit.
+
+    The usage counters of the affected folders are updated in the same transaction;
+    ``gpu_seconds`` is charged once, to the folder of the first image.
+    """
+    if not images:
+        return []
+    try:
+        now = datetime.now(timezone.utc)
+        rows = []
+        usage: dict[tuple[UUID, UUID], list[int]] = {}
+        for image in images:
+            row = image.model_dump()
+            row["created_at"] = row.get("created_at") or now
+            row["updated_at"] = row["created_at"]
+            rows.append(row)
+            totals = usage.setdefault((image.user_id, image.user_folder_id), [0, 0])
+            totals[0] += 1
+            totals[1] += image.size_bytes or 0
+        result = await session.scalars(insert(Image).returning(Image), rows)
+        created = list(result.all())
+        for (user_id, folder_id), (image_count, total_bytes) in usage.items():
+            await increment_usage(
+                session, user_id, folder_id, plan_id, image_count, total_bytes, gpu_seconds
+            )
+            gpu_seconds = 0.0
+        await session.commit()
+        logger.info("%d image(s) created successfully.", len(created))
+        return created
+    except Exception as e:
+        await session.rollback()
+        logger.exception("Error creating %d image(s): %s", len(images), e)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Error creating images",
+        ) from e
+
 async def get_all_images(session: AsyncSession) -> list[Image]:
     """Retrieves all images from the database."""
     try:
@@ -45,10 +93,29 @@ async def get_all_images(session: AsyncSession) -> list[Image]:
             detail="Error retrieving all images",
         ) from e
 
-async def get_all_images_by_user_id(session: AsyncSession, user_id: UUID) -> list[Image]:
-    """Retrieves all images for a specific user from the database."""
+def _paginate(statement, limit: Optional[int], after: Optional[tuple[datetime, UUID]]):
+    """Order newest first on ``(created_at, id)`` and apply the keyset cursor and limit."""
+    if after is not None:
+        statement = statement.where(tuple_(Image.created_at, Image.id) < tuple_(*after))
+    statement = statement.order_by(Image.created_at.desc(), Image.id.desc())
+    if limit is not None:
+        statement = statement.limit(limit)
+    return statement
+
+async def get_all_images_by_user_id(
+    session: AsyncSession,
+    user_id: UUID,
+    limit: Optional[int] = None,
+    after: Optional[tuple[datetime, UUID]] = None,
+) -> list[Image]:
+    """
+    Retrieves the images of a specific user, newest first.
+
+    ``limit`` and ``after`` (the ``(created_at, id)`` of the last image already seen)
+    enable keyset pagination served by the ``(user_id, created_at DESC, id DESC)`` index.
+    """
     try:
-        statement = select(Image).where(Image.user_id == user_id)
+        statement = _paginate(select(Image).where(Image.user_id == user_id), limit, after)
         images = await session.exec(statement)
         images = images.all()
         return images
@@ -60,14 +127,24 @@ async def get_all_images_by_user_id(session: AsyncSession, user_id: UUID) -> lis
         ) from e
 
 async def get_all_images_by_user_id_and_folder_id(
-    session: AsyncSession, user_id: UUID, folder_id: UUID
+    session: AsyncSession,
+    user_id: UUID,
+    folder_id: UUID,
+    limit: Optional[int] = None,
+    after: Optional[tuple[datetime, UUID]] = None,
 ) -> list[Image]:
-    """Retrieves all images for a specific user and folder from the database."""
+    """
+    Retrieves the images of a specific user and folder, newest first.
+
+    Supports the same keyset pagination as ``get_all_images_by_user_id``.
+    """
     try:
-        statement = (
+        statement = _paginate(
             select(Image)
             .where(Image.user_id == user_id)
-            .where(Image.user_folder_id == folder_id)
+            .where(Image.user_folder_id == folder_id),
+            limit,
+            after,
         )
         images = await session.exec(statement)
         images = images.all()
@@ -82,6 +159,58 @@ async def get_all_images_by_user_id_and_folder_id(
 
 
 
+async def search_images(
+    session: AsyncSession,
+    user_id: UUID,
+    text_query: Optional[str] = None,
+    folder_id: Optional[UUID] = None,
+    workflow_id: Optional[UUID] = None,
+    model_id: Optional[UUID] = None,
+    seed: Optional[int] = None,
+    created_from: Optional[datetime] = None,
+    created_to: Optional[datetime] = None,
+    limit: Optional[int] = None,
+    after: Optional[tuple[datetime, UUID]] = None,
+) -> list[Image]:
+    """
+    Searches the images of a user, newest first.
+
+    The prompt text is matched against the generated ``search_vector`` column
+    (web search syntax) and the model and seed filters use JSONB containment, so both
+    are served by GIN indexes. Results use the same keyset pagination as the listings.
+    """
+    try:
+        statement = select(Image).where(Image.user_id == user_id)
+        if text_query:
+            statement = statement.where(Image.__table__.c.search_vector.op("@@")(
+                func.websearch_to_tsquery(
+                    literal_column(f"'{SEARCH_TEXT_CONFIG}'::regconfig"), text_query
+                )
+            ))
+        if folder_id is not None:
+            statement = statement.where(Image.user_folder_id == folder_id)
+        if workflow_id is not None:
+            statement = statement.where(Image.workflow_id == workflow_id)
+        if model_id is not None:
+            statement = statement.where(Image.parameters.contains({"MODEL_ID": str(model_id)}))
+        if seed is not None:
+            statement = statement.where(or_(
+                Image.parameters.contains({"SEED": seed}),
+                Image.parameters.contains({"SEED": str(seed)}),
+            ))
+        if created_from is not None:
+            statement = statement.where(Image.created_at >= created_from)
+        if created_to is not None:
+            statement = statement.where(Image.created_at < created_to)
+        images = await session.exec(_paginate(statement, limit, after))
+        return images.all()
+    except Exception as e:
+        logger.exception("Error searching images for user %s: %s", user_id, e)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error searching images for user {user_id}",
+        ) from e
+
 async def get_image_by_id(session: AsyncSession, image_id: UUID) -> Optional[Image]:
     """Retrieves an image by its ID."""
     try:
@@ -96,25 +225,80 @@ async def get_image_by_id(session: AsyncSession, image_id: UUID) -> Optional[Ima
             detail=f"Error retrieving image with ID {image_id}",
         ) from e
 
-async def delete_image(session: AsyncSession, image_id: UUID) -> bool:
-    """Deletes an image by its ID."""
+async def get_image_by_id_and_user_id(
+    session: AsyncSession, image_id: UUID, user_id: UUID
+) -> Optional[Image]:
+    """Retrieves an image by its ID, restricted to images owned by the given user."""
     try:
-        image = await get_image_by_id(session, image_id)
-        if image is None:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail=f"Image with ID {image_id} not found",
-            )
-        await session.delete(image)
+        statement = select(Image).where(Image.id == image_id).where(Image.user_id == user_id)
+        image = await session.exec(statement)
+        return image.first()
+    except Exception as e:
+        logger.exception("Error retrieving image %s for user %s: %s", image_id, user_id, e)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error retrieving image with ID {image_id}",
+        ) from e
+
+async def delete_images(
+    session: AsyncSession,
+    user_id: UUID,
+    image_ids: Optional[list[UUID]] = None,
+    folder_id: Optional[UUID] = None,
+) -> list[str]:
+    """
+    Deletes many images of a user in a single statement.
+
+    Images are selected by ID and/or by folder. Returns the storage URLs of the removed rows.
+    """
+    if not image_ids and folder_id is None:
+        return []
+    try:
+        statement = delete(Image).where(Image.user_id == user_id)
+        if image_ids:
+            statement = statement.where(Image.id.in_(image_ids))
+        if folder_id is not None:
+            statement = statement.where(Image.user_folder_id == folder_id)
+        result = await session.execute(
+            statement.returning(Image.url, Image.user_folder_id, Image.size_bytes)
+        )
+        rows = result.all()
+        await decrement_usage(session, user_id, [(row[1], row[2]) for row in rows])
+        urls = [row[0] for row in rows]
         await session.commit()
-        logger.info("Image deleted successfully: %s", image_id)
-        return True
-    except HTTPException as e:
-        raise e
+        logger.info("Deleted %d image(s) for user %s.", len(urls), user_id)
+        return urls
     except Exception as e:
         await session.rollback()
-        logger.exception("Error deleting image %s: %s", image_id, e)
+        logger.exception("Error deleting images for user %s: %s", user_id, e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Error deleting image with ID {image_id}",
-        ) from e
\ No newline at end of file
+            detail=f"Error deleting images for user {user_id}",
+        ) from e
+
+async def stream_referenced_object_names(
+    session: AsyncSession, bucket_name: str, batch_size: int = 1000
+) -> AsyncIterator[str]:
+    """
+    Streams every object name of the bucket referenced by the database, in byte order.
+
+    Image URLs are stored as ``<bucket>/<object>`` and profile images as the bare object
+    name. The ``"C"`` collation makes the ordering match the lexicographic order of the
+    MinIO listing, so callers can merge-join both streams.
+    """
+    prefix = f"{bucket_name}/"
+    image_names = select(
+        func.substr(Image.url, len(prefix) + 1).label("object_name")
+    ).where(Image.url.startswith(prefix, autoescape=True))
+    profile_names = select(
+        User.profile_image_url.label("object_name")
+    ).where(User.profile_image_url.is_not(None))
+    names = union_all(image_names, profile_names).subquery()
+    statement = (
+        select(names.c.object_name)
+        .order_by(names.c.object_name.collate("C"))
+        .execution_options(yield_per=batch_size)
+    )
+    result = await session.stream_scalars(statement)
+    async for object_name in result:
+        yield object_name
@@ -1,13 +1,14 @@
-import json
 from datetime import datetime, timezone
-from typing import Optional
+from typing import Any, Optional
 from uuid import UUID
 
 from sqlmodel import select
 from sqlmodel.ext.asyncio.session import AsyncSession
 
 from core.logging_core import setup_logger
-from model.model_model import Model, ModelCreate
+from model.model_model import Model, ModelCreate, ModelSummary
+from service.seed_service import seed_from_json
+from utils.projection_util import projected_columns, rows_as_dicts
 
 logger = setup_logger(__name__)
 
@@ -39,13 +40,12 @@ async def create_model(session: AsyncSession, model_data: ModelCreate) -> Model:
         logger.exception("Error creating model %s: %s", model_data.name, e)
         raise e
 
-async def get_all_models(session: AsyncSession) -> list[Model]:
-    """Retrieves all models from the database."""
+async def get_all_models(session: AsyncSession) -> list[dict[str, Any]]:
+    """Retrieves all models as ``ModelSummary`` rows."""
     try:
-        statement = select(Model)
-        models = await session.exec(statement)
-        models = models.all()
-        return models
+        statement = select(*projected_columns(Model, ModelSummary))
+        result = await session.execute(statement)
+        return rows_as_dicts(result)
     except Exception as e:
         logger.exception("Error retrieving all models: %s", e)
         raise e
@@ -111,18 +111,7 @@ async def delete_model(session: AsyncSession, model_id: UUID) -> bool:
         logger.exception("Error deleting model %s: %s", model_id, e)
         raise e
 
-async def seed_model_from_json(session, json_path):
-    with open(json_path, encoding="utf-8") as f:
-        models_data = json.load(f)
-
-    for model_data in models_data:
-        name = model_data.get("name")
-        exists = await session.exec(select(Model).where(Model.name == name))
-        exists = exists.first()
-        if not exists:
-            session.add(Model(**model_data))
-            logger.info(f"Model '{name}' inserted.")
-        else:
-            logger.info(f"Model '{name}' already exists. Skipping insertion.")
-    await session.commit()
+async def seed_model_from_json(session, json_path, update_existing: bool = False) -> int:
+    """Seeds the models of a JSON resource in a single upsert keyed by name."""
+    return await seed_from_json(session, Model, json_path, update_existing)
 
@@ -1,13 +1,15 @@
-import json
 from datetime import datetime, timezone
-from typing import Optional
+from typing import Any, Optional
 from uuid import UUID
 
 from sqlmodel import select
 from sqlmodel.ext.asyncio.session import AsyncSession
 
 from core.logging_core import setup_logger
-from model.plan_model import Plan, PlanCreate
+from model.plan_model import Plan, PlanCreate, PlanSummary
+from model.user_model import User
+from service.seed_service import seed_from_json
+from utils.projection_util import projected_columns, rows_as_dicts
 
 logger = setup_logger(__name__)
 
@@ -39,13 +41,12 @@ async def create_plan(session: AsyncSession, plan_data: PlanCreate) -> Plan:
         logger.exception("Error creating plan %s: %s", plan_data.name, e)
         raise e
 
-async def get_all_plans(session: AsyncSession) -> list[Plan]:
-    """Retrieves all plans from the database."""
+async def get_all_plans(session: AsyncSession) -> list[dict[str, Any]]:
+    """Retrieves all plans as ``PlanSummary`` rows."""
     try:
-        statement = select(Plan)
-        plans = await session.exec(statement)
-        plans = plans.all()
-        return plans
+        statement = select(*projected_columns(Plan, PlanSummary))
+        result = await session.execute(statement)
+        return rows_as_dicts(result)
     except Exception as e:
         logger.exception("Error retrieving all plans: %s", e)
         raise e
@@ -105,20 +106,30 @@ async def delete_plan(session: AsyncSession, plan_id: UUID) -> Optional[Plan]:
         logger.exception("Error deleting plan %s: %s", plan_id, e)
         raise e
 
-async def seed_plan_from_json(session, json_path):
-    with open(json_path, encoding="utf-8") as f:
-        plans_data = json.load(f)
-
-    for plan_data in plans_data:
-        name = plan_data.get("name")
-        exists = await session.exec(select(Plan).where(Plan.name == name))
-        exists = exists.first()
-        if not exists:
-            session.add(Plan(**plan_data))
-            logger.info(f"Model '{name}' inserted.")
-        else:
-            logger.info(f"Model '{name}' already exists. Skipping insertion.")
-    await session.commit()
+async def seed_plan_from_json(session, json_path, update_existing: bool = False) -> int:
+    """
+    Seeds the plans of a JSON resource in a single upsert keyed by name, filling the
+    rate limits of existing plans that have none.
+    """
+    return await seed_from_json(
+        session, Plan, json_path, update_existing, backfill_columns=("rate_limits",)
+    )
+
+async def get_rate_limits_by_user_id(
+    session: AsyncSession, user_id: UUID
+) -> Optional[dict[str, str]]:
+    """Retrieves the rate limits of the plan of a user, None if it has none."""
+    try:
+        statement = (
+            select(Plan.rate_limits)
+            .join(User, User.plan_id == Plan.id)
+            .where(User.id == user_id)
+        )
+        result = await session.exec(statement)
+        return result.first()
+    except Exception as e:
+        logger.exception("Error retrieving the rate limits of user %s: %s", user_id, e)
+        raise e
 
 async def get_first_plan_by_price(session: AsyncSession, price: float) -> Optional[Plan]:
     """Retrieves the first plan with a specific price."""
@@ -0,0 +1,92 @@
+import hashlib
+import json
+import os
+from typing import Any
+
+from sqlalchemy import func, or_
+from sqlalchemy import inspect as sa_inspect
+from sqlalchemy.dialects.postgresql import insert
+from sqlmodel import SQLModel
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from core.logging_core import setup_logger
+
+logger = setup_logger(__name__)
+
+IMMUTABLE_COLUMNS = {"id", "name", "created_at"}
+
+
+def resources_checksum(paths: list[str]) -> str:
+    """
+    Compute a SHA-256 over the names and contents of the given resource files.
+    """
+    digest = hashlib.sha256()
+    for path in sorted(paths):
+        digest.update(os.path.basename(path).encode())
+        with open(path, "rb") as f:
+            digest.update(f.read())
+    return digest.hexdigest()
+
+
+def _to_row(model_cls: type[SQLModel], data: dict[str, Any]) -> dict[str, Any]:
+    """Build a row keyed by column name, applying the model defaults."""
+    instance = model_cls(**data)
+    mapper = sa_inspect(model_cls)
+    return {
+        prop.columns[0].name: getattr(instance, prop.key)
+        for prop in mapper.column_attrs
+    }
+
+
+async def seed_from_json(
+    session: AsyncSession,
+    model_cls: type[SQLModel],
+    json_path: str,
+    update_existing: bool = False,
+    backfill_columns: tuple[str, ...] = (),
+) -> int:
+    """
+    Insert every record of a JSON resource with a single ``INSERT ... ON CONFLICT (name)``.
+
+    Existing rows are left untouched unless ``update_existing`` is set, in which case
+    every column except the id, name and creation date is refreshed from the file.
+    Otherwise only the ``backfill_columns`` that are NULL on existing rows (columns
+    added after those rows were seeded) are filled from the file.
+    The caller is responsible for committing.
+
+    Returns:
+        int: The number of rows inserted or updated.
+    """
+    with open(json_path, encoding="utf-8") as f:
+        records = json.load(f)
+    if not records:
+        return 0
+
+    table = model_cls.__table__
+    rows = [_to_row(model_cls, record) for record in records]
+    statement = insert(table).values(rows)
+    if update_existing:
+        statement = statement.on_conflict_do_update(
+            index_elements=[table.c.name],
+            set_={
+                column.name: statement.excluded[column.name]
+                for column in table.columns
+                if column.name not in IMMUTABLE_COLUMNS
+            },
+        )
+    elif backfill_columns:
+        statement = statement.on_conflict_do_update(
+            index_elements=[table.c.name],
+            set_={
+                name: func.coalesce(table.c[name], statement.excluded[name])
+                for name in backfill_columns
+            },
+            where=or_(*(table.c[name].is_(None) for name in backfill_columns)),
+        )
+    else:
+        statement = statement.on_conflict_do_nothing(index_elements=[table.c.name])
+    result = await session.execute(statement.returning(table.c.name))
+    affected = len(result.all())
+    logger.info("Seeded %s: %d of %d row(s) %s.", table.name, affected, len(rows),
+                "inserted or updated" if update_existing or backfill_columns else "inserted")
+    return affected
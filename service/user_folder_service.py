@@ -1,5 +1,5 @@
 from datetime import datetime, timezone
-from typing import Optional
+from typing import Any, Optional
 from uuid import UUID
 
 from fastapi import HTTPException, status
@@ -7,7 +7,8 @@ from sqlmodel import select
 from sqlmodel.ext.asyncio.session import AsyncSession
 
 from core.logging_core import setup_logger
-from model.user_folder_model import UserFolder
+from model.user_folder_model import UserFolder, UserFolderSummary
+from utils.projection_util import projected_columns, rows_as_dicts
 
 logger = setup_logger(__name__)
 
@@ -60,16 +61,16 @@ async def get_user_folder(
 async def get_user_folders(
     session: AsyncSession,
     user_id: UUID
-) -> list[UserFolder]:
+) -> list[dict[str, Any]]:
     """
-    Get all folders for a user.
+    Get all folders of a user as ``UserFolderSummary`` rows.
     """
     try:
-        statement = select(UserFolder).where(
+        statement = select(*projected_columns(UserFolder, UserFolderSummary)).where(
             UserFolder.user_id == user_id
         )
         result = await session.execute(statement)
-        return result.scalars().all()
+        return rows_as_dicts(result)
     except Exception as e:
         logger.error(f"Error getting user folders: {e}")
         raise HTTPException(
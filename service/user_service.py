@@ -1,11 +1,13 @@
 from datetime import datetime, timezone
 from typing import Optional
-from uuid import UUID
+from uuid import UUID, uuid4
 
+from sqlalchemy.dialects.postgresql import insert
 from sqlmodel import select
 from sqlmodel.ext.asyncio.session import AsyncSession
 
 from core.logging_core import setup_logger
+from model.user_folder_model import UserFolder
 from model.user_model import User
 
 logger = setup_logger(__name__)
@@ -28,6 +30,52 @@ async def create_user(session: AsyncSession, user_data: User) -> User:
         logger.exception("Error creating user %s: %s", user_data.email, e)
         raise e
 
+async def get_existing_user_ids(session: AsyncSession, user_ids: list[UUID]) -> set[UUID]:
+    """Returns the subset of the given user IDs that already exist in the database."""
+    if not user_ids:
+        return set()
+    result = await session.exec(select(User.id).where(User.id.in_(user_ids)))
+    return set(result.all())
+
+async def create_users_with_folder(
+    session: AsyncSession, users: list[User], folder_name: str
+) -> list[UUID]:
+    """
+    Bulk-inserts users and a folder for each newly created user in one transaction.
+
+    Users conflicting with an existing row (same ID or email) are skipped.
+
+    Returns:
+        list[UUID]: The IDs of the users that were actually inserted.
+    """
+    if not users:
+        return []
+    try:
+        now = datetime.now(timezone.utc)
+        rows = []
+        for user in users:
+            row = user.model_dump()
+            row["created_at"] = row.get("created_at") or now
+            row["updated_at"] = row.get("updated_at") or row["created_at"]
+            rows.append(row)
+        result = await session.execute(
+            insert(User).values(rows).on_conflict_do_nothing().returning(User.id)
+        )
+        created_ids = list(result.scalars().all())
+        if created_ids:
+            await session.execute(insert(UserFolder).values([
+                {"id": uuid4(), "name": folder_name, "user_id": user_id,
+                 "created_at": now, "updated_at": now}
+                for user_id in created_ids
+            ]))
+        await session.commit()
+        logger.info("%d user(s) created with folder '%s'.", len(created_ids), folder_name)
+        return created_ids
+    except Exception as e:
+        await session.rollback()
+        logger.exception("Error creating %d user(s): %s", len(users), e)
+        raise e
+
 async def get_all_users(session: AsyncSession) -> list[User]:
     """Retrieves all users from the database."""
     try:
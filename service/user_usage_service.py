@@ -0,0 +1,118 @@
+from collections import defaultdict
+from collections.abc import Iterable
+from datetime import datetime, timezone
+from typing import Optional
+from uuid import UUID
+
+from sqlalchemy import FromClause, func, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from core.logging_core import setup_logger
+from model.user_usage_model import UserUsage
+
+logger = setup_logger(__name__)
+
+
+async def increment_usage(
+    session: AsyncSession,
+    user_id: UUID,
+    folder_id: UUID,
+    plan_id: Optional[UUID] = None,
+    image_count: int = 0,
+    total_bytes: int = 0,
+    gpu_seconds: float = 0.0,
+) -> None:
+    """
+    Adds to the usage counters of a user's folder with a single upsert.
+    The caller commits, so the counters change in the same transaction as the images.
+    """
+    now = datetime.now(timezone.utc)
+    statement = insert(UserUsage).values(
+        user_id=user_id,
+        user_folder_id=folder_id,
+        plan_id=plan_id,
+        image_count=image_count,
+        total_bytes=total_bytes,
+        gpu_seconds=gpu_seconds,
+        updated_at=now,
+    )
+    table = UserUsage.__table__
+    statement = statement.on_conflict_do_update(
+        index_elements=[table.c.user_id, table.c.user_folder_id],
+        set_={
+            "plan_id": func.coalesce(statement.excluded.plan_id, table.c.plan_id),
+            "image_count": table.c.image_count + statement.excluded.image_count,
+            "total_bytes": table.c.total_bytes + statement.excluded.total_bytes,
+            "gpu_seconds": table.c.gpu_seconds + statement.excluded.gpu_seconds,
+            "updated_at": statement.excluded.updated_at,
+        },
+    )
+    await session.execute(statement)
+
+
+async def decrement_usage(
+    session: AsyncSession, user_id: UUID, deleted: Iterable[tuple[UUID, Optional[int]]]
+) -> None:
+    """
+    Subtracts deleted images, given as ``(folder_id, size_bytes)`` pairs, from the
+    counters of their folders. The caller commits.
+    """
+    totals: dict[UUID, list[int]] = defaultdict(lambda: [0, 0])
+    for folder_id, size_bytes in deleted:
+        totals[folder_id][0] += 1
+        totals[folder_id][1] += size_bytes or 0
+    now = datetime.now(timezone.utc)
+    table = UserUsage.__table__
+    for folder_id, (image_count, total_bytes) in totals.items():
+        await session.execute(
+            update(table)
+            .where(table.c.user_id == user_id, table.c.user_folder_id == folder_id)
+            .values(
+                image_count=func.greatest(table.c.image_count - image_count, 0),
+                total_bytes=func.greatest(table.c.total_bytes - total_bytes, 0),
+                updated_at=now,
+            )
+        )
+
+
+async def get_user_usage(session: AsyncSession, user_id: UUID) -> list[UserUsage]:
+    """Retrieves the usage counters of every folder of a user."""
+    try:
+        result = await session.exec(select(UserUsage).where(UserUsage.user_id == user_id))
+        return result.all()
+    except Exception as e:
+        logger.exception("Error retrieving usage for user %s: %s", user_id, e)
+        raise e
+
+
+async def decrement_usage_from(session: AsyncSession, source: FromClause) -> None:
+    """
+    Subtracts every image row of ``source`` (a table or subquery with ``user_id``,
+    ``user_folder_id`` and ``size_bytes`` columns) from the usage counters with a
+    single ``UPDATE ... FROM``. The caller commits.
+    """
+    totals = (
+        select(
+            source.c.user_id,
+            source.c.user_folder_id,
+            func.count().label("image_count"),
+            func.coalesce(func.sum(source.c.size_bytes), 0).label("total_bytes"),
+        )
+        .group_by(source.c.user_id, source.c.user_folder_id)
+        .subquery()
+    )
+    table = UserUsage.__table__
+    await session.execute(
+        update(table)
+        .where(
+            table.c.user_id == totals.c.user_id,
+            table.c.user_folder_id == totals.c.user_folder_id,
+        )
+        .values(
+            image_count=func.greatest(table.c.image_count - totals.c.image_count, 0),
+            total_bytes=func.greatest(table.c.total_bytes - totals.c.total_bytes, 0),
+            updated_at=datetime.now(timezone.utc),
+        )
+    )
@@ -1,14 +1,14 @@
-import json
 from datetime import datetime, timezone
-from typing import Optional
+from typing import Any, Optional
 from uuid import UUID
 
-from sqlalchemy.orm import load_only
 from sqlmodel import select
 from sqlmodel.ext.asyncio.session import AsyncSession
 
 from core.logging_core import setup_logger
-from model.workflow_model import Workflow, WorkflowCreate
+from model.workflow_model import Workflow, WorkflowCreate, WorkflowSimplified, WorkflowSummary
+from service.seed_service import seed_from_json
+from utils.projection_util import projected_columns, rows_as_dicts
 
 logger = setup_logger(__name__)
 
@@ -42,33 +42,22 @@ async def create_workflow(session: AsyncSession, workflow_data: WorkflowCreate)
         raise e
 
 
-async def get_all_workflows(session: AsyncSession) -> list[Workflow]:
-    """Retrieves all workflows from the database."""
+async def get_all_workflows(session: AsyncSession) -> list[dict[str, Any]]:
+    """Retrieves all workflows as ``WorkflowSummary`` rows, without their graphs."""
     try:
-        statement = select(Workflow)
-        workflows = await session.exec(statement)
-        workflows = workflows.all()
-        return workflows
+        statement = select(*projected_columns(Workflow, WorkflowSummary))
+        result = await session.execute(statement)
+        return rows_as_dicts(result)
     except Exception as e:
         logger.exception("Error retrieving all workflows: %s", e)
         raise e
 
-async def get_all_workflows_simplified(session: AsyncSession) -> list[Workflow]:
-    """Retrieves all workflows from the database."""
+async def get_all_workflows_simplified(session: AsyncSession) -> list[dict[str, Any]]:
+    """Retrieves all workflows as ``WorkflowSimplified`` rows."""
     try:
-        statement = select(Workflow).options(
-            load_only(
-                Workflow.id,
-                Workflow.name,
-                Workflow.description,
-                Workflow.model_type,
-                Workflow.model_id,
-                Workflow.created_at,
-            )
-        )
-        workflows = await session.exec(statement)
-        workflows = workflows.all()
-        return workflows
+        statement = select(*projected_columns(Workflow, WorkflowSimplified))
+        result = await session.execute(statement)
+        return rows_as_dicts(result)
     except Exception as e:
         logger.exception("Error retrieving all workflows: %s", e)
         raise e
@@ -137,17 +126,6 @@ async def delete_workflow(session: AsyncSession, workflow_id: UUID) -> bool:
         logger.exception("Error deleting workflow %s: %s", workflow_id, e)
         raise e
 
-async def seed_workflow_from_json(session, json_path):
-    with open(json_path, encoding="utf-8") as f:
-        workflows_data = json.load(f)
-
-    for workflow_data in workflows_data:
-        name = workflow_data.get("name")
-        exists = await session.exec(select(Workflow).where(Workflow.name == name))
-        exists = exists.first()
-        if not exists:
-            session.add(Workflow(**workflow_data))
-            print(f"Workflow '{name}' inserted.")
-        else:
-            print(f"Workflow '{name}' already exists. Skipping insertion.")
-    await session.commit()
\ No newline at end of file
+async def seed_workflow_from_json(session, json_path, update_existing: bool = False) -> int:
+    """Seeds the workflows of a JSON resource in a single upsert keyed by name."""
+    return await seed_from_json(session, Workflow, json_path, update_existing)
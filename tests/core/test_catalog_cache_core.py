@@ -0,0 +1,65 @@
+import gzip
+from unittest.mock import AsyncMock
+
+import orjson
+import pytest
+
+from core.catalog_cache_core import CatalogCache, build_snapshot, catalog_response
+
+ROWS = [{"id": 1, "name": "SDXL"}]
+
+
+def test_build_snapshot_is_deterministic():
+    first, second = build_snapshot(ROWS), build_snapshot(ROWS)
+
+    assert first.etag == second.etag
+    assert gzip.decompress(first.gzip_body) == first.body == orjson.dumps(ROWS)
+
+
+@pytest.mark.asyncio
+async def test_cache_serves_snapshot_until_invalidated():
+    cache = CatalogCache(ttl_seconds=60)
+    loader = AsyncMock(return_value=ROWS)
+
+    first = await cache.get("models", loader)
+    second = await cache.get("models", loader)
+    cache.invalidate("models")
+    await cache.get("models", loader)
+
+    assert first is second
+    assert loader.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_cache_does_not_keep_snapshot_invalidated_while_loading():
+    cache = CatalogCache(ttl_seconds=60)
+
+    async def loader():
+        cache.invalidate("plans")
+        return ROWS
+
+    await cache.get("plans", loader)
+
+    assert cache._fresh("plans") is None
+
+
+def test_catalog_response_not_modified():
+    snapshot = build_snapshot(ROWS)
+
+    response = catalog_response(snapshot, snapshot.etag, "gzip")
+
+    assert response.status_code == 304
+    assert response.body == b""
+    assert response.headers["etag"] == snapshot.etag
+
+
+def test_catalog_response_negotiates_gzip():
+    snapshot = build_snapshot(ROWS)
+
+    compressed = catalog_response(snapshot, None, "br, gzip;q=0.8")
+    plain = catalog_response(snapshot, '"other"', "gzip;q=0")
+
+    assert compressed.headers["content-encoding"] == "gzip"
+    assert compressed.body == snapshot.gzip_body
+    assert "content-encoding" not in plain.headers
+    assert plain.body == snapshot.body
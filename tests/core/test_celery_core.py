@@ -2,7 +2,13 @@ from unittest.mock import AsyncMock, patch
 
 import pytest
 
-from core.celery_core import check_queue_task_celery
+from core.celery_core import (
+    QUEUE_MONITOR_ENABLED,
+    celery_app,
+    check_queue_task_celery,
+    maintain_image_partitions_celery,
+    reconcile_storage_celery,
+)
 
 
 @pytest.fixture
@@ -14,3 +20,26 @@ def mock_check_queue_task():
 def test_check_queue_task_celery_invokes_check_queue_task(mock_check_queue_task):
     check_queue_task_celery()
     mock_check_queue_task.assert_called_once()
+
+
+def test_reconcile_storage_celery_invokes_reconcile_storage_job():
+    with patch(
+        "core.celery_core.reconcile_storage_job", new_callable=AsyncMock
+    ) as mock_job:
+        mock_job.return_value = {"orphan_objects": 0}
+        assert reconcile_storage_celery() == {"orphan_objects": 0}
+        mock_job.assert_called_once()
+
+
+def test_maintain_image_partitions_celery_invokes_job():
+    with patch(
+        "core.celery_core.maintain_image_partitions_job", new_callable=AsyncMock
+    ) as mock_job:
+        mock_job.return_value = {"dropped_partitions": 0}
+        assert maintain_image_partitions_celery() == {"dropped_partitions": 0}
+        mock_job.assert_called_once()
+
+
+def test_queue_poll_is_not_scheduled_with_the_queue_monitor():
+    scheduled = "check-queue-every-1-second" in celery_app.conf.beat_schedule
+    assert scheduled is not QUEUE_MONITOR_ENABLED
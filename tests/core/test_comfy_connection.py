@@ -0,0 +1,41 @@
+import asyncio
+from unittest.mock import patch
+
+from core.comfy import connection
+from core.comfy.connection import get_queue
+
+QUEUE_DATA = {
+    "queue_running": [[0, "p0", {}, {"client_id": "other"}, []]],
+    "queue_pending": [
+        [1, "p1", {}, {"client_id": "other"}, []],
+        [2, "p2", {}, {"client_id": "user-1"}, []],
+    ],
+}
+
+
+def test_get_queue_shares_recent_snapshots():
+    connection._queue_snapshot.update(data=None, fetched_at=0.0, task=None)
+
+    async def run():
+        return await asyncio.gather(
+            get_queue("user-1", max_age=60),
+            get_queue("other", max_age=60),
+            get_queue(None, max_age=60),
+        )
+
+    with patch.object(connection, "_fetch_queue_data", return_value=QUEUE_DATA) as fetch:
+        first, second, third = asyncio.run(run())
+        asyncio.run(get_queue("user-1", max_age=60))
+
+    assert fetch.call_count == 1
+    assert first == {"queue_running": 1, "queue_pending": 2, "queue_position": 2}
+    assert second["queue_position"] == 1
+    assert third["queue_position"] == 0
+
+
+def test_get_queue_without_max_age_fetches_again():
+    connection._queue_snapshot.update(data=None, fetched_at=0.0, task=None)
+    with patch.object(connection, "_fetch_queue_data", return_value=QUEUE_DATA) as fetch:
+        asyncio.run(get_queue("user-1"))
+        asyncio.run(get_queue("user-1"))
+    assert fetch.call_count == 2
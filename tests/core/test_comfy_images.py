@@ -0,0 +1,27 @@
+import asyncio
+import json
+from unittest.mock import patch
+
+from core.comfy.images import _wait_for_prompt_execution
+
+
+class FakeWebSocket:
+    def __init__(self, messages):
+        self.messages = [json.dumps(message) for message in messages]
+
+    async def recv(self):
+        return self.messages.pop(0)
+
+
+@patch("core.comfy.images.time.time_ns", side_effect=[0, 4_000_000_000, 6_500_000_000])
+def test_wait_returns_the_execution_time_only(_time_ns):
+    ws = FakeWebSocket([
+        {"type": "status", "data": {"status": {"exec_info": {"queue_remaining": 2}}}},
+        {"type": "execution_start", "data": {"prompt_id": "p1"}},
+        {"type": "executing", "data": {"node": "3", "prompt_id": "p1"}},
+        {"type": "executing", "data": {"node": None, "prompt_id": "p1"}},
+    ])
+
+    seconds = asyncio.run(_wait_for_prompt_execution(ws, "client", "p1"))
+
+    assert seconds == 2.5
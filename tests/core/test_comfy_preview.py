@@ -0,0 +1,31 @@
+import asyncio
+import uuid
+from unittest.mock import patch
+
+from PIL import Image
+
+from core.comfy.config import preview_queue
+from core.comfy.preview import clear_user_preview_queue, export_preview_queue, get_preview_queue
+
+
+@patch("core.comfy.preview.metric")
+def test_previews_are_kept_per_job(_metric):
+    user_id = uuid.uuid4()
+    first, second = Image.new("RGB", (1, 1)), Image.new("RGB", (2, 2))
+
+    async def run():
+        await export_preview_queue(user_id, first, "job-1")
+        await export_preview_queue(user_id, second, "job-2")
+        return (
+            await get_preview_queue(user_id, "job-1"),
+            await get_preview_queue(user_id, "job-2"),
+            await get_preview_queue(user_id, "job-3"),
+            await get_preview_queue(user_id),
+            await get_preview_queue(uuid.uuid4(), "job-1"),
+        )
+
+    try:
+        assert asyncio.run(run()) == (first, second, None, second, None)
+    finally:
+        asyncio.run(clear_user_preview_queue(user_id))
+    assert preview_queue.qsize() == 0
@@ -0,0 +1,78 @@
+import gzip
+
+from fastapi import FastAPI
+from fastapi.responses import Response, StreamingResponse
+from fastapi.testclient import TestClient
+
+from core.compression_core import CompressionMiddleware, compression_level
+
+LARGE_JSON = b'{"workflow_json": "' + b"x" * 4096 + b'"}'
+
+
+def create_client(**kwargs) -> TestClient:
+    app = FastAPI()
+    app.add_middleware(CompressionMiddleware, encodings=["gzip"], **kwargs)
+
+    @app.get("/json")
+    async def large_json():
+        return Response(LARGE_JSON, media_type="application/json", headers={"ETag": '"v1"'})
+
+    @app.get("/small")
+    async def small_json():
+        return Response(b"{}", media_type="application/json")
+
+    @app.get("/image")
+    async def image():
+        return Response(b"\x89PNG" + b"0" * 4096, media_type="image/png")
+
+    @app.get("/stream")
+    async def stream():
+        async def chunks():
+            for _ in range(4):
+                yield b"a" * 2048
+        return StreamingResponse(chunks(), media_type="text/plain")
+
+    return TestClient(app)
+
+
+def test_compression_level_matches_type_families():
+    levels = {"application/json": 5, "text/": 3}
+
+    assert compression_level("application/json; charset=utf-8", levels) == 5
+    assert compression_level("text/html", levels) == 3
+    assert compression_level("text/event-stream", levels) is None
+    assert compression_level("image/png", levels) is None
+
+
+def test_large_json_is_gzipped_with_weak_etag():
+    client = create_client(levels={"application/json": 6})
+
+    response = client.get("/json", headers={"Accept-Encoding": "gzip"})
+
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.headers["etag"] == 'W/"v1"'
+    assert "Accept-Encoding" in response.headers["vary"]
+    assert response.content == LARGE_JSON
+
+
+def test_small_media_and_unaccepted_responses_pass_through():
+    client = create_client(levels={"application/json": 6})
+
+    small = client.get("/small", headers={"Accept-Encoding": "gzip"})
+    image = client.get("/image", headers={"Accept-Encoding": "gzip"})
+    identity = client.get("/json", headers={"Accept-Encoding": "identity"})
+
+    assert "content-encoding" not in small.headers
+    assert "content-encoding" not in image.headers
+    assert "content-encoding" not in identity.headers
+
+
+def test_streaming_response_is_compressed_incrementally():
+    client = create_client(levels={"text/": 6}, offload_size=1024)
+
+    with client.stream("GET", "/stream", headers={"Accept-Encoding": "gzip"}) as response:
+        raw = b"".join(response.iter_raw())
+
+    assert response.headers["content-encoding"] == "gzip"
+    assert "content-length" not in response.headers
+    assert gzip.decompress(raw) == b"a" * 8192
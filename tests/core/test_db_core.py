@@ -0,0 +1,83 @@
+import itertools
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from core import db_core
+from core.db_core import InstrumentedAsyncPool
+
+
+def test_instrumented_pool_collects_usage_and_wait_stats():
+    pool = InstrumentedAsyncPool(creator=MagicMock, pool_size=1, max_overflow=1)
+    first = pool.connect()
+    second = pool.connect()
+
+    stats = pool.collect_stats()
+
+    assert stats["pool_size"] == 1
+    assert stats["checked_out"] == 2
+    assert stats["overflow"] == 1
+    assert stats["checkouts"] == 2
+    assert stats["wait_max_ms"] >= stats["wait_avg_ms"] >= 0
+
+    first.close()
+    second.close()
+    stats = pool.collect_stats()
+
+    assert stats["checked_out"] == 0
+    assert stats["checkouts"] == 0
+
+
+class FakeSession:
+    def __init__(self, name, wrote=False):
+        self.name = name
+        self.sync_session = MagicMock(info={"wrote": True} if wrote else {})
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args):
+        return False
+
+    async def close(self):
+        pass
+
+
+@pytest.fixture
+def replica_routing():
+    primary = {"wrote": False}
+
+    def make_primary():
+        return FakeSession("primary", wrote=primary["wrote"])
+
+    with patch.object(db_core, "AsyncSessionLocal", make_primary), \
+            patch.object(db_core, "ReplicaSessionLocals", [object()]), \
+            patch.object(db_core, "_replica_cycle",
+                         itertools.cycle([lambda: FakeSession("replica")])):
+        yield primary
+
+
+async def session_name(factory):
+    async with factory() as session:
+        return session.name
+
+
+@pytest.mark.asyncio
+async def test_read_session_uses_replica(replica_routing):
+    assert await session_name(db_core.get_read_db_session) == "replica"
+    assert await session_name(db_core.get_db_session) == "primary"
+
+
+@pytest.mark.asyncio
+async def test_read_from_primary_context(replica_routing):
+    with db_core.read_from_primary():
+        assert await session_name(db_core.get_read_db_session) == "primary"
+    assert await session_name(db_core.get_read_db_session) == "replica"
+
+
+@pytest.mark.asyncio
+async def test_reads_follow_writes_to_primary(replica_routing):
+    replica_routing["wrote"] = True
+    await session_name(db_core.get_db_session)
+
+    assert await session_name(db_core.get_read_db_session) == "primary"
@@ -0,0 +1,83 @@
+import os
+
+import pytest
+
+from core.disk_cache_core import DiskCache, iter_cached_file
+
+
+@pytest.fixture
+def disk_cache(tmp_path):
+    return DiskCache(path=str(tmp_path), max_size_bytes=100, max_object_size_bytes=60)
+
+
+def test_get_miss(disk_cache):
+    assert disk_cache.get("bucket", "missing.png") is None
+    assert disk_cache.misses == 1
+
+
+def test_put_then_get_hit(disk_cache):
+    disk_cache.put("bucket", "a.png", b"hello", etag="abc", content_type="image/png")
+
+    cached = disk_cache.get("bucket", "a.png")
+
+    assert cached is not None
+    assert cached.size == 5
+    assert cached.etag == "abc"
+    assert cached.content_type == "image/png"
+    assert cached.last_modified is not None
+    with open(cached.path, "rb") as f:
+        assert f.read() == b"hello"
+    assert disk_cache.stats()["hit_rate"] == 1.0
+
+
+def test_unrecorded_lookups_are_not_counted(disk_cache):
+    disk_cache.put("bucket", "a.png", b"hello")
+
+    assert disk_cache.get("bucket", "a.png", record=False) is not None
+    assert disk_cache.get("bucket", "missing.png", record=False) is None
+    assert (disk_cache.hits, disk_cache.misses) == (0, 0)
+
+
+def test_put_skips_objects_larger_than_limit(disk_cache):
+    disk_cache.put("bucket", "big.png", b"x" * 61)
+
+    assert disk_cache.get("bucket", "big.png") is None
+
+
+def test_eviction_removes_least_recently_used(disk_cache):
+    disk_cache.put("bucket", "a.png", b"a" * 40)
+    os.utime(disk_cache.get("bucket", "a.png").path, (1, 1))
+    disk_cache.put("bucket", "b.png", b"b" * 40)
+    disk_cache.put("bucket", "c.png", b"c" * 40)
+
+    assert disk_cache.get("bucket", "a.png") is None
+    assert disk_cache.get("bucket", "b.png") is not None
+    assert disk_cache.get("bucket", "c.png") is not None
+
+
+def test_invalidate(disk_cache):
+    disk_cache.put("bucket", "a.png", b"hello")
+
+    disk_cache.invalidate("bucket", "a.png")
+
+    assert disk_cache.get("bucket", "a.png") is None
+    assert disk_cache.stats()["size_bytes"] == 0
+
+
+def test_index_is_rebuilt_from_disk(tmp_path, disk_cache):
+    disk_cache.put("bucket", "a.png", b"hello")
+
+    reopened = DiskCache(path=str(tmp_path), max_size_bytes=100, max_object_size_bytes=60)
+
+    assert reopened.stats()["size_bytes"] == 5
+    assert reopened.get("bucket", "a.png") is not None
+
+
+def test_iter_cached_file_range(tmp_path):
+    path = tmp_path / "data.bin"
+    path.write_bytes(b"0123456789")
+
+    assert b"".join(iter_cached_file(str(path), chunk_size=3)) == b"0123456789"
+    assert list(iter_cached_file(str(path), offset=2, length=5, chunk_size=2)) == [
+        b"23", b"45", b"6"
+    ]
@@ -0,0 +1,148 @@
+import time
+import uuid
+from unittest.mock import AsyncMock, Mock
+
+import httpx
+import pytest
+from fief_client import (
+    FiefAccessTokenExpired,
+    FiefAccessTokenInvalid,
+    FiefAccessTokenMissingPermission,
+    FiefAccessTokenMissingScope,
+)
+from jwcrypto import jwk, jwt
+
+from core.fief_core import CachedFiefAsync, FiefAsyncHttpClient
+
+USERS = [{"id": str(index)} for index in range(5)]
+
+
+def make_transport(requests):
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(dict(request.url.params))
+        skip = int(request.url.params["skip"])
+        limit = int(request.url.params["limit"])
+        return httpx.Response(
+            200, json={"count": len(USERS), "results": USERS[skip:skip + limit]}
+        )
+    return httpx.MockTransport(handler)
+
+
+@pytest.mark.asyncio
+async def test_iter_user_pages_follows_pagination():
+    requests = []
+    client = FiefAsyncHttpClient(page_size=2, transport=make_transport(requests))
+
+    pages = [page async for page in client.iter_user_pages()]
+
+    assert [len(page) for page in pages] == [2, 2, 1]
+    assert [request["skip"] for request in requests] == ["0", "2", "4"]
+    assert all(request["ordering"] == "-updated_at" for request in requests)
+
+
+@pytest.mark.asyncio
+async def test_iter_user_pages_stops_early():
+    requests = []
+    client = FiefAsyncHttpClient(page_size=2, transport=make_transport(requests))
+
+    async for page in client.iter_user_pages():
+        assert page == USERS[:2]
+        break
+
+    assert len(requests) <= 2
+
+
+def _signing_key(kid: str) -> jwk.JWK:
+    return jwk.JWK.generate(kty="RSA", size=2048, kid=kid)
+
+
+def _jwks(*keys: jwk.JWK) -> jwk.JWKSet:
+    jwks = jwk.JWKSet()
+    for key in keys:
+        jwks.add(jwk.JWK(**key.export_public(as_dict=True)))
+    return jwks
+
+
+def _access_token(key: jwk.JWK, expires_in: int = 3600, **claims) -> str:
+    payload = {
+        "sub": str(uuid.uuid4()),
+        "scope": "openid",
+        "acr": "0",
+        "permissions": [],
+        "exp": int(time.time()) + expires_in,
+        **claims,
+    }
+    token = jwt.JWT(header={"alg": "RS256", "kid": key.get("kid")}, claims=payload)
+    token.make_signed_token(key)
+    return token.serialize()
+
+
+def _client(*keys: jwk.JWK, **kwargs) -> CachedFiefAsync:
+    client = CachedFiefAsync("http://fief.test", "client-id", "client-secret", **kwargs)
+    client._fetch_jwks = AsyncMock(return_value=_jwks(*keys))
+    return client
+
+
+@pytest.mark.asyncio
+async def test_cached_fief_validates_token_once():
+    key = _signing_key("key-1")
+    client = _client(key)
+    token = _access_token(key)
+    client._validate_access_token = Mock(wraps=client._validate_access_token)
+
+    first = await client.validate_access_token(token)
+    second = await client.validate_access_token(token)
+
+    assert first == second
+    assert first["access_token"] == token
+    assert client._validate_access_token.call_count == 1
+    assert client._fetch_jwks.await_count == 1
+
+
+@pytest.mark.asyncio
+async def test_cached_fief_checks_requirements_on_cached_tokens():
+    key = _signing_key("key-1")
+    client = _client(key)
+    token = _access_token(key, permissions=["images:read"])
+
+    await client.validate_access_token(token, required_permissions=["images:read"])
+    with pytest.raises(FiefAccessTokenMissingPermission):
+        await client.validate_access_token(token, required_permissions=["images:write"])
+    with pytest.raises(FiefAccessTokenMissingScope):
+        await client.validate_access_token(token, required_scope=["offline_access"])
+
+
+@pytest.mark.asyncio
+async def test_cached_fief_refreshes_jwks_on_unknown_key():
+    old_key, new_key = _signing_key("key-1"), _signing_key("key-2")
+    client = _client(old_key, jwks_min_refresh_seconds=0)
+    await client.validate_access_token(_access_token(old_key))
+    client._fetch_jwks.return_value = _jwks(old_key, new_key)
+
+    info = await client.validate_access_token(_access_token(new_key))
+
+    assert info["scope"] == ["openid"]
+    assert client._fetch_jwks.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_cached_fief_rejects_invalid_and_expired_tokens():
+    key, other_key = _signing_key("key-1"), _signing_key("key-1")
+    client = _client(key)
+
+    with pytest.raises(FiefAccessTokenInvalid):
+        await client.validate_access_token(_access_token(other_key))
+    with pytest.raises(FiefAccessTokenExpired):
+        await client.validate_access_token(_access_token(key, expires_in=-3600))
+    assert client._tokens == {}
+
+
+@pytest.mark.asyncio
+async def test_cached_fief_evicts_least_recently_used_token():
+    key = _signing_key("key-1")
+    client = _client(key, token_cache_size=1)
+
+    await client.validate_access_token(_access_token(key))
+    await client.validate_access_token(_access_token(key, sub=str(uuid.uuid4())))
+
+    assert len(client._tokens) == 1
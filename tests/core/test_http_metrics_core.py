@@ -0,0 +1,49 @@
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from core.http_metrics_core import HttpMetrics, HttpMetricsMiddleware, RouteStats
+
+
+def create_client(metrics: HttpMetrics) -> TestClient:
+    app = FastAPI()
+    app.add_middleware(HttpMetricsMiddleware, metrics=metrics)
+
+    @app.post("/items/{item_id}")
+    async def update_item(item_id: int):
+        return {"id": item_id}
+
+    return TestClient(app)
+
+
+def test_requests_are_aggregated_by_route_template():
+    metrics = HttpMetrics()
+    client = create_client(metrics)
+
+    client.post("/items/1", content=b"abc")
+    client.post("/items/2", content=b"abcd")
+    client.get("/missing")
+    routes, in_flight = metrics.collect()
+
+    stats = routes[("POST", "/items/{item_id}", 200)]
+    assert stats.count == 2
+    assert stats.request_bytes == 7
+    assert stats.response_bytes == len(b'{"id":1}') * 2
+    assert routes[("GET", "unmatched", 404)].count == 1
+    assert in_flight == {"in_flight": 0, "max_in_flight": 1}
+    assert metrics.collect()[0] == {}
+
+
+def test_route_stats_fields_have_cumulative_buckets():
+    metrics = HttpMetrics()
+    metrics.started()
+    metrics.finished("GET", "/a", 200, 3.0, 0, 10)
+    metrics.started()
+    metrics.finished("GET", "/a", 200, 60000.0, 0, 10)
+    stats: RouteStats = metrics.collect()[0][("GET", "/a", 200)]
+
+    fields = stats.fields()
+
+    assert fields["le_5"] == 1
+    assert fields["le_10000"] == 1
+    assert fields["le_inf"] == 2
+    assert fields["latency_max_ms"] == 60000.0
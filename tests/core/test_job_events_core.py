@@ -0,0 +1,94 @@
+import asyncio
+
+import pytest
+
+from core.job_events_core import JobEventBus
+
+
+async def _collect(iterator, limit=10):
+    events = []
+    async for job_event in iterator:
+        events.append(job_event)
+        if len(events) >= limit:
+            break
+    return events
+
+
+@pytest.mark.asyncio
+async def test_subscriber_receives_live_events_until_terminal():
+    bus = JobEventBus()
+    task = asyncio.create_task(_collect(bus.subscribe("user", "job")))
+    await asyncio.sleep(0)
+
+    bus.publish("user", "job", "queued", {"prompt_id": "p1"})
+    bus.publish("user", "job", "progress", {"value": 1, "max": 2})
+    bus.publish("user", "job", "completed", {"images": []})
+    bus.publish("user", "job", "progress", {"value": 2, "max": 2})
+    events = await asyncio.wait_for(task, timeout=1)
+
+    assert [event.event for event in events] == ["queued", "progress", "completed"]
+    assert [event.id for event in events] == [1, 2, 3]
+
+
+@pytest.mark.asyncio
+async def test_late_subscriber_replays_after_last_event_id():
+    bus = JobEventBus()
+    for event in ("queued", "started", "completed"):
+        bus.publish("user", "job", event)
+
+    events = await _collect(bus.subscribe("user", "job", last_event_id=1))
+
+    assert [event.event for event in events] == ["started", "completed"]
+
+
+@pytest.mark.asyncio
+async def test_jobs_are_isolated_per_user_and_heartbeat_is_yielded():
+    bus = JobEventBus()
+    bus.publish("other-user", "job", "completed")
+
+    events = await asyncio.wait_for(
+        _collect(bus.subscribe("user", "job", heartbeat=0.01), limit=1), timeout=1
+    )
+
+    assert events == [None]
+
+
+def test_publish_without_job_id_is_ignored():
+    bus = JobEventBus()
+
+    bus.publish("user", None, "queued")
+
+    assert bus._channels == {}
+
+
+def test_is_running_only_for_the_owner_until_terminal():
+    bus = JobEventBus()
+    assert not bus.is_running("user", "job")
+
+    bus.publish("user", "job", "queued")
+    assert bus.is_running("user", "job")
+    assert not bus.is_running("other", "job")
+
+    bus.publish("user", "job", "completed")
+    assert not bus.is_running("user", "job")
+
+
+def test_claim_rejects_used_job_ids():
+    bus = JobEventBus()
+    assert bus.claim("user", "job")
+    assert not bus.claim("user", "job")
+
+    bus.publish("user", "finished", "completed")
+    assert not bus.claim("user", "finished")
+    assert bus.claim("other", "finished")
+
+
+@pytest.mark.asyncio
+async def test_wait_until_known():
+    bus = JobEventBus()
+    assert not await bus.wait_until_known("user", "unknown", timeout=0.01)
+
+    waiter = asyncio.create_task(bus.wait_until_known("user", "job", timeout=1))
+    await asyncio.sleep(0)
+    bus.claim("user", "job")
+    assert await waiter
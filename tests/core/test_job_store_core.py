@@ -0,0 +1,76 @@
+from unittest.mock import patch
+
+from redis.exceptions import ConnectionError as RedisConnectionError
+
+from core.job_store_core import JobStore
+
+
+class FakeRedis:
+    def __init__(self):
+        self.data = {}
+        self.expiry = {}
+
+    def set(self, key, value, ex=None):
+        self.data[key] = value
+        self.expiry[key] = ex
+
+    def get(self, key):
+        return self.data.get(key)
+
+
+class BrokenRedis:
+    def set(self, key, value, ex=None):
+        raise RedisConnectionError("down")
+
+    def get(self, key):
+        raise RedisConnectionError("down")
+
+
+def test_jobs_are_shared_through_redis():
+    client = FakeRedis()
+    writer = JobStore("deletion", retention_seconds=60, client=client)
+    reader = JobStore("deletion", retention_seconds=60, client=client)
+
+    writer.save({"job_id": "j1", "status": "running", "removed_objects": 3})
+
+    assert reader.get("j1") == {"job_id": "j1", "status": "running", "removed_objects": 3}
+    assert client.expiry == {"job:deletion:j1": 60}
+    assert reader.get("j2") is None
+
+
+def test_redis_errors_do_not_raise():
+    store = JobStore("deletion", client=BrokenRedis())
+
+    store.save({"job_id": "j1"})
+    assert store.get("j1") is None
+
+
+def test_object_removal_reports_progress_to_the_store():
+    from handler import image_handler
+
+    store = JobStore("deletion", client=FakeRedis())
+    job = {"job_id": "j1", "status": "pending", "removed_objects": 0, "failed_objects": 0}
+    urls = ["bucket/a.png", "bucket/b.png", "not-a-url"]
+
+    with patch.object(image_handler, "deletion_jobs", store), \
+            patch.object(image_handler, "remove_objects_from_bucket",
+                         return_value=["b.png"]) as remove:
+        image_handler.remove_image_objects_handler(job, urls)
+
+    remove.assert_called_once_with("bucket", ["a.png", "b.png"])
+    job = store.get("j1")
+    assert job["status"] == "completed"
+    assert (job["removed_objects"], job["failed_objects"]) == (1, 2)
+
+
+def test_objects_are_removed_without_redis():
+    from handler import image_handler
+
+    job = {"job_id": "j1", "status": "pending", "removed_objects": 0, "failed_objects": 0}
+
+    with patch.object(image_handler, "deletion_jobs", JobStore("deletion", client=BrokenRedis())), \
+            patch.object(image_handler, "remove_objects_from_bucket",
+                         return_value=[]) as remove:
+        image_handler.remove_image_objects_handler(job, ["bucket/a.png"])
+
+    remove.assert_called_once_with("bucket", ["a.png"])
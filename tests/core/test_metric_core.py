@@ -1,10 +1,11 @@
 import os
-from unittest.mock import patch
+from unittest.mock import MagicMock, patch
 
 import pytest
+from influxdb_client.rest import ApiException
 
 from core.env_core import Envs
-from core.metric_core import InfluxDBWriter
+from core.metric_core import InfluxDBBuffer, InfluxDBWriter
 
 
 def test_influxdbwriter_initialization_with_valid_env_vars():
@@ -80,4 +81,98 @@ def test_write_data_invalid_field_type(influxdb_writer):
         influxdb_writer.write_data(measurement, tags, fields)
         mock_logger.warning.assert_called_with(
             "Unsupported field type for key 'field1': <class 'dict'>. Skipping field."
-        )
\ No newline at end of file
+        )
+
+def make_buffer(tmp_path, client, **kwargs):
+    options = {"buffer_size": 100, "batch_size": 2, "flush_seconds": 3600,
+               "spool_dir": str(tmp_path), "spool_max_bytes": 1024 * 1024}
+    options.update(kwargs)
+    return InfluxDBBuffer("http://example.com", "token", "org", "bucket",
+                          client=client, **options)
+
+
+def written_lines(client):
+    write = client.write_api.return_value.write
+    return [line for call in write.call_args_list for line in call.kwargs["record"]]
+
+
+def test_write_data_queues_point(influxdb_writer, tmp_path):
+    client = MagicMock()
+    buffer = make_buffer(tmp_path, client)
+    with patch("core.metric_core.get_buffer", return_value=buffer):
+        influxdb_writer.write_data("queue", {"name": "preview"}, {"size": 3, "bad": {}})
+    client.write_api.return_value.write.assert_not_called()
+
+    buffer.flush()
+    [line] = written_lines(client)
+    assert line.startswith("queue,host=test-host,name=preview,os=test-os size=3i ")
+
+
+def test_buffer_flushes_in_batches(tmp_path):
+    client = MagicMock()
+    buffer = make_buffer(tmp_path, client)
+    for index in range(5):
+        buffer.put(("queue", {}, {"size": index}, index))
+    buffer.flush()
+
+    write = client.write_api.return_value.write
+    assert all(len(call.kwargs["record"]) <= 2 for call in write.call_args_list)
+    assert len(written_lines(client)) == 5
+    assert client.write_api.call_count == 1
+
+
+def test_buffer_drops_oldest_when_full(tmp_path):
+    buffer = make_buffer(tmp_path, MagicMock(), buffer_size=2, batch_size=10)
+    for index in range(3):
+        buffer.put(("queue", {}, {"size": index}, index))
+    assert buffer.dropped == 1
+    assert [record[2]["size"] for record in buffer._records] == [1, 2]
+
+
+def test_buffer_spools_and_replays(tmp_path):
+    client = MagicMock()
+    write = client.write_api.return_value.write
+    write.side_effect = ConnectionError("down")
+    buffer = make_buffer(tmp_path, client)
+    buffer.put(("queue", {}, {"size": 1}, 1))
+    buffer.flush()
+    spool = tmp_path / f"{os.getpid()}.lp"
+    assert spool.read_text() == "queue size=1i 1\n"
+
+    write.side_effect = None
+    buffer.put(("queue", {}, {"size": 2}, 2))
+    buffer.flush()
+    assert written_lines(client)[-2:] == ["queue size=2i 2", "queue size=1i 1"]
+    assert not spool.exists()
+
+
+def test_buffer_drops_beyond_spool_limit(tmp_path):
+    client = MagicMock()
+    client.write_api.return_value.write.side_effect = ConnectionError("down")
+    buffer = make_buffer(tmp_path, client, spool_max_bytes=10)
+    buffer.put(("queue", {}, {"size": 1}, 1))
+    buffer.flush()
+    assert buffer.dropped == 1
+    assert not (tmp_path / f"{os.getpid()}.lp").exists()
+
+
+def test_buffer_drops_rejected_batches_without_blocking_the_spool(tmp_path):
+    client = MagicMock()
+    write = client.write_api.return_value.write
+    spool = tmp_path / "1.lp"
+    spool.write_text("bad line\nqueue size=1i 1\n")
+    buffer = make_buffer(tmp_path, client, batch_size=1)
+
+    def reject_bad_lines(bucket, record, write_precision):
+        if record == ["bad line"]:
+            raise ApiException(status=400, reason="Bad Request")
+
+    write.side_effect = reject_bad_lines
+    with patch("core.metric_core.is_process_alive", return_value=False):
+        buffer.put(("queue", {}, {"size": 2}, 2))
+        buffer.flush()
+
+    assert buffer.dropped == 1
+    assert not spool.exists()
+    assert "queue size=1i 1" in written_lines(client)
+    assert not (tmp_path / f"{os.getpid()}.lp").exists()
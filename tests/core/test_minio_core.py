@@ -11,6 +11,9 @@ from core.minio_core import (
     create_minio_client,
     download_file_from_bucket,
     list_all_buckets,
+    remove_objects_from_bucket,
+    split_object_url,
+    stream_object_from_bucket,
     upload_bytes_to_bucket,
     upload_file_to_bucket,
 )
@@ -295,3 +298,49 @@ def test_download_file_s3_error():
         download_file_from_bucket(bucket_name, object_name, file_path)
         mock_logger.assert_called_once()
         assert "Error downloading file:" in mock_logger.call_args[0][0]
+
+
+def test_split_object_url_success():
+    assert split_object_url("default/user/job_0.png") == ("default", "user/job_0.png")
+
+
+def test_split_object_url_invalid():
+    with pytest.raises(ValueError):
+        split_object_url("default")
+
+
+def test_stream_object_from_bucket_releases_connection():
+    mock_minio_client = MagicMock()
+    response = MagicMock()
+    response.stream.return_value = iter([b"ab", b"cd"])
+    mock_minio_client.get_object.return_value = response
+
+    with patch("core.minio_core.minio_client", mock_minio_client):
+        chunks = list(stream_object_from_bucket("test-bucket", "test-object", 2, 4, chunk_size=2))
+
+    assert chunks == [b"ab", b"cd"]
+    mock_minio_client.get_object.assert_called_once_with(
+        "test-bucket", "test-object", offset=2, length=4
+    )
+    response.stream.assert_called_once_with(2)
+    response.close.assert_called_once()
+    response.release_conn.assert_called_once()
+
+
+def test_remove_objects_from_bucket_returns_errors():
+    mock_minio_client = MagicMock()
+    error = MagicMock()
+    error.name = "b.png"
+    mock_minio_client.remove_objects.return_value = iter([error])
+
+    with (patch("core.minio_core.minio_client", mock_minio_client),
+          patch("core.minio_core.logger") as mock_logger):
+        errors = remove_objects_from_bucket("test-bucket", ["a.png", "b.png"])
+
+    assert errors == [error]
+    bucket_name, delete_objects = mock_minio_client.remove_objects.call_args[0]
+    assert bucket_name == "test-bucket"
+    mock_logger.warning.assert_called_once()
+    mock_logger.info.assert_called_once_with(
+        "Removed %d object(s) from bucket %s.", 1, "test-bucket"
+    )
@@ -0,0 +1,56 @@
+import json
+import os
+
+from core.prometheus_core import MetricsRegistry, metric_name
+
+
+def test_render_exposes_counters_gauges_and_histograms():
+    registry = MetricsRegistry()
+    registry.inc("requests_total", 2, {"route": "/a"}, help_text="Requests.")
+    registry.set("queue_size", 3, {"queue": 'pre"view'})
+    registry.observe("latency_seconds", 0.2, [0.1, 0.5])
+    registry.observe("latency_seconds", 2.0, [0.1, 0.5])
+
+    text = registry.render()
+
+    assert "# TYPE requests_total counter" in text
+    assert 'requests_total{route="/a"} 2.0' in text
+    assert 'queue_size{queue="pre\\"view"} 3.0' in text
+    assert 'latency_seconds_bucket{le="0.1"} 0' in text
+    assert 'latency_seconds_bucket{le="0.5"} 1' in text
+    assert 'latency_seconds_bucket{le="+Inf"} 2' in text
+    assert "latency_seconds_sum 2.2" in text
+    assert "latency_seconds_count 2" in text
+
+
+def test_render_merges_other_processes(tmp_path):
+    registry = MetricsRegistry(str(tmp_path))
+    registry.inc("requests_total", 1)
+    registry.set("queue_size", 5)
+    other = {
+        "requests_total": {"kind": "counter", "help": "", "buckets": [],
+                           "samples": [[[], 4.0]]},
+        "queue_size": {"kind": "gauge", "help": "", "buckets": [],
+                       "samples": [[[], [9, 0.0]]]},
+    }
+    # A process that no longer exists: its counters still count, its gauges do not.
+    (tmp_path / f"{2 ** 22 + 1}.json").write_text(json.dumps(other))
+
+    text = registry.render()
+
+    assert "requests_total 5.0" in text
+    assert "queue_size 5" in text
+
+
+def test_flush_writes_the_snapshot_of_the_process(tmp_path):
+    registry = MetricsRegistry(str(tmp_path))
+    registry.inc("requests_total")
+
+    registry.flush()
+
+    snapshot = json.loads((tmp_path / f"{os.getpid()}.json").read_text())
+    assert snapshot["requests_total"]["samples"] == [[[], 1.0]]
+
+
+def test_metric_name_is_sanitized():
+    assert metric_name("oart", "db-pool", "checked out") == "oart_db_pool_checked_out"
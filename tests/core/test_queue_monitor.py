@@ -0,0 +1,61 @@
+import asyncio
+import json
+from unittest.mock import MagicMock
+
+import pytest
+
+from core.comfy.queue_monitor import QueueMonitor, queue_fields
+
+
+def status_message(remaining):
+    return {"type": "status", "data": {"status": {"exec_info": {"queue_remaining": remaining}}}}
+
+
+class FakeWebSocket:
+    def __init__(self, messages):
+        self.messages = list(messages)
+
+    async def recv(self):
+        if not self.messages:
+            raise ConnectionError("closed")
+        message = self.messages.pop(0)
+        if message is None:
+            await asyncio.sleep(1)
+        return message
+
+
+def written_fields(writer):
+    return [call.kwargs["fields"] for call in writer.write_metric.call_args_list]
+
+
+def test_queue_fields():
+    assert queue_fields(status_message(3)["data"]) == {
+        "queue_remaining": 3, "queue_running": 1, "queue_pending": 2,
+    }
+    assert queue_fields(status_message(0)["data"])["queue_running"] == 0
+    assert queue_fields({"sid": "abc"}) is None
+
+
+def test_writes_only_on_change():
+    writer = MagicMock()
+    monitor = QueueMonitor(heartbeat_seconds=3600, writer=writer)
+    for message in (status_message(1), status_message(1), {"type": "executing"},
+                    status_message(2)):
+        monitor.handle_message(message)
+
+    assert [fields["queue_remaining"] for fields in written_fields(writer)] == [1, 2]
+    assert writer.write_metric.call_args.kwargs["measurement"] == "queue_status"
+
+
+def test_listen_writes_heartbeats_while_unchanged():
+    writer = MagicMock()
+    monitor = QueueMonitor(heartbeat_seconds=0.1, writer=writer)
+    ws = FakeWebSocket([json.dumps(status_message(4)), b"preview", None, "not json"])
+
+    with pytest.raises(ConnectionError):
+        asyncio.run(monitor.listen(ws))
+
+    remaining = [fields["queue_remaining"] for fields in written_fields(writer)]
+    assert remaining[0] == 4
+    assert len(remaining) >= 2
+    assert set(remaining) == {4}
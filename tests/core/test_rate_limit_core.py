@@ -0,0 +1,115 @@
+import ipaddress
+from unittest.mock import AsyncMock, Mock
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from redis.exceptions import ConnectionError as RedisConnectionError
+
+from core.rate_limit_core import (
+    MemoryRateLimiter,
+    RateLimitMiddleware,
+    RedisRateLimiter,
+    client_address,
+    parse_rate,
+    route_class,
+)
+
+ROUTES = {"generate": "/image/generate", "default": "/"}
+RATES = {"generate": "2/minute", "default": "100/minute"}
+
+
+def create_client(resolver=None) -> TestClient:
+    app = FastAPI()
+    app.add_middleware(
+        RateLimitMiddleware,
+        resolver=resolver,
+        limiter=MemoryRateLimiter(),
+        route_classes=ROUTES,
+        default_rates=RATES,
+        exempt_paths=("/webhook",),
+    )
+
+    @app.post("/image/generate")
+    async def generate():
+        return {"ok": True}
+
+    @app.post("/webhook/user")
+    async def webhook():
+        return {"ok": True}
+
+    return TestClient(app)
+
+
+def test_parse_rate():
+    assert parse_rate("10/minute").period == 60
+    assert parse_rate("5/30").period == 30
+    assert parse_rate("100/hours").limit == 100
+    with pytest.raises(ValueError):
+        parse_rate("ten/minute")
+
+
+def test_route_class_uses_longest_prefix():
+    assert route_class("/image/generate", ROUTES) == "generate"
+    assert route_class("/user/me", ROUTES) == "default"
+
+
+def test_requests_over_the_limit_are_rejected_with_headers():
+    client = create_client()
+
+    responses = [client.post("/image/generate") for _ in range(3)]
+
+    assert [response.status_code for response in responses] == [200, 200, 429]
+    assert responses[0].headers["RateLimit-Limit"] == "2"
+    assert responses[0].headers["RateLimit-Remaining"] == "1"
+    assert responses[0].headers["RateLimit-Policy"] == "2;w=60"
+    assert int(responses[2].headers["Retry-After"]) >= 1
+
+
+def test_exempt_paths_are_not_limited():
+    client = create_client()
+
+    responses = [client.post("/webhook/user") for _ in range(3)]
+
+    assert all(response.status_code == 200 for response in responses)
+    assert "RateLimit-Limit" not in responses[0].headers
+
+
+def test_plan_rates_override_defaults_per_user():
+    resolver = AsyncMock(return_value=("user-1", {"generate": "5/minute"}))
+    client = create_client(resolver)
+
+    response = client.post("/image/generate", headers={"Authorization": "Bearer token"})
+
+    assert response.headers["RateLimit-Limit"] == "5"
+    resolver.assert_awaited_once_with("token")
+
+
+@pytest.mark.asyncio
+async def test_redis_errors_fall_back_to_memory():
+    client = Mock()
+    script = AsyncMock(side_effect=RedisConnectionError("down"))
+    client.register_script.return_value = script
+    limiter = RedisRateLimiter(client=client, fallback_seconds=60)
+    rate = parse_rate("1/minute")
+
+    first = await limiter.hit("generate:user-1", rate)
+    second = await limiter.hit("generate:user-1", rate)
+
+    assert first.allowed and not second.allowed
+    assert script.await_count == 1
+
+
+def test_client_address_follows_trusted_proxies_only():
+    proxies = (ipaddress.ip_network("10.0.0.0/8"),)
+
+    def scope(peer, forwarded=None):
+        headers = [(b"x-forwarded-for", forwarded.encode())] if forwarded else []
+        return {"type": "http", "client": (peer, 1234), "headers": headers}
+
+    assert client_address(scope("10.0.0.2", "1.1.1.1, 10.0.0.3"), proxies) == "1.1.1.1"
+    # The client can prepend anything; only the hop the proxy appended counts.
+    assert client_address(scope("10.0.0.2", "6.6.6.6, 1.1.1.1"), proxies) == "1.1.1.1"
+    assert client_address(scope("2.2.2.2", "1.1.1.1"), proxies) == "2.2.2.2"
+    assert client_address(scope("10.0.0.2", "1.1.1.1"), ()) == "10.0.0.2"
+    assert client_address(scope("10.0.0.2"), proxies) == "10.0.0.2"
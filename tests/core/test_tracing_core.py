@@ -0,0 +1,117 @@
+import asyncio
+import json
+import os
+import uuid
+from unittest.mock import patch
+
+import pytest
+
+from core import tracing_core
+from core.tracing_core import (
+    SpanExporter,
+    is_sampled,
+    record_span,
+    start_span,
+    trace_id_for_job,
+    traced,
+)
+
+
+@pytest.fixture
+def exporter(tmp_path):
+    exporter = SpanExporter(exporter="file", file_path=str(tmp_path / "traces.jsonl"),
+                            flush_seconds=3600)
+    with patch.object(tracing_core, "span_exporter", exporter), \
+            patch.object(tracing_core, "TRACING_ENABLED", True), \
+            patch.object(tracing_core, "SAMPLE_RATE", 1.0):
+        yield exporter
+
+
+def exported_spans(exporter):
+    exporter.flush()
+    with open(exporter.file_path, encoding="utf-8") as file:
+        requests = [json.loads(line) for line in file]
+    return [
+        span
+        for request in requests
+        for resource_spans in request["resourceSpans"]
+        for scope_spans in resource_spans["scopeSpans"]
+        for span in scope_spans["spans"]
+    ]
+
+
+def test_trace_id_for_job():
+    job_id = uuid.uuid4()
+    assert trace_id_for_job(str(job_id)) == job_id.hex
+    assert trace_id_for_job("job-1") == trace_id_for_job("job-1")
+    assert len(trace_id_for_job("job-1")) == 32
+
+
+def test_is_sampled_by_rate():
+    assert is_sampled("0" * 32, rate=0.5)
+    assert not is_sampled("f" * 32, rate=0.5)
+    assert not is_sampled("0" * 32, rate=0.0)
+    assert is_sampled("f" * 32, rate=1.0)
+
+
+def test_spans_are_correlated_by_job_id(exporter):
+    job_id = str(uuid.uuid4())
+
+    @traced("stage")
+    async def stage():
+        record_span("queue_wait", 1, 2)
+
+    async def run():
+        with start_span("generate_image", job_id=job_id, **{"user.id": "u1"}):
+            await asyncio.gather(stage(), stage())
+
+    asyncio.run(run())
+    spans = {span["name"]: span for span in exported_spans(exporter)}
+    root = spans["generate_image"]
+
+    assert root["traceId"] == uuid.UUID(job_id).hex
+    assert "parentSpanId" not in root
+    assert spans["stage"]["parentSpanId"] == root["spanId"]
+    assert spans["queue_wait"]["parentSpanId"] == spans["stage"]["spanId"]
+    assert spans["queue_wait"]["startTimeUnixNano"] == "1"
+    attributes = {item["key"]: item["value"] for item in root["attributes"]}
+    assert attributes == {"job.id": {"stringValue": job_id}, "user.id": {"stringValue": "u1"}}
+
+
+def test_failed_span_records_exception(exporter):
+    with pytest.raises(ValueError), start_span("stage", job_id="job-1"):
+        raise ValueError("boom")
+
+    [span] = exported_spans(exporter)
+    assert span["status"] == {"code": 2, "message": "boom"}
+    assert span["events"][0]["name"] == "exception"
+
+
+@patch.object(tracing_core, "SAMPLE_RATE", 0.0)
+def test_unsampled_and_orphan_spans_are_not_exported(exporter):
+    with start_span("root", job_id="job-1"), start_span("child"):
+        pass
+    with start_span("orphan"):
+        pass
+
+    exporter.flush()
+    assert not exporter._spans
+    assert not os.path.exists(exporter.file_path)
+
+
+def test_file_exporter_rotates_at_max_size(exporter):
+    file_path = exporter.file_path
+    exporter.max_file_bytes, exporter.max_backups = 1, 2
+    for index in range(4):
+        with start_span(f"span-{index}", job_id="job-1"):
+            pass
+        exporter.flush()
+
+    names = []
+    for path in (f"{file_path}.2", f"{file_path}.1", file_path):
+        with open(path, encoding="utf-8") as file:
+            [line] = file.readlines()
+        [span] = json.loads(line)["resourceSpans"][0]["scopeSpans"][0]["spans"]
+        names.append(span["name"])
+    assert names == ["span-1", "span-2", "span-3"]
+    assert not os.path.exists(f"{file_path}.3")
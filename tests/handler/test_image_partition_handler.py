@@ -0,0 +1,128 @@
+import uuid
+from contextlib import asynccontextmanager
+from datetime import datetime, timezone
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from handler import image_partition_handler
+from service.image_partition_service import (
+    add_months,
+    image_partition_month,
+    image_partition_name,
+    month_start,
+)
+
+
+@pytest.fixture
+def partitions():
+    session = AsyncMock()
+
+    @asynccontextmanager
+    async def fake_session():
+        yield session
+
+    async def fake_urls(_session, name):
+        yield f"bucket/{name}/1.png"
+
+    with patch.object(image_partition_handler, "get_db_session", fake_session), \
+            patch.object(image_partition_handler, "stream_partition_urls", fake_urls), \
+            patch.object(image_partition_handler, "is_images_partitioned",
+                         AsyncMock(return_value=True)), \
+            patch.object(image_partition_handler, "list_image_partitions",
+                         AsyncMock()) as mock_list, \
+            patch.object(image_partition_handler, "create_image_partition",
+                         AsyncMock()) as mock_create, \
+            patch.object(image_partition_handler, "detach_image_partition",
+                         AsyncMock()) as mock_detach, \
+            patch.object(image_partition_handler, "drop_image_partition",
+                         AsyncMock()) as mock_drop, \
+            patch.object(image_partition_handler, "remove_objects_from_bucket",
+                         return_value=[]) as mock_remove, \
+            patch.object(image_partition_handler, "metric"):
+        yield MagicMock(session=session, list=mock_list, create=mock_create,
+                        detach=mock_detach, drop=mock_drop, remove=mock_remove)
+
+
+def test_month_helpers_roll_over_years():
+    month = month_start(datetime(2025, 12, 31, 23, 59, tzinfo=timezone.utc))
+
+    assert month == datetime(2025, 12, 1, tzinfo=timezone.utc)
+    assert add_months(month, 1) == datetime(2026, 1, 1, tzinfo=timezone.utc)
+    assert image_partition_name(add_months(month, 14)) == "images_2027_02"
+    assert image_partition_month("images_2027_02") == datetime(2027, 2, 1, tzinfo=timezone.utc)
+    assert image_partition_month("images_default") is None
+
+
+@pytest.mark.asyncio
+async def test_ensure_partitions_creates_only_missing_months(partitions):
+    current = month_start(datetime.now(timezone.utc))
+    partitions.list.return_value = {image_partition_name(current): True}
+
+    created = await image_partition_handler.ensure_image_partitions_handler()
+
+    assert created == image_partition_handler.MONTHS_AHEAD
+    created_months = [call.args[1] for call in partitions.create.await_args_list]
+    assert current not in created_months
+
+
+@pytest.mark.asyncio
+async def test_failed_partition_does_not_stop_the_other_months(partitions):
+    current = month_start(datetime.now(timezone.utc))
+    partitions.list.return_value = {}
+    partitions.create.side_effect = [RuntimeError("default partition has rows")] + [
+        None
+    ] * image_partition_handler.MONTHS_AHEAD
+
+    created = await image_partition_handler.ensure_image_partitions_handler()
+
+    assert created == image_partition_handler.MONTHS_AHEAD
+    assert partitions.create.await_count == image_partition_handler.MONTHS_AHEAD + 1
+    assert partitions.create.await_args_list[0].args[1] == current
+    partitions.session.rollback.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_expired_partitions_are_detached_and_dropped(partitions):
+    old = image_partition_name(add_months(month_start(datetime.now(timezone.utc)), -24))
+    recent = image_partition_name(month_start(datetime.now(timezone.utc)))
+    leftover = "images_2000_01"
+    partitions.list.return_value = {old: True, recent: True, leftover: False}
+    report = {"dropped_partitions": 0, "expired_images": 0, "removed_objects": 0,
+              "failed_objects": 0}
+
+    await image_partition_handler._drop_expired_partitions(365, report)
+
+    assert [call.args[1] for call in partitions.detach.await_args_list] == [old]
+    assert {call.args[1] for call in partitions.drop.await_args_list} == {old, leftover}
+    assert report["dropped_partitions"] == 2
+    assert report["removed_objects"] == 2
+
+
+@pytest.mark.asyncio
+async def test_partition_is_kept_when_objects_fail_to_be_removed(partitions):
+    partitions.list.return_value = {"images_2000_01": False}
+    partitions.remove.return_value = [MagicMock()]
+    report = {"dropped_partitions": 0, "expired_images": 0, "removed_objects": 0,
+              "failed_objects": 0}
+
+    await image_partition_handler._drop_expired_partitions(None, report)
+
+    partitions.drop.assert_not_called()
+    assert report["failed_objects"] == 1
+
+
+@pytest.mark.asyncio
+async def test_shorter_plan_retention_deletes_in_batches(partitions):
+    plan_id = uuid.uuid4()
+    full_batch = ["bucket/a.png"] * image_partition_handler.DELETE_BATCH_SIZE
+    report = {"expired_images": 0, "removed_objects": 0, "failed_objects": 0}
+
+    with patch.object(image_partition_handler, "delete_expired_images_of_plan",
+                      AsyncMock(side_effect=[full_batch, ["bucket/b.png"]])) as mock_delete:
+        await image_partition_handler._delete_expired_plan_images(
+            {plan_id: 30, uuid.uuid4(): 365}, 365, report
+        )
+
+    assert mock_delete.await_count == 2
+    assert report["expired_images"] == len(full_batch) + 1
@@ -0,0 +1,66 @@
+from contextlib import asynccontextmanager
+from datetime import datetime, timedelta, timezone
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from handler import storage_handler
+
+OLD = datetime.now(timezone.utc) - timedelta(days=30)
+RECENT = datetime.now(timezone.utc)
+
+
+def bucket_object(name, last_modified=OLD, size=10):
+    return MagicMock(object_name=name, last_modified=last_modified, size=size, is_dir=False)
+
+
+@pytest.fixture
+def storage(request):
+    objects, referenced = request.param
+
+    @asynccontextmanager
+    async def fake_session():
+        yield MagicMock()
+
+    async def fake_referenced(_session, _bucket_name):
+        for name in referenced:
+            yield name
+
+    with patch.object(storage_handler, "get_db_session", fake_session), \
+            patch.object(storage_handler, "stream_referenced_object_names", fake_referenced), \
+            patch.object(storage_handler, "iter_objects_in_bucket", return_value=iter(objects)), \
+            patch.object(storage_handler, "remove_objects_from_bucket",
+                         return_value=[]) as mock_remove, \
+            patch.object(storage_handler, "metric"):
+        yield mock_remove
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("storage", [(
+    [bucket_object("a/1.png"), bucket_object("a/2.png"), bucket_object("b/1.png"),
+     bucket_object("c/1.png", last_modified=RECENT)],
+    ["a/1.png", "a/1.png", "b/1.png", "z/missing.png"],
+)], indirect=True)
+async def test_reconcile_storage_dry_run_reports_orphans(storage):
+    report = await storage_handler.reconcile_storage_handler("bucket", dry_run=True)
+
+    assert report["scanned_objects"] == 4
+    assert report["referenced_objects"] == 2
+    assert report["recent_objects"] == 1
+    assert report["orphan_objects"] == 1
+    assert report["orphan_bytes"] == 10
+    storage.assert_not_called()
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("storage", [(
+    [bucket_object("a/1.png"), bucket_object("a/2.png"), bucket_object("a/3.png")],
+    ["a/2.png"],
+)], indirect=True)
+async def test_reconcile_storage_removes_orphans(storage):
+    with patch.object(storage_handler, "MAX_DELETES_PER_SECOND", 0):
+        report = await storage_handler.reconcile_storage_handler("bucket", dry_run=False)
+
+    storage.assert_called_once_with("bucket", ["a/1.png", "a/3.png"])
+    assert report["removed_objects"] == 2
+    assert report["failed_objects"] == 0
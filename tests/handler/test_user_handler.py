@@ -0,0 +1,71 @@
+from contextlib import asynccontextmanager
+from unittest.mock import AsyncMock, MagicMock, patch
+from uuid import UUID, uuid4
+
+import pytest
+
+from handler import user_handler
+
+
+def fief_user(updated_at):
+    return {
+        "id": str(uuid4()),
+        "email": f"{uuid4().hex}@example.com",
+        "created_at": updated_at,
+        "updated_at": updated_at,
+    }
+
+
+@pytest.fixture
+def sync_env():
+    pages = [
+        [fief_user("2024-03-01T00:00:00+00:00"), fief_user("2024-02-01T00:00:00+00:00")],
+        [fief_user("2024-01-01T00:00:00+00:00")],
+    ]
+
+    @asynccontextmanager
+    async def fake_session():
+        yield AsyncMock()
+
+    async def fake_pages(self, ordering):
+        for page in pages:
+            yield page
+
+    async def fake_create(_session, users, _folder_name):
+        return [user.id for user in users]
+
+    with patch.object(user_handler, "get_db_session", fake_session), \
+            patch.object(user_handler.FiefAsyncHttpClient, "iter_user_pages", fake_pages), \
+            patch.object(user_handler, "get_first_plan_by_price_handler",
+                         AsyncMock(return_value=MagicMock(id=uuid4()))), \
+            patch.object(user_handler, "get_existing_user_ids",
+                         AsyncMock(return_value=set())), \
+            patch.object(user_handler, "create_users_with_folder",
+                         side_effect=fake_create) as mock_create, \
+            patch.object(user_handler, "get_app_state", AsyncMock()) as mock_get_state, \
+            patch.object(user_handler, "set_app_state", AsyncMock()) as mock_set_state:
+        yield pages, mock_create, mock_get_state, mock_set_state
+
+
+@pytest.mark.asyncio
+async def test_sync_users_full_scan_stores_watermark(sync_env):
+    pages, mock_create, mock_get_state, mock_set_state = sync_env
+    mock_get_state.return_value = None
+
+    await user_handler.sync_users_handler()
+
+    assert mock_create.call_count == 2
+    created = [user.id for call in mock_create.call_args_list for user in call.args[1]]
+    assert created == [UUID(user["id"]) for page in pages for user in page]
+    assert mock_set_state.await_args.args[2] == "2024-03-01T00:00:00+00:00"
+
+
+@pytest.mark.asyncio
+async def test_sync_users_stops_at_watermark(sync_env):
+    pages, mock_create, mock_get_state, mock_set_state = sync_env
+    mock_get_state.return_value = "2024-02-01T00:00:00+00:00"
+
+    await user_handler.sync_users_handler()
+
+    mock_create.assert_called_once()
+    assert [user.id for user in mock_create.call_args.args[1]] == [UUID(pages[0][0]["id"])]
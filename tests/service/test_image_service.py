@@ -0,0 +1,95 @@
+import uuid
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy.dialects import postgresql
+
+from model.image_model import Image
+from service.image_service import create_images, search_images
+
+
+def make_image(index):
+    return Image(
+        url=f"bucket/user/job_{index}.png",
+        workflow_id=uuid.uuid4(),
+        user_id=uuid.uuid4(),
+        user_folder_id=uuid.uuid4(),
+        parameters={"SEED": index},
+    )
+
+
+@pytest.mark.asyncio
+async def test_create_images_uses_single_insert_and_commit():
+    images = [make_image(index) for index in range(3)]
+    session = AsyncMock()
+    result = MagicMock()
+    result.all.return_value = images
+    session.scalars.return_value = result
+
+    created = await create_images(session, images)
+
+    assert created == images
+    session.scalars.assert_awaited_once()
+    rows = session.scalars.await_args.args[1]
+    assert [row["url"] for row in rows] == [image.url for image in images]
+    assert all(row["created_at"] == row["updated_at"] for row in rows)
+    session.commit.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_create_images_increments_usage_per_folder():
+    images = [make_image(index) for index in range(2)]
+    images[1].user_id, images[1].user_folder_id = images[0].user_id, images[0].user_folder_id
+    for image in images:
+        image.size_bytes = 100
+    session = AsyncMock()
+    session.scalars.return_value = MagicMock(all=MagicMock(return_value=images))
+
+    with patch("service.image_service.increment_usage", new_callable=AsyncMock) as increment:
+        await create_images(session, images, plan_id=None, gpu_seconds=2.5)
+
+    increment.assert_awaited_once_with(
+        session, images[0].user_id, images[0].user_folder_id, None, 2, 200, 2.5
+    )
+
+
+@pytest.mark.asyncio
+async def test_create_images_empty_list_skips_database():
+    session = AsyncMock()
+
+    assert await create_images(session, []) == []
+    session.scalars.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_create_images_rolls_back_on_error():
+    session = AsyncMock()
+    session.scalars.side_effect = RuntimeError("boom")
+
+    with pytest.raises(HTTPException) as exc_info:
+        await create_images(session, [make_image(0)])
+
+    assert exc_info.value.status_code == 500
+    session.rollback.assert_awaited_once()
+    session.commit.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_search_images_builds_indexed_filters():
+    session = AsyncMock()
+    session.exec.return_value = MagicMock(all=MagicMock(return_value=[]))
+
+    await search_images(
+        session,
+        uuid.uuid4(),
+        text_query="astronaut cat",
+        model_id=uuid.uuid4(),
+        seed=42,
+        limit=10,
+    )
+
+    statement = str(session.exec.await_args.args[0].compile(dialect=postgresql.dialect()))
+    assert "images.search_vector @@ websearch_to_tsquery('simple'::regconfig" in statement
+    assert "images.parameters @> " in statement
+    assert "ORDER BY images.created_at DESC, images.id DESC" in statement
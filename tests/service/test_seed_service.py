@@ -0,0 +1,40 @@
+import asyncio
+import os
+from unittest.mock import AsyncMock, MagicMock
+
+from sqlalchemy.dialects import postgresql
+
+from model.plan_model import Plan
+from service.plan_service import seed_plan_from_json
+from service.seed_service import resources_checksum
+
+PLANS_FILE = os.path.join(
+    os.path.dirname(__file__), "..", "..", "resources", "postgres", "plans.json"
+)
+
+
+def test_resources_checksum_changes_with_content(tmp_path):
+    first = tmp_path / "models.json"
+    second = tmp_path / "plans.json"
+    first.write_text("[]", encoding="utf-8")
+    second.write_text("[]", encoding="utf-8")
+
+    checksum = resources_checksum([str(first), str(second)])
+
+    assert checksum == resources_checksum([str(second), str(first)])
+    second.write_text('[{"name": "FREE"}]', encoding="utf-8")
+    assert checksum != resources_checksum([str(first), str(second)])
+
+
+def test_plan_seed_backfills_missing_rate_limits():
+    session = MagicMock()
+    session.execute = AsyncMock(return_value=MagicMock())
+
+    asyncio.run(seed_plan_from_json(session, PLANS_FILE))
+
+    statement = session.execute.await_args.args[0]
+    sql = str(statement.compile(dialect=postgresql.dialect()))
+    table = Plan.__table__.name
+    assert "ON CONFLICT (name) DO UPDATE SET " \
+           f"rate_limits = coalesce({table}.rate_limits, excluded.rate_limits) " \
+           f"WHERE {table}.rate_limits IS NULL" in sql
@@ -0,0 +1,49 @@
+import uuid
+from unittest.mock import AsyncMock
+
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from service.user_usage_service import decrement_usage, increment_usage
+
+
+def compile_statement(statement) -> str:
+    return str(statement.compile(dialect=postgresql.dialect()))
+
+
+@pytest.mark.asyncio
+async def test_increment_usage_adds_to_existing_counters():
+    session = AsyncMock()
+
+    await increment_usage(session, uuid.uuid4(), uuid.uuid4(), None, 2, 200, 1.5)
+
+    sql = compile_statement(session.execute.await_args.args[0])
+    assert "ON CONFLICT (user_id, user_folder_id) DO UPDATE" in sql
+    assert "image_count = (user_usage.image_count + excluded.image_count)" in sql
+    assert "total_bytes = (user_usage.total_bytes + excluded.total_bytes)" in sql
+    session.commit.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_decrement_usage_updates_each_folder_once():
+    session = AsyncMock()
+    folder_a, folder_b = uuid.uuid4(), uuid.uuid4()
+
+    await decrement_usage(session, uuid.uuid4(), [(folder_a, 10), (folder_a, None), (folder_b, 5)])
+
+    assert session.execute.await_count == 2
+    statement = session.execute.await_args_list[0].args[0]
+    sql = compile_statement(statement)
+    assert "greatest(user_usage.image_count - " in sql
+    params = statement.compile(dialect=postgresql.dialect()).params
+    assert params["image_count_1"] == 2
+    assert params["total_bytes_1"] == 10
+
+
+@pytest.mark.asyncio
+async def test_decrement_usage_without_images_skips_database():
+    session = AsyncMock()
+
+    await decrement_usage(session, uuid.uuid4(), [])
+
+    session.execute.assert_not_called()
@@ -4,6 +4,7 @@ from datetime import datetime, timezone
 from unittest.mock import AsyncMock, MagicMock, Mock, mock_open, patch
 
 import pytest
+from sqlalchemy.dialects import postgresql
 from sqlalchemy.exc import SQLAlchemyError
 
 from model.enum.model_type import Model
@@ -98,19 +99,22 @@ class TestCreateWorkflow:
 class TestGetAllWorkflows:
     @pytest.mark.asyncio
     async def test_get_all_workflows_success(self, mock_session, sample_workflow):
+        row = {"id": sample_workflow.id, "name": sample_workflow.name, "parameters": []}
         result_mock = MagicMock()
-        result_mock.all.return_value = [sample_workflow]
-        mock_session.exec.return_value = result_mock
-        
+        result_mock.mappings.return_value = [row]
+        mock_session.execute.return_value = result_mock
+
         result = await get_all_workflows(mock_session)
-        
-        assert mock_session.exec.called
-        assert len(result) == 1
-        assert result[0] == sample_workflow
+
+        statement = mock_session.execute.await_args.args[0]
+        sql = str(statement.compile(dialect=postgresql.dialect()))
+        assert "workflow_json" not in sql
+        assert "workflows.model AS model_type" in sql
+        assert result == [row]
 
     @pytest.mark.asyncio
     async def test_get_all_workflows_exception(self, mock_session):
-        mock_session.exec.side_effect = SQLAlchemyError("Database error")
+        mock_session.execute.side_effect = SQLAlchemyError("Database error")
         
         with pytest.raises(SQLAlchemyError), patch('service.workflow_service.logger.exception'):
             await get_all_workflows(mock_session)
@@ -252,70 +256,57 @@ class TestDeleteWorkflow:
 
 
 class TestSeedWorkflowFromJson:
+    json_data = [
+        {
+            "name": "Workflow 1",
+            "description": "Description 1",
+            "model_type": "SDXL",
+            "workflow_type": "IMAGE",
+            "workflow_segment": "TEXT_TO_IMAGE",
+            "workflow_json": {"prompt": "test"},
+            "parameters": []
+        },
+        {
+            "name": "Workflow 2",
+            "description": "Description 2",
+            "model_type": "SDXL",
+            "workflow_type": "IMAGE",
+            "workflow_segment": "TEXT_TO_IMAGE",
+            "workflow_json": {"prompt": "test2"},
+            "parameters": []
+        }
+    ]
+
     @pytest.mark.asyncio
     async def test_seed_workflow_from_json_new_workflows(self, mock_session):
-        json_data = [
-            {
-                "name": "Workflow 1",
-                "description": "Description 1",
-                "model_type": "STABLE_DIFFUSION",
-                "workflow_type": "IMAGE",
-                "workflow_segment": "TEXT_TO_IMAGE",
-                "workflow_json": {"prompt": "test"}
-            },
-            {
-                "name": "Workflow 2",
-                "description": "Description 2", 
-                "model_type": "STABLE_DIFFUSION",
-                "workflow_type": "IMAGE",
-                "workflow_segment": "TEXT_TO_IMAGE",
-                "workflow_json": {"prompt": "test2"}
-            }
-        ]
-        
-        # Mock open function to return json data
-        with patch('builtins.open', mock_open(read_data=json.dumps(json_data))), \
-             patch('service.workflow_service.select'), \
-             patch('builtins.print') as mock_print:
-                
-            # Mock session.exec to return None (workflow doesn't exist)
-            result_mock = MagicMock()
-            result_mock.first.return_value = None
-            mock_session.exec.return_value = result_mock
-            
-            await seed_workflow_from_json(mock_session, "fake_path.json")
-            
-            # Should add two workflows
-            assert mock_session.add.call_count == 2
-            assert mock_session.commit.called
-            assert mock_print.call_count == 2
+        result_mock = MagicMock()
+        result_mock.all.return_value = [("Workflow 1",), ("Workflow 2",)]
+        mock_session.execute = AsyncMock(return_value=result_mock)
+
+        with patch('builtins.open', mock_open(read_data=json.dumps(self.json_data))):
+            inserted = await seed_workflow_from_json(mock_session, "fake_path.json")
+
+        # A single upsert statement covers every workflow of the file
+        assert inserted == 2
+        mock_session.execute.assert_awaited_once()
+        statement = str(mock_session.execute.await_args.args[0].compile(
+            dialect=postgresql.dialect()
+        ))
+        assert "ON CONFLICT (name) DO NOTHING" in statement
+        assert not mock_session.add.called
 
     @pytest.mark.asyncio
-    async def test_seed_workflow_from_json_existing_workflow(self, mock_session, sample_workflow):
-        json_data = [
-            {
-                "name": "Test Workflow",  # Same name as sample_workflow
-                "description": "New Description", 
-                "model_type": "STABLE_DIFFUSION",
-                "workflow_type": "IMAGE",
-                "workflow_segment": "TEXT_TO_IMAGE",
-                "workflow_json": {"prompt": "test"}
-            }
-        ]
-        
-        # Mock open function to return json data
-        with patch('builtins.open', mock_open(read_data=json.dumps(json_data))), \
-             patch('service.workflow_service.select'), \
-             patch('builtins.print') as mock_print:
-                
-            # Mock session.exec to return existing workflow
-            result_mock = MagicMock()
-            result_mock.first.return_value = sample_workflow
-            mock_session.exec.return_value = result_mock
-            
-            await seed_workflow_from_json(mock_session, "fake_path.json")
-            
-            # Should not add any workflows
-            assert mock_session.add.call_count == 0
-            assert mock_session.commit.called
-            assert "already exists" in mock_print.call_args_list[0][0][0]
+    async def test_seed_workflow_from_json_update_existing(self, mock_session):
+        result_mock = MagicMock()
+        result_mock.all.return_value = [("Workflow 1",), ("Workflow 2",)]
+        mock_session.execute = AsyncMock(return_value=result_mock)
+
+        with patch('builtins.open', mock_open(read_data=json.dumps(self.json_data))):
+            await seed_workflow_from_json(mock_session, "fake_path.json", update_existing=True)
+
+        statement = str(mock_session.execute.await_args.args[0].compile(
+            dialect=postgresql.dialect()
+        ))
+        assert "ON CONFLICT (name) DO UPDATE" in statement
+        assert "created_at = excluded.created_at" not in statement
+        assert "workflow_json = excluded.workflow_json" in statement
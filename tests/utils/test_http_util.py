@@ -0,0 +1,73 @@
+from datetime import datetime, timezone
+
+import pytest
+
+from utils.http_util import (
+    RangeNotSatisfiable,
+    accepts_encoding,
+    etag_matches,
+    format_http_date,
+    not_modified_since,
+    parse_range_header,
+)
+
+
+def test_parse_range_header_missing():
+    assert parse_range_header(None, 100) is None
+
+
+def test_parse_range_header_closed_range():
+    assert parse_range_header("bytes=0-9", 100) == (0, 9)
+
+
+def test_parse_range_header_open_range():
+    assert parse_range_header("bytes=90-", 100) == (90, 99)
+
+
+def test_parse_range_header_suffix_range():
+    assert parse_range_header("bytes=-10", 100) == (90, 99)
+
+
+def test_parse_range_header_end_clamped_to_size():
+    assert parse_range_header("bytes=50-500", 100) == (50, 99)
+
+
+def test_parse_range_header_multi_range_ignored():
+    assert parse_range_header("bytes=0-1,5-6", 100) is None
+
+
+def test_parse_range_header_invalid_unit_ignored():
+    assert parse_range_header("items=0-1", 100) is None
+
+
+def test_parse_range_header_start_beyond_size():
+    with pytest.raises(RangeNotSatisfiable):
+        parse_range_header("bytes=100-", 100)
+
+
+def test_etag_matches_strong_and_weak():
+    assert etag_matches('"abc"', '"abc"')
+    assert etag_matches('W/"abc", "def"', '"abc"')
+    assert etag_matches("*", '"abc"')
+    assert not etag_matches('"def"', '"abc"')
+    assert not etag_matches(None, '"abc"')
+
+
+def test_format_http_date():
+    value = datetime(2024, 1, 2, 3, 4, 5, tzinfo=timezone.utc)
+    assert format_http_date(value) == "Tue, 02 Jan 2024 03:04:05 GMT"
+
+
+def test_not_modified_since():
+    last_modified = datetime(2024, 1, 2, 3, 4, 5, 123000, tzinfo=timezone.utc)
+    assert not_modified_since("Tue, 02 Jan 2024 03:04:05 GMT", last_modified)
+    assert not not_modified_since("Mon, 01 Jan 2024 00:00:00 GMT", last_modified)
+    assert not not_modified_since("not a date", last_modified)
+
+
+def test_accepts_encoding():
+    assert accepts_encoding("gzip, deflate, br", "gzip")
+    assert accepts_encoding("*", "gzip")
+    assert not accepts_encoding("gzip;q=0", "gzip")
+    assert not accepts_encoding("br", "gzip")
+    assert not accepts_encoding(None, "gzip")
@@ -0,0 +1,25 @@
+from datetime import datetime, timezone
+from uuid import uuid4
+
+import pytest
+
+from utils.pagination_util import clamp_page_size, decode_cursor, encode_cursor
+
+
+def test_cursor_round_trip():
+    created_at = datetime(2024, 5, 6, 7, 8, 9, 123456, tzinfo=timezone.utc)
+    item_id = uuid4()
+
+    assert decode_cursor(encode_cursor(created_at, item_id)) == (created_at, item_id)
+
+
+def test_decode_cursor_invalid():
+    with pytest.raises(ValueError):
+        decode_cursor("not-a-cursor")
+
+
+def test_clamp_page_size():
+    assert clamp_page_size(None, 50, 200) == 50
+    assert clamp_page_size(0, 50, 200) == 50
+    assert clamp_page_size(10, 50, 200) == 10
+    assert clamp_page_size(1000, 50, 200) == 200
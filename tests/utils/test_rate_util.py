@@ -0,0 +1,21 @@
+import pytest
+from pydantic import ValidationError
+
+from model.plan_model import PlanUpdate
+from utils.rate_util import parse_rate
+
+
+def test_parse_rate_rejects_unknown_periods():
+    with pytest.raises(ValueError):
+        parse_rate("10/minuet")
+    with pytest.raises(ValueError):
+        parse_rate("0/minute")
+
+
+def test_plan_rate_limits_are_validated():
+    assert PlanUpdate(rate_limits={"generate": "10/minute"}).rate_limits == {
+        "generate": "10/minute"
+    }
+    with pytest.raises(ValidationError, match="generate"):
+        PlanUpdate(rate_limits={"generate": "10/minuet"})
+
@@ -0,0 +1,36 @@
+import io
+import zipfile
+from datetime import datetime
+
+from utils.zip_util import ZipStreamWriter
+
+
+def _build_archive(files):
+    writer = ZipStreamWriter()
+    chunks = [writer.add_file(name, data, datetime(2024, 5, 1, 12, 0, 0)) for name, data in files]
+    chunks.append(writer.close())
+    return chunks
+
+
+def test_zip_stream_writer_produces_valid_archive():
+    chunks = _build_archive([("a.png", b"first"), ("b.png", b"second")])
+
+    with zipfile.ZipFile(io.BytesIO(b"".join(chunks))) as archive:
+        assert archive.namelist() == ["a.png", "b.png"]
+        assert archive.read("a.png") == b"first"
+        assert archive.read("b.png") == b"second"
+        assert all(info.compress_type == zipfile.ZIP_STORED for info in archive.infolist())
+
+
+def test_zip_stream_writer_yields_each_entry_incrementally():
+    chunks = _build_archive([("a.png", b"x" * 1024)])
+
+    assert len(chunks[0]) > 1024
+    assert chunks[-1]
+
+
+def test_zip_stream_writer_deduplicates_names():
+    chunks = _build_archive([("a.png", b"1"), ("a.png", b"2"), ("a", b"3"), ("a", b"4")])
+
+    with zipfile.ZipFile(io.BytesIO(b"".join(chunks))) as archive:
+        assert archive.namelist() == ["a.png", "a_1.png", "a", "a_1"]
@@ -0,0 +1,113 @@
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Optional
+
+
+class RangeNotSatisfiable(Exception):
+    """Raised when a Range header cannot be satisfied for the resource size."""
+    def __init__(self, size: int):
+        self.size = size
+        super().__init__(f"Requested range not satisfiable for size {size}.")
+
+
+def parse_range_header(range_header: Optional[str], size: int) -> Optional[tuple[int, int]]:
+    """
+    Parse a single ``bytes`` Range header into an inclusive ``(start, end)`` tuple.
+
+    Multi-range and non-byte requests are ignored (``None``), which makes the caller
+    fall back to a full response as allowed by RFC 9110.
+
+    Args:
+        range_header (Optional[str]): Value of the Range header.
+        size (int): Total size of the resource in bytes.
+
+    Returns:
+        Optional[tuple[int, int]]: The first and last byte positions, or None.
+
+    Raises:
+        RangeNotSatisfiable: If the range is syntactically valid but outside the resource.
+    """
+    if not range_header:
+        return None
+    unit, _, ranges = range_header.partition("=")
+    if unit.strip().lower() != "bytes" or "," in ranges:
+        return None
+    start_str, sep, end_str = ranges.strip().partition("-")
+    if not sep:
+        return None
+    try:
+        if not start_str:
+            suffix_length = int(end_str)
+            if suffix_length <= 0:
+                raise RangeNotSatisfiable(size)
+            start = max(size - suffix_length, 0)
+            end = size - 1
+        else:
+            start = int(start_str)
+            end = int(end_str) if end_str else size - 1
+    except ValueError:
+        return None
+    if start >= size:
+        raise RangeNotSatisfiable(size)
+    if start < 0 or end < start:
+        return None
+    return start, min(end, size - 1)
+
+
+def etag_matches(condition_header: Optional[str], etag: str) -> bool:
+    """
+    Check an If-None-Match / If-Range header against an ETag using weak comparison.
+    """
+    if not condition_header:
+        return False
+    if condition_header.strip() == "*":
+        return True
+    normalized_etag = etag.removeprefix("W/")
+    candidates = (candidate.strip().removeprefix("W/") for candidate in condition_header.split(","))
+    return normalized_etag in candidates
+
+
+def format_http_date(value: datetime) -> str:
+    """
+    Format a datetime as an IMF-fixdate, as used by Last-Modified headers.
+    """
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return format_datetime(value.astimezone(timezone.utc), usegmt=True)
+
+
+def not_modified_since(if_modified_since: Optional[str], last_modified: datetime) -> bool:
+    """
+    Return True if the resource has not changed since the If-Modified-Since date.
+    """
+    if not if_modified_since:
+        return False
+    try:
+        since = parsedate_to_datetime(if_modified_since)
+    except (TypeError, ValueError):
+        return False
+    if since.tzinfo is None:
+        since = since.replace(tzinfo=timezone.utc)
+    if last_modified.tzinfo is None:
+        last_modified = last_modified.replace(tzinfo=timezone.utc)
+    return last_modified.replace(microsecond=0) <= since
+
+
+def accepts_encoding(accept_encoding: Optional[str], encoding: str) -> bool:
+    """
+    Check whether an Accept-Encoding header allows a content coding (``q=0`` refuses it).
+    """
+    if not accept_encoding:
+        return False
+    for item in accept_encoding.split(","):
+        coding, _, params = item.strip().partition(";")
+        if coding.strip().lower() not in (encoding, "*"):
+            continue
+        quality = params.strip().lower()
+        if quality.startswith("q="):
+            try:
+                return float(quality[2:]) > 0
+            except ValueError:
+                return False
+        return True
+    return False
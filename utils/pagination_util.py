@@ -0,0 +1,38 @@
+import base64
+import binascii
+from datetime import datetime
+from typing import Optional
+from uuid import UUID
+
+
+def encode_cursor(created_at: datetime, item_id: UUID) -> str:
+    """
+    Encode the sort key of the last item of a page into an opaque cursor.
+    """
+    raw = f"{created_at.isoformat()}|{item_id}".encode()
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, UUID]:
+    """
+    Decode a cursor produced by ``encode_cursor``.
+
+    Raises:
+        ValueError: If the cursor is malformed.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        raw = base64.urlsafe_b64decode(padded.encode("ascii")).decode()
+        created_at, _, item_id = raw.partition("|")
+        return datetime.fromisoformat(created_at), UUID(item_id)
+    except (binascii.Error, UnicodeError, ValueError) as e:
+        raise ValueError(f"Invalid cursor: {cursor}") from e
+
+
+def clamp_page_size(limit: Optional[int], default: int, maximum: int) -> int:
+    """
+    Return the requested page size, falling back to the default and capped at the maximum.
+    """
+    if not limit or limit < 1:
+        return default
+    return min(limit, maximum)
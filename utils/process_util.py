@@ -0,0 +1,12 @@
+import os
+
+
+def is_process_alive(pid: int) -> bool:
+    """Checks whether a process with this PID exists on the host."""
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
@@ -0,0 +1,20 @@
+from typing import Any
+
+from sqlalchemy import Result
+from sqlmodel import SQLModel
+
+
+def projected_columns(table_model: type[SQLModel], schema: type[SQLModel]) -> list:
+    """
+    Return the columns of ``table_model`` needed to build ``schema``, labelled with the
+    schema's field names, so a query only reads what the response exposes.
+    """
+    return [getattr(table_model, name).label(name) for name in schema.model_fields]
+
+
+def rows_as_dicts(result: Result) -> list[dict[str, Any]]:
+    """
+    Turn the rows of a column-projected query into plain dicts, ready to be
+    serialized without building ORM instances or Pydantic models.
+    """
+    return [dict(row) for row in result.mappings()]
@@ -0,0 +1,29 @@
+from dataclasses import dataclass
+from functools import lru_cache
+
+PERIODS = {"second": 1, "minute": 60, "hour": 3600, "day": 86400}
+
+
+@dataclass(frozen=True)
+class Rate:
+    limit: int
+    period: float
+
+    @property
+    def emission_ms(self) -> float:
+        return self.period * 1000 / self.limit
+
+    @property
+    def policy(self) -> str:
+        return f"{self.limit};w={int(self.period)}"
+
+
+@lru_cache(maxsize=256)
+def parse_rate(value: str) -> Rate:
+    """Parse a rate such as ``10/minute``, ``100/hour`` or ``5/30`` (seconds)."""
+    count, _, period = value.partition("/")
+    count, period = count.strip(), period.strip().lower()
+    seconds = int(period) if period.isdigit() else PERIODS.get(period.rstrip("s"))
+    if not count.isdigit() or int(count) <= 0 or not seconds:
+        raise ValueError(f"Invalid rate: {value!r}")
+    return Rate(limit=int(count), period=seconds)
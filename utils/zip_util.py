@@ -0,0 +1,75 @@
+import zipfile
+from datetime import datetime
+from typing import Optional
+
+
+class _ChunkBuffer:
+    """Write-only, non-seekable sink that hands written bytes back to the caller."""
+
+    def __init__(self):
+        self._chunks: list[bytes] = []
+
+    def write(self, data: bytes) -> int:
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+class ZipStreamWriter:
+    """
+    Builds a ZIP archive incrementally without ever holding the whole archive.
+
+    Entries are stored without recompression (images are already compressed) and
+    every call returns the archive bytes produced so far, ready to be sent.
+    """
+
+    def __init__(self):
+        self._buffer = _ChunkBuffer()
+        self._zip = zipfile.ZipFile(self._buffer, mode="w", compression=zipfile.ZIP_STORED)
+        self._names: set[str] = set()
+
+    def _unique_name(self, name: str) -> str:
+        candidate = name
+        stem, dot, extension = name.rpartition(".")
+        if not dot:
+            stem, extension = name, ""
+        index = 1
+        while candidate in self._names:
+            candidate = f"{stem}_{index}{dot}{extension}"
+            index += 1
+        self._names.add(candidate)
+        return candidate
+
+    def add_file(self, name: str, data: bytes, modified_at: Optional[datetime] = None) -> bytes:
+        """
+        Append a file to the archive.
+
+        Returns:
+            bytes: The archive bytes produced by this entry.
+        """
+        date_time = (modified_at or datetime.now()).timetuple()[:6]
+        if date_time[0] < 1980:
+            date_time = (1980, 1, 1, 0, 0, 0)
+        zip_info = zipfile.ZipInfo(self._unique_name(name), date_time=date_time)
+        zip_info.compress_type = zipfile.ZIP_STORED
+        zip_info.external_attr = 0o644 << 16
+        with self._zip.open(zip_info, mode="w", force_zip64=len(data) > zipfile.ZIP64_LIMIT) as f:
+            f.write(data)
+        return self._buffer.drain()
+
+    def close(self) -> bytes:
+        """
+        Write the central directory.
+
+        Returns:
+            bytes: The trailing archive bytes.
+        """
+        self._zip.close()
+        return self._buffer.drain()